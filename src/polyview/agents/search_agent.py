@@ -4,38 +4,70 @@ from typing import Literal
 
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from langchain_tavily import TavilySearch
 from langgraph.graph import StateGraph
 
-from polyview.core.llm_config import llm
+from polyview.core.article_store import get_article_store
+from polyview.core.llm_config import llm, llm_lite
 from polyview.core.logging import get_logger
+from polyview.core.metrics import record_cache_lookups
+from polyview.core.profiles import (
+    MAX_SEARCH_RESULTS_LIMIT,
+    RunProfile,
+    get_run_profile,
+)
 from polyview.core.state import State
+from polyview.utils.messages import compact_tool_messages
 
 logger = get_logger(__name__)
 
-# Constants for search agent search behavior
-MIN_INITIAL_SEARCH_QUERIES = 2
-MAX_INITIAL_SEARCH_QUERIES = 3
-MAX_ADDITIONAL_QUERIES = 2
-
-MAX_SEARCH_RESULTS_PER_QUERY = 3
+# Query counts and results per query are set per run, see RunProfile
 MIN_MATCH_SCORE = (
     0.4  # Minimum matching score an article should have in correspondence to the query
 )
 
-search_tool = TavilySearch(max_results=MAX_SEARCH_RESULTS_PER_QUERY)
+search_tool = TavilySearch(max_results=MAX_SEARCH_RESULTS_LIMIT)
 llm_with_tools = llm.bind_tools([search_tool])
+llm_lite_with_tools = llm_lite.bind_tools([search_tool])
 
 
-def agent_node(state: State) -> dict:
+def agent_node(state: State, config: RunnableConfig | None = None) -> dict:
     """The decision point of the agent. It decides whether to call a tool or finish."""
     logger.debug(f"Messages in state of search agent subgraph: {state['messages']}")
-    result = llm_with_tools.invoke(state["messages"])
+    model = (
+        llm_lite_with_tools
+        if get_run_profile(config).use_lite_model
+        else llm_with_tools
+    )
+    result = model.invoke(state["messages"])
     return {"messages": [result]}
 
 
-def tool_node(state: State) -> dict:
-    """Executes tool calls and adds the result as ToolMessages to the state."""
+def run_search(args: dict, max_results: int) -> list[dict]:
+    """
+    Runs one search tool call and returns its top max_results results that reach
+    MIN_MATCH_SCORE.
+    """
+    result = search_tool.invoke(args)
+    search_results = result.get("results", []) if isinstance(result, dict) else result
+    return [
+        res
+        for res in search_results[:max_results]
+        if res.get("score", 0) >= MIN_MATCH_SCORE
+    ]
+
+
+def article_id(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def tool_node(state: State, config: RunnableConfig | None = None) -> dict:
+    """
+    Executes tool calls and adds the result as ToolMessages to the state. Results are
+    trimmed to the run profile's max_search_results_per_query.
+    """
+    max_results = get_run_profile(config).max_search_results_per_query
     tool_calls = state["messages"][-1].tool_calls
     if not tool_calls:
         logger.warning("No tool calls found in the last message.")
@@ -45,13 +77,7 @@ def tool_node(state: State) -> dict:
     tool_messages = []
     for tool_call in tool_calls:
         try:
-            result = search_tool.invoke(tool_call["args"])
-            search_results = (
-                result.get("results", []) if isinstance(result, dict) else result
-            )
-            filtered_results = [
-                res for res in search_results if res.get("score", 0) >= MIN_MATCH_SCORE
-            ]
+            filtered_results = run_search(tool_call["args"], max_results)
             logger.debug(f"Filtered tool call results: {filtered_results}")
             tool_messages.append(
                 ToolMessage(
@@ -68,6 +94,36 @@ def tool_node(state: State) -> dict:
     return {"messages": tool_messages}
 
 
+def parse_tool_message(message: ToolMessage) -> list[dict]:
+    """
+    Returns the valid search results of a ToolMessage, each with an id derived from its
+    URL. Tool errors and malformed content are logged and yield no results.
+    """
+    try:
+        content = json.loads(message.content)
+    except json.JSONDecodeError:
+        logger.warning(f"Skipping ToolMessage with invalid JSON: {message.content!r}")
+        return []
+
+    # Handle tool errors
+    if isinstance(content, dict) and "error" in content:
+        logger.error(f"Tool call failed with error: {content['error']}")
+        return []
+
+    # Process successful tool results
+    if not isinstance(content, list):
+        logger.warning(f"Skipping ToolMessage with non-list content: {content}")
+        return []
+
+    results = []
+    for res in content:
+        if isinstance(res, dict) and "url" in res:
+            results.append({**res, "id": article_id(res["url"])})
+        else:
+            logger.warning(f"Skipping invalid item in search results: {res}")
+    return results
+
+
 def process_results_node(state: State) -> dict:
     """
     Processes search results from ToolMessages, removes duplicates,
@@ -80,33 +136,10 @@ def process_results_node(state: State) -> dict:
         if not isinstance(message, ToolMessage):
             continue
 
-        try:
-            content = json.loads(message.content)
-        except json.JSONDecodeError:
-            logger.warning(
-                f"Skipping ToolMessage with invalid JSON: {message.content!r}"
-            )
-            continue
-
-        # Handle tool errors
-        if isinstance(content, dict) and "error" in content:
-            logger.error(f"Tool call failed with error: {content['error']}")
-            continue
-
-        # Process successful tool results
-        if not isinstance(content, list):
-            logger.warning(f"Skipping ToolMessage with non-list content: {content}")
-            continue
-
-        for res in content:
-            if isinstance(res, dict) and "url" in res:
-                if res["url"] not in processed_urls:
-                    articles.append(
-                        {**res, "id": hashlib.sha256(res["url"].encode()).hexdigest()}
-                    )
-                    processed_urls.add(res["url"])
-            else:
-                logger.warning(f"Skipping invalid item in search results: {res}")
+        for res in parse_tool_message(message):
+            if res["url"] not in processed_urls:
+                articles.append(res)
+                processed_urls.add(res["url"])
 
     logger.info(f"Found {len(articles)} articles.")
     final_message = HumanMessage(content=f"Found {len(articles)} articles.")
@@ -141,14 +174,24 @@ search_workflow.set_finish_point("process_results")
 search_agent_graph = search_workflow.compile()
 
 
-def run_search_agent(state: State) -> dict:
-    """Main entry point for the search agent subgraph."""
-    logger.info("--- Invoking Search Subgraph ---")
+def collect_search_queries(messages: list) -> list[str]:
+    """Collects the queries of all search tool calls made by the agent."""
+    return [
+        tool_call["args"]["query"]
+        for message in messages
+        if isinstance(message, AIMessage)
+        for tool_call in message.tool_calls
+        if "query" in tool_call.get("args", {})
+    ]
+
+
+def create_search_agent_input(topic: str, profile: RunProfile) -> dict:
+    """Builds the initial subgraph state that instructs the agent for the given profile."""
     system_prompt = f"""You are a search specialist. Your purpose is to find relevant articles for a given topic.
 
 Your workflow is fast and iterative:
-1.  **Initial Queries:** Start with {MIN_INITIAL_SEARCH_QUERIES} to {MAX_INITIAL_SEARCH_QUERIES} broad search queries to find initial articles.
-2.  **Refine if Necessary:** If the initial results seem incomplete, run max {MAX_ADDITIONAL_QUERIES} more queries to broaden or deepen the search.
+1.  **Initial Queries:** Start with {profile.min_initial_search_queries} to {profile.max_initial_search_queries} broad search queries to find initial articles.
+2.  **Refine if Necessary:** If the initial results seem incomplete, run max {profile.max_additional_queries} more queries to broaden or deepen the search.
 3.  **Conclude:** As soon as you have a diverse set of sources, conclude with 'END'."""
 
     prompt_template = ChatPromptTemplate.from_messages(
@@ -157,12 +200,52 @@ Your workflow is fast and iterative:
             ("human", "Please begin your research on the topic: '{topic}'"),
         ]
     )
+    return {"messages": prompt_template.format_messages(topic=topic)}
 
-    messages = prompt_template.format_messages(topic=state["topic"])
-    search_input = {"messages": messages}
-    result_state = search_agent_graph.invoke(search_input)
+
+def run_search_agent(state: State, config: RunnableConfig | None = None) -> dict:
+    """
+    Main entry point for the search agent subgraph. Query counts come from the run
+    profile, which is passed on to the subgraph.
+
+    If the previous cycle speculatively prefetched articles (see prefetch_searches_node),
+    the cycle starts from those instead of searching from scratch.
+
+    The content of the found articles is moved to the session's ArticleStore, so only
+    their metadata is passed on in the state. For the same reason, the search results in
+    the returned ToolMessages are reduced to their titles and URLs.
+    """
+    prefetched_articles = state.get("prefetched_articles") or []
+    if prefetched_articles:
+        logger.info(
+            f"Starting research cycle from {len(prefetched_articles)} prefetched articles."
+        )
+        record_cache_lookups(
+            "search_prefetch", hits=len(state.get("prefetched_queries") or []), misses=0
+        )
+        return {
+            "raw_articles": prefetched_articles,
+            "search_queries": state.get("prefetched_queries") or [],
+            "prefetched_articles": [],
+            "prefetched_queries": [],
+            "messages": [
+                AIMessage(
+                    content=f"Using {len(prefetched_articles)} prefetched articles."
+                )
+            ],
+        }
+
+    logger.info("--- Invoking Search Subgraph ---")
+    search_input = create_search_agent_input(state["topic"], get_run_profile(config))
+    result_state = search_agent_graph.invoke(search_input, config)
+    messages = result_state.get("messages", [])
+    search_queries = collect_search_queries(messages)
+    record_cache_lookups("search_prefetch", hits=0, misses=len(search_queries))
 
     return {
-        "raw_articles": result_state.get("raw_articles", []),
-        "messages": result_state.get("messages", []),
+        "raw_articles": get_article_store(config).put_many(
+            result_state.get("raw_articles", [])
+        ),
+        "search_queries": search_queries,
+        "messages": compact_tool_messages(messages),
     }
@@ -1,12 +1,49 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from polyview.api.routes import analysis
+from polyview.core.checkpointing import (
+    CHECKPOINT_COMPACTION_INTERVAL,
+    compact_checkpoints,
+    open_checkpointer,
+)
+from polyview.core.logging import get_logger
+from polyview.core.metrics import monitor_event_loop_lag
+from polyview.workflows.research_workflow import workflow as research_workflow
+
+logger = get_logger(__name__)
+
+
+async def _compact_checkpoints_periodically(saver):
+    while True:
+        try:
+            await compact_checkpoints(saver)
+        except Exception as e:
+            logger.error(f"Checkpoint compaction failed: {e}")
+        await asyncio.sleep(CHECKPOINT_COMPACTION_INTERVAL.total_seconds())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Checkpoint the research graph so failed or interrupted analyses can be resumed
+    async with open_checkpointer() as saver:
+        app.state.research_graph = research_workflow.compile(checkpointer=saver)
+        compaction_task = asyncio.create_task(_compact_checkpoints_periodically(saver))
+        lag_monitor_task = asyncio.create_task(monitor_event_loop_lag())
+        yield
+        compaction_task.cancel()
+        lag_monitor_task.cancel()
+
 
 app = FastAPI(
     title="PolyView API",
     description="API for PolyView, a news analysis application providing multiple perspectives.",
     version="1.1.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration
@@ -30,3 +67,9 @@ app.include_router(analysis.router, prefix="/api/v1", tags=["Analysis"])
 @app.get("/")
 async def read_root():
     return {"message": "PolyView API is running!"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics of the API and the analyses it runs."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
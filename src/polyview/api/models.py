@@ -1,15 +1,97 @@
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+
+from polyview.core.profiles import (
+    DEFAULT_PROFILE,
+    ProfileName,
+    RunProfile,
+    resolve_profile,
+)
+from polyview.core.state import FinalPerspective
 
 
 class AnalysisRequest(BaseModel):
     topic: str
+    profile: ProfileName = DEFAULT_PROFILE
+    overrides: dict[str, Any] = Field(
+        default_factory=dict,
+        description="RunProfile fields that override the values of the chosen profile.",
+    )
+
+    @model_validator(mode="after")
+    def _validate_overrides(self) -> "AnalysisRequest":
+        self.run_profile()
+        return self
+
+    def run_profile(self) -> RunProfile:
+        return resolve_profile(self.profile, self.overrides)
 
 
 class AnalysisResponse(BaseModel):
     session_id: str
 
 
+class EvidenceItem(BaseModel):
+    id: str
+    statement: str
+
+
+class PerspectiveUpdate(BaseModel):
+    """
+    A perspective as shown by the client. Updates with the same id replace the earlier
+    version of that perspective, so perspectives can be sent one by one as they are ready.
+    """
+
+    id: str
+    title: str
+    summary: str
+    evidence: list[EvidenceItem]
+    strengths: list[str] = Field(default_factory=list)
+    weaknesses: list[str] = Field(default_factory=list)
+    rated_perspective_strength: int
+
+    @classmethod
+    def from_final_perspective(
+        cls, perspective: FinalPerspective
+    ) -> "PerspectiveUpdate":
+        name = perspective.perspective_name
+        return cls(
+            id=name,
+            title=name,
+            summary=perspective.narrative,
+            evidence=[
+                EvidenceItem(id=f"{name}-evidence-{i}", statement=statement)
+                for i, statement in enumerate(perspective.supporting_evidence)
+            ],
+            strengths=perspective.strengths,
+            weaknesses=perspective.weaknesses,
+            rated_perspective_strength=perspective.rated_perspective_strength,
+        )
+
+    def to_summary_input(self) -> dict[str, Any]:
+        """The perspective under the FinalPerspective field names a summary is written from."""
+        return {
+            "perspective_name": self.title,
+            "narrative": self.summary,
+            "supporting_evidence": [item.statement for item in self.evidence],
+            "strengths": self.strengths,
+            "weaknesses": self.weaknesses,
+            "rated_perspective_strength": self.rated_perspective_strength,
+        }
+
+
 class SummarizeRequest(BaseModel):
-    final_perspectives: list[dict[str, Any]]
+    """
+    Perspectives to summarize, either as final perspectives or as shown by the client
+    (PerspectiveUpdate). Anything else is rejected instead of being summarized from an
+    empty payload.
+    """
+
+    final_perspectives: list[FinalPerspective | PerspectiveUpdate]
+
+    def summary_input(self) -> list[FinalPerspective | dict[str, Any]]:
+        return [
+            p.to_summary_input() if isinstance(p, PerspectiveUpdate) else p
+            for p in self.final_perspectives
+        ]
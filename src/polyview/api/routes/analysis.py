@@ -1,12 +1,35 @@
 import asyncio
+import time
 import uuid
 
-from fastapi import APIRouter, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.responses import StreamingResponse
+from langgraph.graph.state import CompiledStateGraph
+from prometheus_client import REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
 from starlette.status import WS_1008_POLICY_VIOLATION
 
-from polyview.api.models import AnalysisRequest, AnalysisResponse, SummarizeRequest
+from polyview.api.models import (
+    AnalysisRequest,
+    AnalysisResponse,
+    PerspectiveUpdate,
+    SummarizeRequest,
+)
+from polyview.core.article_store import ArticleStore
 from polyview.core.logging import get_logger
+from polyview.core.metrics import TIME_TO_FIRST_INSIGHT
+from polyview.core.profiles import RunProfile
+from polyview.core.tracing import TracingCallbackHandler, get_tracing_handler
+from polyview.core.usage import UsageAccountant, queue_usage_updates
+from polyview.tasks.perspective_preview import MAX_PREVIEW_ARTICLES, generate_preview
 from polyview.workflows.research_workflow import graph as research_workflow_graph
 from polyview.workflows.summarization_workflow import summarization_workflow
 
@@ -17,15 +40,141 @@ router = APIRouter()
 # In-memory storage for active WebSocket connections and message queues (consider replacing with Redis in the future)
 active_connections: dict[str, list[WebSocket]] = {}
 session_message_queues: dict[str, asyncio.Queue] = {}
+# Sessions whose analysis has not started yet, and sessions whose analysis is running
+queued_sessions: set[str] = set()
+running_sessions: set[str] = set()
 
 
-async def run_analysis_workflow(session_id: str, topic: str):
+class _SessionCollector(Collector):
+    """Reports the session, subscriber and buffered message counts at scrape time."""
+
+    def collect(self):
+        sessions = GaugeMetricFamily(
+            "polyview_sessions", "Analysis sessions by state.", labels=["state"]
+        )
+        sessions.add_metric(["queued"], len(queued_sessions))
+        sessions.add_metric(["active"], len(running_sessions))
+        yield sessions
+        yield GaugeMetricFamily(
+            "polyview_websocket_subscribers",
+            "Connected WebSocket clients.",
+            value=sum(len(connections) for connections in active_connections.values()),
+        )
+        buffered = GaugeMetricFamily(
+            "polyview_session_buffered_messages",
+            "Messages waiting in a session's queue to be sent to its clients.",
+            labels=["session_id"],
+        )
+        for session_id, queue in list(session_message_queues.items()):
+            buffered.add_metric([session_id], queue.qsize())
+        yield buffered
+
+
+REGISTRY.register(_SessionCollector())
+
+
+class _TracedQueue(asyncio.Queue):
+    """
+    Session message queue that records how long each message waited before it was sent
+    to the client. Summary tokens are too many to trace one by one and are skipped.
+    """
+
+    def __init__(self, session_id: str, tracer: TracingCallbackHandler):
+        super().__init__()
+        self.session_id = session_id
+        self.tracer = tracer
+
+    def _put(self, item):
+        super()._put((time.time_ns(), item))
+
+    def _get(self):
+        enqueued_at, item = super()._get()
+        if item["type"] != "summary_token":
+            self.tracer.record_span(
+                "queue_wait",
+                self.session_id,
+                enqueued_at,
+                time.time_ns(),
+                {"message.type": item["type"]},
+            )
+        if item["type"] == "end_of_stream":
+            self.tracer.flush()
+        return item
+
+
+def _create_session_queue(session_id: str) -> asyncio.Queue:
+    tracer = get_tracing_handler()
+    return _TracedQueue(session_id, tracer) if tracer else asyncio.Queue()
+
+
+async def _send_preview(
+    queue: asyncio.Queue,
+    topic: str,
+    articles: list[dict],
+    started_at: float,
+    accountant: UsageAccountant,
+):
+    """
+    Sends a rough perspective preview drafted from the first search results, along with
+    the time from the start of the analysis to this first insight. The articles must
+    carry their content, as the graph releases it from the ArticleStore as it moves on.
+    """
+    try:
+        perspectives = await generate_preview(
+            topic,
+            articles,
+            {"callbacks": [accountant], "metadata": {"langgraph_node": "preview"}},
+        )
+    except Exception as e:
+        logger.warning(f"Perspective preview failed: {e}")
+        return
+
+    time_to_first_insight = time.perf_counter() - started_at
+    TIME_TO_FIRST_INSIGHT.observe(time_to_first_insight)
+    logger.info(
+        f"Sending preview of {len(perspectives)} perspectives "
+        f"(time to first insight: {time_to_first_insight:.2f}s)."
+    )
+    await queue.put(
+        {
+            "type": "partial_result",
+            "data": {
+                "type": "preview",
+                "perspectives": [p.model_dump() for p in perspectives],
+                "time_to_first_insight": round(time_to_first_insight, 2),
+            },
+        }
+    )
+
+
+def _get_research_graph(request: Request) -> CompiledStateGraph:
+    """The checkpointed research graph compiled at startup, or the plain graph without it."""
+    return getattr(request.app.state, "research_graph", research_workflow_graph)
+
+
+def _workflow_config(session_id: str, profile: RunProfile) -> dict:
+    # The profile is also stored in the checkpoint metadata, so a resumed run uses it again
+    return {
+        "configurable": {"profile": profile, "thread_id": session_id},
+        "metadata": {"profile": profile.model_dump()},
+    }
+
+
+async def run_analysis_workflow(
+    session_id: str,
+    topic: str,
+    profile: RunProfile,
+    graph: CompiledStateGraph = research_workflow_graph,
+    resume: bool = False,
+):
     """
     Runs the analysis workflow for the given topic and session. This function orchestrates
     the execution of a research workflow, streams its progress updates over a queue, and
     compiles the final perspective results. It handles workflow stages, progress reporting,
     and manages streaming of intermediate results to the message queue for downstream
-    processing.
+    processing. As soon as the first articles are found, a quick preview of the
+    perspectives is generated alongside the deep analysis, which later replaces it. Each
+    final perspective is sent as soon as it is synthesized, keyed by its id.
 
     :param session_id: A string representing the unique identifier for the session.
                        This is used to fetch the associated message queue.
@@ -33,23 +182,85 @@ async def run_analysis_workflow(session_id: str, topic: str):
     :param topic: A string specifying the topic for which the analysis workflow is
                   performed.
     :type topic: str
+    :param profile: The run profile that sets the depth of the research, passed to every
+                    node through the graph config.
+    :type profile: RunProfile
+    :param graph: The compiled research graph. With a checkpointer, its state is saved
+                  after every node under the session id.
+    :type graph: CompiledStateGraph
+    :param resume: Whether to continue the session from its last checkpoint instead of
+                   starting a new analysis.
+    :type resume: bool
     :return: None
     """
     queue = session_message_queues.get(session_id)
     if not queue:
         return
 
+    queued_sessions.discard(session_id)
+    running_sessions.add(session_id)
     final_state: dict = {}
+    started_at = time.perf_counter()
+    preview_task: asyncio.Task | None = None
+    # Running token and cost totals are sent as status events after every LLM call
+    accountant = UsageAccountant(
+        session_id, topic, on_update=queue_usage_updates(queue)
+    )
+    status = "interrupted"
 
     try:
-        await queue.put(
-            {"type": "status", "message": f"Starting analysis for topic: '{topic}'"}
-        )
-
-        initial_state = {"topic": topic, "iteration": 0}
+        config = {**_workflow_config(session_id, profile), "callbacks": [accountant]}
+        if resume:
+            await queue.put(
+                {"type": "status", "message": f"Resuming analysis for topic: '{topic}'"}
+            )
+            # If the research had already finished, the graph has nothing left to run
+            # and the checkpointed state goes straight to summarization
+            snapshot = await graph.aget_state(config)
+            final_state = dict(snapshot.values)
+            workflow_input = None
+        else:
+            await queue.put(
+                {"type": "status", "message": f"Starting analysis for topic: '{topic}'"}
+            )
+            workflow_input = {"topic": topic, "iteration": 0}
 
         # Stream the workflow execution
-        async for state in research_workflow_graph.astream(initial_state):
+        async for stream_mode, state in graph.astream(
+            workflow_input, config, stream_mode=["updates", "custom"]
+        ):
+            if stream_mode == "custom":
+                if state.get("type") == "perspective":
+                    update = PerspectiveUpdate.from_final_perspective(
+                        state["perspective"]
+                    )
+                    logger.debug(f"Sending perspective update: {update.id}")
+                    await queue.put(
+                        {
+                            "type": "partial_result",
+                            "data": {
+                                "type": "perspective",
+                                "perspective": update.model_dump(),
+                            },
+                        }
+                    )
+                elif (
+                    state.get("type") == "articles"
+                    and not resume
+                    and preview_task is None
+                ):
+                    # Pipelined search sends the content along, as it never stores it
+                    preview_task = asyncio.create_task(
+                        _send_preview(
+                            queue,
+                            topic,
+                            state["articles"][:MAX_PREVIEW_ARTICLES],
+                            started_at,
+                            accountant,
+                        )
+                    )
+                continue
+
             current_node = list(state.keys())[
                 -1
             ]  # Get the name of the last node that ran
@@ -105,6 +316,30 @@ async def run_analysis_workflow(session_id: str, topic: str):
                         "message": f"Current iteration: {node_data['iteration']}",
                     }
                 )
+            if "novelty" in node_data:
+                logger.debug(f"Sending novelty update: {node_data['novelty']}")
+                await queue.put(
+                    {
+                        "type": "partial_result",
+                        "data": {"type": "novelty", "value": node_data["novelty"]},
+                    }
+                )
+                await queue.put(
+                    {
+                        "type": "status",
+                        "message": f"Novelty of the last research cycle: {node_data['novelty']:.0%}",
+                    }
+                )
+            if not resume and preview_task is None and node_data.get("raw_articles"):
+                # Read the content now; the next nodes release it from the store
+                preview_articles = ArticleStore(session_id).load_many(
+                    node_data["raw_articles"][:MAX_PREVIEW_ARTICLES]
+                )
+                preview_task = asyncio.create_task(
+                    _send_preview(
+                        queue, topic, preview_articles, started_at, accountant
+                    )
+                )
             if "raw_articles" in node_data:
                 logger.debug(
                     f"Sending article status update: {len(node_data['raw_articles'])}"
@@ -134,8 +369,11 @@ async def run_analysis_workflow(session_id: str, topic: str):
         )
 
         summary_result = ""
+        # The thread id puts the summarization into the session's trace
         async for chunk, _metadata in summarization_workflow.astream(
-            final_state, stream_mode="messages"
+            final_state,
+            {"configurable": {"thread_id": session_id}, "callbacks": [accountant]},
+            stream_mode="messages",
         ):
             token = chunk.content
             summary_result += token
@@ -151,24 +389,84 @@ async def run_analysis_workflow(session_id: str, topic: str):
                         p.model_dump()
                         for p in final_state.get("final_perspectives", [])
                     ],
+                    "usage": accountant.totals().model_dump(),
                 },
             }
         )
+        status = "completed"
+        # Content of failed runs is kept, as a resumed run may still need it
+        ArticleStore(session_id).clear()
 
     except Exception as e:
         logger.error(f"Error running analysis workflow: {e}")
         await queue.put({"type": "error", "message": f"Analysis failed: {str(e)}"})
+        status = "failed"
     finally:
+        running_sessions.discard(session_id)
+        accountant.record(status=status, resumed=resume, profile=profile.model_dump())
+        if preview_task is not None and not preview_task.done():
+            # The deep analysis finished first, so the preview is no longer needed
+            preview_task.cancel()
         await queue.put({"type": "end_of_stream"})
 
 
 @router.post("/analyze", response_model=AnalysisResponse)
-async def analyze_topic(request: AnalysisRequest, background_tasks: BackgroundTasks):
+async def analyze_topic(
+    request: AnalysisRequest, background_tasks: BackgroundTasks, http_request: Request
+):
     session_id = str(uuid.uuid4())
-    session_message_queues[session_id] = asyncio.Queue()
+    session_message_queues[session_id] = _create_session_queue(session_id)
     active_connections[session_id] = []
+    queued_sessions.add(session_id)
+
+    background_tasks.add_task(
+        run_analysis_workflow,
+        session_id,
+        request.topic,
+        request.run_profile(),
+        _get_research_graph(http_request),
+    )
+    return AnalysisResponse(session_id=session_id)
+
+
+@router.post("/resume/{session_id}", response_model=AnalysisResponse)
+async def resume_analysis(
+    session_id: str, background_tasks: BackgroundTasks, http_request: Request
+):
+    """
+    Resumes a failed or interrupted analysis from the last node that completed, using the
+    checkpoint saved under the session id. Progress is streamed over the session's
+    WebSocket like for a new analysis.
 
-    background_tasks.add_task(run_analysis_workflow, session_id, request.topic)
+    :param session_id: The session id returned by /analyze for the original analysis.
+    :type session_id: str
+    :return: The session id to connect the WebSocket to.
+    :rtype: AnalysisResponse
+    """
+    graph = _get_research_graph(http_request)
+    if graph.checkpointer is None:
+        raise HTTPException(status_code=503, detail="Checkpointing is not enabled.")
+
+    snapshot = await graph.aget_state({"configurable": {"thread_id": session_id}})
+    if not snapshot.values:
+        raise HTTPException(status_code=404, detail="No checkpoint found for session.")
+    # The run may go on after its last client disconnected, so check the run itself
+    if session_id in queued_sessions or session_id in running_sessions:
+        raise HTTPException(status_code=409, detail="Session is still running.")
+
+    profile = RunProfile.model_validate((snapshot.metadata or {}).get("profile") or {})
+    session_message_queues[session_id] = _create_session_queue(session_id)
+    active_connections[session_id] = []
+    queued_sessions.add(session_id)
+
+    background_tasks.add_task(
+        run_analysis_workflow,
+        session_id,
+        snapshot.values["topic"],
+        profile,
+        graph,
+        True,
+    )
     return AnalysisResponse(session_id=session_id)
 
 
@@ -240,7 +538,7 @@ async def summarize(request: SummarizeRequest):
     async def stream_summary():
         try:
             async for chunk, _metadata in summarization_workflow.astream(
-                {"final_perspectives": request.final_perspectives},
+                {"final_perspectives": request.summary_input()},
                 stream_mode="messages",
             ):
                 if hasattr(chunk, "content"):
@@ -0,0 +1,86 @@
+import os
+from pathlib import Path
+import shutil
+import tempfile
+
+from langchain_core.runnables import RunnableConfig
+
+from polyview.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+ARTICLE_STORE_DIR = Path(
+    os.environ.get(
+        "POLYVIEW_ARTICLE_STORE_DIR",
+        Path(tempfile.gettempdir()) / "polyview_articles",
+    )
+)
+# Session used when the graph is run without a thread_id
+DEFAULT_SESSION = "default"
+
+
+def without_content(article: dict) -> dict:
+    """Returns the article's metadata, as carried in the graph state."""
+    return {k: v for k, v in article.items() if k != "content"}
+
+
+class ArticleStore:
+    """
+    File-backed store of article contents for one analysis session, keyed by the article
+    id (the sha256 of its URL).
+
+    The graph state only carries article ids and metadata; the content is written here
+    when an article is found and read back by the nodes that need it. Files are deleted
+    once the articles are no longer needed, see release and clear.
+    """
+
+    def __init__(self, session_id: str = DEFAULT_SESSION, root: Path | None = None):
+        self.path = (root or ARTICLE_STORE_DIR) / session_id
+
+    def _file(self, article_id: str) -> Path:
+        return self.path / f"{article_id}.txt"
+
+    def put(self, article: dict) -> dict:
+        """
+        Writes the article's content to the store and returns the article without it.
+        Articles without a content key are returned unchanged.
+        """
+        if "content" not in article:
+            return article
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._file(article["id"]).write_text(article["content"] or "", encoding="utf-8")
+        return without_content(article)
+
+    def put_many(self, articles: list[dict]) -> list[dict]:
+        return [self.put(article) for article in articles]
+
+    def get_content(self, article_id: str) -> str:
+        try:
+            return self._file(article_id).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            logger.warning(f"No stored content for article {article_id}.")
+            return ""
+
+    def load(self, article: dict) -> dict:
+        """Returns the article with its content, reading it from the store if missing."""
+        if "content" in article:
+            return article
+        return {**article, "content": self.get_content(article["id"])}
+
+    def load_many(self, articles: list[dict]) -> list[dict]:
+        return [self.load(article) for article in articles]
+
+    def release(self, article_ids: list[str]) -> None:
+        """Deletes the content of articles that are no longer needed."""
+        for article_id in article_ids:
+            self._file(article_id).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Deletes all content of the session."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def get_article_store(config: RunnableConfig | None) -> ArticleStore:
+    """Returns the store of the session in config["configurable"]["thread_id"]."""
+    thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+    return ArticleStore(thread_id or DEFAULT_SESSION)
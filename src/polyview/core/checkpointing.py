@@ -0,0 +1,66 @@
+from datetime import UTC, datetime, timedelta
+import os
+
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from polyview.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CHECKPOINT_DB_PATH = os.environ.get("POLYVIEW_CHECKPOINT_DB", "polyview_checkpoints.db")
+# Sessions whose latest checkpoint is older than this are deleted entirely
+CHECKPOINT_RETENTION = timedelta(days=7)
+CHECKPOINT_COMPACTION_INTERVAL = timedelta(hours=1)
+
+
+def open_checkpointer(path: str = CHECKPOINT_DB_PATH):
+    """
+    Returns an async context manager yielding a SQLite checkpointer. Graphs compiled with
+    it persist their state after every node, keyed by config["configurable"]["thread_id"].
+    """
+    return AsyncSqliteSaver.from_conn_string(path)
+
+
+async def compact_checkpoints(
+    saver: AsyncSqliteSaver, retention: timedelta = CHECKPOINT_RETENTION
+) -> tuple[int, int]:
+    """
+    Keeps the checkpoint store bounded.
+
+    Sessions whose latest checkpoint is older than retention are deleted. Of the remaining
+    sessions, only the latest checkpoint (and its pending writes) is kept, which is all
+    that is needed to resume them. Returns the number of deleted sessions and checkpoints.
+    """
+    cutoff = datetime.now(UTC) - retention
+    latest_by_thread: dict[str, datetime] = {}
+    async for checkpoint_tuple in saver.alist(None):
+        thread_id = checkpoint_tuple.config["configurable"]["thread_id"]
+        ts = datetime.fromisoformat(checkpoint_tuple.checkpoint["ts"])
+        latest_by_thread[thread_id] = max(ts, latest_by_thread.get(thread_id, ts))
+
+    expired = [t for t, ts in latest_by_thread.items() if ts < cutoff]
+    for thread_id in expired:
+        await saver.adelete_thread(thread_id)
+
+    # Checkpoint ids are time-ordered, so the maximum id is the latest checkpoint
+    latest_ids = """
+        SELECT thread_id, checkpoint_ns, MAX(checkpoint_id) FROM checkpoints
+        GROUP BY thread_id, checkpoint_ns
+    """
+    async with saver.lock:
+        cursor = await saver.conn.execute(
+            f"DELETE FROM checkpoints WHERE (thread_id, checkpoint_ns, checkpoint_id) "
+            f"NOT IN ({latest_ids})"
+        )
+        deleted_checkpoints = cursor.rowcount
+        await saver.conn.execute(
+            f"DELETE FROM writes WHERE (thread_id, checkpoint_ns, checkpoint_id) "
+            f"NOT IN ({latest_ids})"
+        )
+        await saver.conn.commit()
+
+    logger.info(
+        f"Checkpoint compaction deleted {len(expired)} expired session(s) and "
+        f"{deleted_checkpoints} superseded checkpoint(s)."
+    )
+    return len(expired), deleted_checkpoints
@@ -0,0 +1,234 @@
+import asyncio
+from contextvars import ContextVar
+import threading
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from prometheus_client import Counter, Gauge, Histogram
+
+from polyview.core.tracing import RETRY_WAIT_EVENT
+
+# Label value for runs outside of a graph node
+NO_NODE = "none"
+EVENT_LOOP_LAG_INTERVAL_SECONDS = 1.0
+
+NODE_DURATION = Histogram(
+    "polyview_node_duration_seconds",
+    "Duration of graph node runs.",
+    ["node", "status"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+LLM_CALLS = Counter(
+    "polyview_llm_calls_total", "LLM calls.", ["model", "node", "status"]
+)
+LLM_TOKENS = Counter(
+    "polyview_llm_tokens_total",
+    "LLM tokens used, by direction (input or output).",
+    ["model", "node", "direction"],
+)
+LLM_RATE_LIMIT_RETRIES = Counter(
+    "polyview_llm_rate_limit_retries_total",
+    "LLM calls retried after a rate limit error.",
+    ["model", "node"],
+)
+TOOL_CALLS = Counter(
+    "polyview_tool_calls_total",
+    "Tool calls such as Tavily searches.",
+    ["tool", "node", "status"],
+)
+CACHE_LOOKUPS = Counter(
+    "polyview_cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+TIME_TO_FIRST_INSIGHT = Histogram(
+    "polyview_time_to_first_insight_seconds",
+    "Time from the start of an analysis until its perspective preview is sent.",
+    buckets=(1, 2.5, 5, 10, 15, 20, 30, 45, 60, 90, 120),
+)
+EVENT_LOOP_LAG = Gauge(
+    "polyview_event_loop_lag_seconds",
+    "How late the event loop last woke up a sleeping task.",
+)
+
+
+def record_cache_lookups(cache: str, hits: int, misses: int) -> None:
+    CACHE_LOOKUPS.labels(cache=cache, result="hit").inc(hits)
+    CACHE_LOOKUPS.labels(cache=cache, result="miss").inc(misses)
+
+
+async def monitor_event_loop_lag(
+    interval: float = EVENT_LOOP_LAG_INTERVAL_SECONDS,
+) -> None:
+    """Measures the event loop lag every interval until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started_at = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.set(max(0.0, loop.time() - started_at - interval))
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Updates the Prometheus metrics from graph node, LLM and tool runs, and from the retry
+    waits reported by gemini_api_delayed_retry.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Start time and labels of every active node, LLM and tool run
+        self._runs: dict[UUID, tuple[float, dict[str, str]]] = {}
+
+    def _start(self, run_id: UUID, **labels: str) -> None:
+        with self._lock:
+            self._runs[run_id] = (time.perf_counter(), labels)
+
+    def _end(self, run_id: UUID) -> tuple[float, dict[str, str]] | None:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return None
+        started_at, labels = run
+        return time.perf_counter() - started_at, labels
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node and kwargs.get("name") == node:
+            self._start(run_id, node=node)
+
+    def _end_chain(self, run_id: UUID, status: str) -> None:
+        run = self._end(run_id)
+        if run is not None:
+            duration, labels = run
+            NODE_DURATION.labels(status=status, **labels).observe(duration)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_chain(run_id, "ok")
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end_chain(run_id, "error")
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        model = (
+            metadata.get("ls_model_name")
+            or kwargs.get("name")
+            or (serialized or {}).get("name")
+        )
+        self._start(
+            run_id,
+            model=str(model),
+            node=metadata.get("langgraph_node") or NO_NODE,
+        )
+
+    def on_llm_start(
+        self,
+        serialized: dict[str, Any],
+        prompts: list[str],
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.on_chat_model_start(
+            serialized, [], run_id=run_id, metadata=metadata, **kwargs
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._end(run_id)
+        if run is None:
+            return
+        _, labels = run
+        LLM_CALLS.labels(status="ok", **labels).inc()
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    LLM_TOKENS.labels(direction="input", **labels).inc(
+                        usage.get("input_tokens", 0)
+                    )
+                    LLM_TOKENS.labels(direction="output", **labels).inc(
+                        usage.get("output_tokens", 0)
+                    )
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        run = self._end(run_id)
+        if run is not None:
+            LLM_CALLS.labels(status="error", **run[1]).inc()
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(
+            run_id,
+            tool=str(kwargs.get("name") or (serialized or {}).get("name")),
+            node=(metadata or {}).get("langgraph_node") or NO_NODE,
+        )
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._end(run_id)
+        if run is not None:
+            TOOL_CALLS.labels(status="ok", **run[1]).inc()
+
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        run = self._end(run_id)
+        if run is not None:
+            TOOL_CALLS.labels(status="error", **run[1]).inc()
+
+    def on_custom_event(
+        self,
+        name: str,
+        data: Any,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if name == RETRY_WAIT_EVENT:
+            LLM_RATE_LIMIT_RETRIES.labels(
+                model=str(data.get("model")),
+                node=(metadata or {}).get("langgraph_node") or NO_NODE,
+            ).inc()
+
+
+# Adds the handler to every run in every thread, see core.tracing
+_metrics_handler = MetricsCallbackHandler()
+_metrics_handler_var: ContextVar[MetricsCallbackHandler | None] = ContextVar(
+    "polyview_metrics_handler", default=_metrics_handler
+)
+register_configure_hook(_metrics_handler_var, inheritable=True)
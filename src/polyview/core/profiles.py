@@ -0,0 +1,137 @@
+from typing import Any, Literal
+
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+# Upper bound of search results per query; the search tool always requests this many
+# and the results are trimmed to the profile's max_search_results_per_query
+MAX_SEARCH_RESULTS_LIMIT = 5
+
+ProfileName = Literal["quick", "standard", "deep"]
+DEFAULT_PROFILE: ProfileName = "standard"
+
+
+class RunProfile(BaseModel):
+    """
+    The depth and cost knobs of a single analysis run. The defaults are the standard
+    profile.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    max_iterations: int = Field(
+        default=2, ge=1, le=5, description="Maximum number of research cycles."
+    )
+    min_articles_to_summarize: int = Field(
+        default=3,
+        ge=0,
+        description="Articles needed after the first cycle to stop researching early.",
+    )
+    min_perspectives_to_summarize: int = Field(
+        default=2,
+        ge=0,
+        description="Perspectives needed after the first cycle to stop researching early.",
+    )
+    min_initial_search_queries: int = Field(default=2, ge=1, le=10)
+    max_initial_search_queries: int = Field(default=3, ge=1, le=10)
+    max_additional_queries: int = Field(default=2, ge=0, le=10)
+    max_search_results_per_query: int = Field(
+        default=3, ge=1, le=MAX_SEARCH_RESULTS_LIMIT
+    )
+    article_budget: int = Field(
+        default=15,
+        ge=1,
+        le=50,
+        description="Maximum number of articles sent to perspective identification per run.",
+    )
+    min_novelty: float = Field(
+        default=0.2,
+        ge=0,
+        le=1,
+        description="Research stops once a cycle's novelty score falls below this.",
+    )
+    extraction_profile: Literal["fast", "full"] = "full"
+    pipelined: bool = Field(
+        default=False,
+        description="Extract each article as soon as the search returns it, overlapping search and extraction.",
+    )
+    speculative_prefetch: bool = Field(
+        default=False,
+        description="Search for the next cycle's articles while the current cycle is synthesized.",
+    )
+    message_retention: int = Field(
+        default=30,
+        ge=1,
+        description="Messages kept in the state; older ones are removed at the start of each research cycle.",
+    )
+    use_lite_model: bool = Field(
+        default=False,
+        description="Use the lite model for search, extraction, clustering and synthesis.",
+    )
+
+    @model_validator(mode="after")
+    def _check_query_range(self) -> "RunProfile":
+        if self.min_initial_search_queries > self.max_initial_search_queries:
+            raise ValueError(
+                "min_initial_search_queries must not exceed max_initial_search_queries"
+            )
+        return self
+
+
+PROFILE_PRESETS: dict[str, RunProfile] = {
+    "quick": RunProfile(
+        max_iterations=1,
+        min_initial_search_queries=1,
+        max_initial_search_queries=2,
+        max_additional_queries=0,
+        article_budget=6,
+        extraction_profile="fast",
+        pipelined=True,
+        use_lite_model=True,
+    ),
+    "standard": RunProfile(),
+    "deep": RunProfile(
+        max_iterations=3,
+        min_articles_to_summarize=5,
+        min_perspectives_to_summarize=3,
+        min_initial_search_queries=3,
+        max_initial_search_queries=5,
+        max_additional_queries=3,
+        max_search_results_per_query=5,
+        article_budget=30,
+        min_novelty=0.1,
+        speculative_prefetch=True,
+    ),
+}
+
+
+def resolve_profile(
+    name: str = DEFAULT_PROFILE, overrides: dict[str, Any] | None = None
+) -> RunProfile:
+    """
+    Returns the named preset with the given field overrides applied. Overrides are
+    validated like the preset itself, so unknown fields and out-of-range values raise.
+    """
+    if name not in PROFILE_PRESETS:
+        raise ValueError(
+            f"Unknown profile '{name}'. Choose one of: {', '.join(PROFILE_PRESETS)}."
+        )
+    preset = PROFILE_PRESETS[name]
+    if not overrides:
+        return preset
+    return RunProfile.model_validate({**preset.model_dump(), **overrides})
+
+
+def get_run_profile(config: RunnableConfig | None) -> RunProfile:
+    """
+    Returns the run profile from config["configurable"]["profile"], falling back to the
+    standard preset when the graph is run without one.
+    """
+    profile = ((config or {}).get("configurable") or {}).get("profile")
+    if profile is None:
+        return PROFILE_PRESETS[DEFAULT_PROFILE]
+    if isinstance(profile, str):
+        return resolve_profile(profile)
+    if isinstance(profile, dict):
+        return RunProfile.model_validate(profile)
+    return profile
@@ -1,3 +1,4 @@
+import operator
 from typing import Annotated, TypedDict
 
 from langchain_core.messages import BaseMessage
@@ -6,11 +7,17 @@ from pydantic import BaseModel, Field
 
 
 class RawArticle(BaseModel):
-    """Represents a single scraped article."""
+    """
+    Represents a single scraped article. In the graph state, the content is left out and
+    kept in the session's ArticleStore instead.
+    """
 
     id: str
     url: str
-    content: str
+    content: str | None = None
+    relevance_score: float | None = None
+    content_tokens_before: int | None = None
+    content_tokens_after: int | None = None
 
 
 class ExtractedPerspective(BaseModel):
@@ -68,6 +75,14 @@ class ConsolidatedPerspective(BaseModel):
     preliminary_synthesis: str = Field(
         description="A draft narrative generated by the clustering node based on the aggregated narratives, serving as a starting point for the final synthesis."
     )
+    argument_counts: dict[str, int] = Field(
+        default_factory=dict,
+        description="How often each aggregated argument (or a near-duplicate of it) was made.",
+    )
+    evidence_counts: dict[str, int] = Field(
+        default_factory=dict,
+        description="How often each piece of supporting evidence (or a near-duplicate of it) was cited.",
+    )
 
 
 class FinalPerspective(BaseModel):
@@ -103,15 +118,45 @@ class FinalPerspective(BaseModel):
     )
 
 
+class CycleNovelty(BaseModel):
+    """What the last research cycle added to the known perspectives and arguments."""
+
+    new_clusters: int = 0
+    total_clusters: int = 0
+    new_arguments: int = 0
+    total_arguments: int = 0
+
+    @property
+    def score(self) -> float:
+        """Mean of the fractions of new clusters and new arguments (0 = saturated)."""
+        cluster_fraction = (
+            self.new_clusters / self.total_clusters if self.total_clusters else 0.0
+        )
+        argument_fraction = (
+            self.new_arguments / self.total_arguments if self.total_arguments else 0.0
+        )
+        return (cluster_fraction + argument_fraction) / 2
+
+
 class State(TypedDict):
     messages: Annotated[list[BaseMessage], add_messages]
     topic: str
+    search_queries: list[str]
 
     raw_articles: list[RawArticle]
+    # Articles searched speculatively for the next cycle while the current one finishes
+    prefetched_articles: list[RawArticle]
+    prefetched_queries: list[str]
+    processed_article_ids: Annotated[list[str], operator.add]
     article_perspectives: list[ArticlePerspectives]
     consolidated_perspectives: list[ConsolidatedPerspective]
 
     final_perspectives: list[FinalPerspective]
+    # Final perspectives by content fingerprint, to skip re-synthesizing unchanged clusters
+    synthesis_cache: dict[str, FinalPerspective]
     summary: str
 
     iteration: int
+    cycle_novelty: CycleNovelty
+    # Novelty score of the last completed cycle, see CycleNovelty.score
+    novelty: float
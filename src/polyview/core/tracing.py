@@ -0,0 +1,475 @@
+from contextvars import ContextVar
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+from urllib import request as urllib_request
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.callbacks.manager import (
+    adispatch_custom_event,
+    dispatch_custom_event,
+)
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from pydantic import BaseModel, Field
+
+from polyview.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Tracing is enabled by setting a trace file, an OTLP/HTTP endpoint (e.g. a local
+# collector at http://localhost:4318), or both
+TRACE_FILE = os.environ.get("POLYVIEW_TRACE_FILE")
+OTLP_ENDPOINT = os.environ.get("POLYVIEW_OTLP_ENDPOINT")
+OTLP_EXPORT_TIMEOUT_SECONDS = 5
+SERVICE_NAME = "polyview"
+
+RETRY_WAIT_EVENT = "retry_wait"
+
+# OTLP span kinds and status codes
+_SPAN_KIND_INTERNAL = 1
+_SPAN_KIND_CLIENT = 3
+_STATUS_CODE_ERROR = 2
+
+
+class Span(BaseModel):
+    """A finished or running span, exported in the OTLP JSON format."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None = None
+    kind: int = _SPAN_KIND_INTERNAL
+    start_time_ns: int = Field(default_factory=time.time_ns)
+    end_time_ns: int | None = None
+    attributes: dict[str, Any] = Field(default_factory=dict)
+    error: str | None = None
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or self.start_time_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+                if value is not None
+            ],
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.error:
+            span["status"] = {"code": _STATUS_CODE_ERROR, "message": self.error}
+        return span
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def trace_id_for(session_id: str) -> str:
+    """All spans of a session share a trace id derived from the session id."""
+    return hashlib.sha256(session_id.encode()).hexdigest()[:32]
+
+
+def _span_id(run_id: UUID) -> str:
+    # The last half of the run id is random for both uuid4 and uuid7 run ids
+    return run_id.hex[16:]
+
+
+def export_spans(
+    spans: list[Span],
+    path: str | None = TRACE_FILE,
+    endpoint: str | None = OTLP_ENDPOINT,
+) -> None:
+    """
+    Exports spans as one OTLP ExportTraceServiceRequest. The request is appended as a
+    single line to the trace file (the format of the collector's file exporter) and/or
+    posted to the endpoint's /v1/traces in a background thread.
+    """
+    if not spans:
+        return
+    payload = {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": _otlp_value(SERVICE_NAME)}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": SERVICE_NAME},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+    body = json.dumps(payload, separators=(",", ":"))
+    if path:
+        with Path(path).open("a", encoding="utf-8") as f:
+            f.write(body + "\n")
+    if endpoint:
+        threading.Thread(target=_post_spans, args=(endpoint, body), daemon=True).start()
+
+
+def _post_spans(endpoint: str, body: str) -> None:
+    req = urllib_request.Request(
+        f"{endpoint.rstrip('/')}/v1/traces",
+        data=body.encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib_request.urlopen(req, timeout=OTLP_EXPORT_TIMEOUT_SECONDS):
+            pass
+    except Exception as e:
+        logger.warning(f"Exporting spans to {endpoint} failed: {e}")
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Records spans for graph runs, graph nodes, LLM calls (with token counts), tool calls
+    and retry waits, and exports them whenever a top-level run finishes.
+
+    Spans are grouped into one trace per session, using the thread_id that LangGraph
+    copies from the config into the run metadata. Runs that are not spans themselves
+    (prompts, parsers, sequences) are skipped, and their children are attached to the
+    nearest recorded ancestor.
+    """
+
+    run_inline = True
+
+    def __init__(
+        self, path: str | None = TRACE_FILE, endpoint: str | None = OTLP_ENDPOINT
+    ):
+        self.path = path
+        self.endpoint = endpoint
+        self._lock = threading.Lock()
+        # Parent of every active run, and the trace of every active root run
+        self._parents: dict[UUID, UUID | None] = {}
+        self._traces: dict[UUID, str] = {}
+        self._spans: dict[UUID, Span] = {}
+        self._finished: list[Span] = []
+
+    def _root_of(self, run_id: UUID) -> UUID:
+        while self._parents.get(run_id) is not None:
+            run_id = self._parents[run_id]
+        return run_id
+
+    def _recorded_ancestor(self, run_id: UUID | None) -> Span | None:
+        while run_id is not None and run_id not in self._spans:
+            run_id = self._parents.get(run_id)
+        return self._spans.get(run_id) if run_id is not None else None
+
+    def _start_run(
+        self,
+        run_id: UUID,
+        parent_run_id: UUID | None,
+        metadata: dict | None,
+        name: str | None = None,
+        kind: int = _SPAN_KIND_INTERNAL,
+        attributes: dict | None = None,
+    ) -> None:
+        with self._lock:
+            if parent_run_id not in self._parents:
+                # A top-level run, or one whose parent started before tracing did
+                parent_run_id = None
+                thread_id = (metadata or {}).get("thread_id")
+                self._traces[run_id] = trace_id_for(str(thread_id or run_id))
+            self._parents[run_id] = parent_run_id
+            if name is None:
+                return
+            parent = self._recorded_ancestor(parent_run_id)
+            self._spans[run_id] = Span(
+                name=name,
+                trace_id=self._traces[self._root_of(run_id)],
+                span_id=_span_id(run_id),
+                parent_span_id=parent.span_id if parent else None,
+                kind=kind,
+                attributes={
+                    "session.id": (metadata or {}).get("thread_id"),
+                    **(attributes or {}),
+                },
+            )
+
+    def _end_run(
+        self,
+        run_id: UUID,
+        error: BaseException | None = None,
+        attributes: dict | None = None,
+    ) -> None:
+        with self._lock:
+            span = self._spans.pop(run_id, None)
+            if span is not None:
+                span.end_time_ns = time.time_ns()
+                span.attributes.update(attributes or {})
+                if error is not None:
+                    span.error = f"{type(error).__name__}: {error}"
+                self._finished.append(span)
+            is_root = self._parents.pop(run_id, None) is None
+            self._traces.pop(run_id, None)
+        if is_root:
+            self.flush()
+
+    def flush(self) -> None:
+        """Exports all finished spans."""
+        with self._lock:
+            spans, self._finished = self._finished, []
+        try:
+            export_spans(spans, self.path, self.endpoint)
+        except Exception as e:
+            logger.warning(f"Exporting {len(spans)} spans failed: {e}")
+
+    def record_span(
+        self,
+        name: str,
+        session_id: str,
+        start_time_ns: int,
+        end_time_ns: int,
+        attributes: dict | None = None,
+    ) -> None:
+        """Records a span that is not part of a LangChain run, e.g. a queue wait."""
+        with self._lock:
+            self._finished.append(
+                Span(
+                    name=name,
+                    trace_id=trace_id_for(session_id),
+                    span_id=os.urandom(8).hex(),
+                    start_time_ns=start_time_ns,
+                    end_time_ns=end_time_ns,
+                    attributes={"session.id": session_id, **(attributes or {})},
+                )
+            )
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name")
+        node = (metadata or {}).get("langgraph_node")
+        if parent_run_id is None:
+            # A top-level run, usually a graph
+            self._start_run(run_id, None, metadata, name)
+        elif node and name == node:
+            self._start_run(
+                run_id,
+                parent_run_id,
+                metadata,
+                node,
+                attributes={"langgraph.step": metadata.get("langgraph_step")},
+            )
+        else:
+            self._start_run(run_id, parent_run_id, metadata)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_run(run_id)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end_run(run_id, error)
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        model = (
+            (metadata or {}).get("ls_model_name")
+            or kwargs.get("name")
+            or (serialized or {}).get("name")
+        )
+        self._start_run(
+            run_id,
+            parent_run_id,
+            metadata,
+            f"llm {model}",
+            kind=_SPAN_KIND_CLIENT,
+            attributes={"gen_ai.request.model": model},
+        )
+
+    def on_llm_start(
+        self,
+        serialized: dict[str, Any],
+        prompts: list[str],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.on_chat_model_start(
+            serialized,
+            [],
+            run_id=run_id,
+            parent_run_id=parent_run_id,
+            metadata=metadata,
+            **kwargs,
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(
+                    getattr(generation, "message", None), "usage_metadata", None
+                )
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+        self._end_run(
+            run_id,
+            attributes={
+                "gen_ai.usage.input_tokens": input_tokens,
+                "gen_ai.usage.output_tokens": output_tokens,
+            },
+        )
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end_run(run_id, error)
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name")
+        self._start_run(
+            run_id,
+            parent_run_id,
+            metadata,
+            f"tool {name}",
+            kind=_SPAN_KIND_CLIENT,
+            attributes={"tool.input": input_str[:200]},
+        )
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_run(run_id)
+
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end_run(run_id, error)
+
+    def on_custom_event(
+        self,
+        name: str,
+        data: Any,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if name != RETRY_WAIT_EVENT:
+            return
+        with self._lock:
+            parent = self._recorded_ancestor(run_id)
+            trace_id = (
+                parent.trace_id
+                if parent
+                else trace_id_for(str((metadata or {}).get("thread_id") or run_id))
+            )
+            self._finished.append(
+                Span(
+                    name=RETRY_WAIT_EVENT,
+                    trace_id=trace_id,
+                    span_id=os.urandom(8).hex(),
+                    parent_span_id=parent.span_id if parent else None,
+                    start_time_ns=data["start_time_ns"],
+                    end_time_ns=data["end_time_ns"],
+                    attributes={
+                        "session.id": (metadata or {}).get("thread_id"),
+                        "retry.attempt": data.get("attempt"),
+                        "retry.delay_seconds": data.get("delay_seconds"),
+                        "gen_ai.request.model": data.get("model"),
+                    },
+                )
+            )
+
+
+def _retry_wait_data(
+    start_time_ns: int, delay_seconds: float, attempt: int, model: str | None
+) -> dict:
+    return {
+        "start_time_ns": start_time_ns,
+        "end_time_ns": time.time_ns(),
+        "delay_seconds": delay_seconds,
+        "attempt": attempt,
+        "model": model,
+    }
+
+
+def record_retry_wait(
+    start_time_ns: int, delay_seconds: float, attempt: int, model: str | None = None
+) -> None:
+    """Reports a finished retry wait to the callback handlers of the current run, if any."""
+    try:
+        dispatch_custom_event(
+            RETRY_WAIT_EVENT,
+            _retry_wait_data(start_time_ns, delay_seconds, attempt, model),
+        )
+    except RuntimeError:
+        # Not called within a run
+        pass
+
+
+async def arecord_retry_wait(
+    start_time_ns: int, delay_seconds: float, attempt: int, model: str | None = None
+) -> None:
+    try:
+        await adispatch_custom_event(
+            RETRY_WAIT_EVENT,
+            _retry_wait_data(start_time_ns, delay_seconds, attempt, model),
+        )
+    except RuntimeError:
+        pass
+
+
+_tracing_handler: TracingCallbackHandler | None = (
+    TracingCallbackHandler() if TRACE_FILE or OTLP_ENDPOINT else None
+)
+# Adds the handler to every run in every thread, so all graphs are traced without
+# passing callbacks through their configs
+_tracing_handler_var: ContextVar[TracingCallbackHandler | None] = ContextVar(
+    "polyview_tracing_handler", default=_tracing_handler
+)
+register_configure_hook(_tracing_handler_var, inheritable=True)
+
+
+def get_tracing_handler() -> TracingCallbackHandler | None:
+    """Returns the tracing handler, or None if tracing is not enabled."""
+    return _tracing_handler_var.get()
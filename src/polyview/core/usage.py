@@ -0,0 +1,251 @@
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from pydantic import BaseModel, Field
+
+from polyview.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Per-run token and cost totals are appended to this file, one JSON object per line
+USAGE_LOG_PATH = os.environ.get("POLYVIEW_USAGE_LOG", "polyview_usage.jsonl")
+# Optional JSON file with prices that override or extend MODEL_PRICES, in the form
+# {"<model>": {"input_per_million": 0.3, "output_per_million": 2.5}}
+MODEL_PRICES_PATH = os.environ.get("POLYVIEW_MODEL_PRICES")
+# Stage of LLM calls made outside of a graph node
+NO_NODE = "none"
+
+
+class ModelPrice(BaseModel):
+    """Price of a model in USD per million tokens."""
+
+    input_per_million: float = Field(ge=0)
+    output_per_million: float = Field(ge=0)
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (
+            input_tokens * self.input_per_million
+            + output_tokens * self.output_per_million
+        ) / 1_000_000
+
+
+MODEL_PRICES: dict[str, ModelPrice] = {
+    "gemini-2.5-flash": ModelPrice(input_per_million=0.30, output_per_million=2.50),
+    "gemini-2.5-flash-lite-preview-06-17": ModelPrice(
+        input_per_million=0.10, output_per_million=0.40
+    ),
+}
+
+
+def load_model_prices(path: str | None = MODEL_PRICES_PATH) -> dict[str, ModelPrice]:
+    """Returns MODEL_PRICES with the prices from the JSON file at path applied."""
+    prices = dict(MODEL_PRICES)
+    if path:
+        with Path(path).open(encoding="utf-8") as f:
+            prices.update(
+                {
+                    model: ModelPrice.model_validate(price)
+                    for model, price in json.load(f).items()
+                }
+            )
+    return prices
+
+
+class UsageEntry(BaseModel):
+    """Tokens and estimated cost of the LLM calls of one node with one model."""
+
+    node: str
+    model: str
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+class UsageTotals(BaseModel):
+    """Running token and cost totals of a session, overall and per node and model."""
+
+    session_id: str
+    topic: str
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    entries: list[UsageEntry] = Field(default_factory=list)
+
+
+def _stage(metadata: dict[str, Any]) -> str:
+    """
+    The top-level graph node a run belongs to. LLM calls in subgraphs (e.g. the search
+    agent's nodes) are attributed to the node that invoked the subgraph.
+    """
+    checkpoint_ns = metadata.get("langgraph_checkpoint_ns")
+    if checkpoint_ns:
+        return checkpoint_ns.split("|")[0].split(":")[0]
+    return metadata.get("langgraph_node") or NO_NODE
+
+
+class UsageAccountant(BaseCallbackHandler):
+    """
+    Attributes the input and output tokens of every LLM call of a session to the node and
+    model that made it, and estimates their cost from a price table.
+
+    After each call, on_update receives the running totals. The handler is passed in the
+    config of the session's graph runs; call record once the session is done to store its
+    totals in the usage log.
+    """
+
+    run_inline = True
+
+    def __init__(
+        self,
+        session_id: str,
+        topic: str,
+        on_update: Callable[[UsageTotals], None] | None = None,
+        prices: dict[str, ModelPrice] | None = None,
+    ):
+        self.session_id = session_id
+        self.topic = topic
+        self.on_update = on_update
+        self.prices = prices if prices is not None else load_model_prices()
+        self._lock = threading.Lock()
+        self._runs: dict[UUID, tuple[str, str]] = {}
+        self._entries: dict[tuple[str, str], UsageEntry] = {}
+        self._unpriced_models: set[str] = set()
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        model = (
+            metadata.get("ls_model_name")
+            or kwargs.get("name")
+            or (serialized or {}).get("name")
+        )
+        with self._lock:
+            self._runs[run_id] = (_stage(metadata), str(model))
+
+    def on_llm_start(
+        self,
+        serialized: dict[str, Any],
+        prompts: list[str],
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.on_chat_model_start(
+            serialized, [], run_id=run_id, metadata=metadata, **kwargs
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is None:
+                return
+            node, model = run
+            price = self.prices.get(model)
+            if price is None and model not in self._unpriced_models:
+                self._unpriced_models.add(model)
+                logger.warning(
+                    f"No price for model '{model}', its cost is counted as 0."
+                )
+
+            entry = self._entries.setdefault(
+                (node, model), UsageEntry(node=node, model=model)
+            )
+            entry.calls += 1
+            entry.input_tokens += input_tokens
+            entry.output_tokens += output_tokens
+            if price is not None:
+                entry.cost_usd += price.cost(input_tokens, output_tokens)
+            totals = self._totals()
+
+        if self.on_update is not None:
+            self.on_update(totals)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    def _totals(self) -> UsageTotals:
+        entries = [entry.model_copy() for entry in self._entries.values()]
+        return UsageTotals(
+            session_id=self.session_id,
+            topic=self.topic,
+            calls=sum(e.calls for e in entries),
+            input_tokens=sum(e.input_tokens for e in entries),
+            output_tokens=sum(e.output_tokens for e in entries),
+            cost_usd=sum(e.cost_usd for e in entries),
+            entries=entries,
+        )
+
+    def totals(self) -> UsageTotals:
+        with self._lock:
+            return self._totals()
+
+    def record(self, path: str | None = USAGE_LOG_PATH, **fields: Any) -> None:
+        """
+        Appends the session's totals to the usage log, along with a timestamp and any
+        further fields (e.g. the run profile or whether the run failed).
+        """
+        if not path:
+            return
+        record = {
+            "recorded_at": datetime.now(UTC).isoformat(),
+            **fields,
+            **self.totals().model_dump(),
+        }
+        try:
+            with Path(path).open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.error(f"Writing usage of session {self.session_id} failed: {e}")
+
+
+def queue_usage_updates(queue: asyncio.Queue) -> Callable[[UsageTotals], None]:
+    """
+    Returns an on_update callback that puts the running totals on a session's message
+    queue as status events. LLM calls of sync nodes end in worker threads, so the event
+    is handed to the queue's event loop.
+    """
+    loop = asyncio.get_running_loop()
+
+    def put_update(totals: UsageTotals) -> None:
+        event = {
+            "type": "status",
+            "message": (
+                f"Tokens used: {totals.input_tokens} in / {totals.output_tokens} out "
+                f"(~${totals.cost_usd:.4f})"
+            ),
+            "usage": totals.model_dump(exclude={"entries"}),
+        }
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    return put_update
@@ -0,0 +1,133 @@
+import re
+
+from langchain_core.runnables import RunnableConfig
+
+from polyview.core.article_store import get_article_store
+from polyview.core.logging import get_logger
+from polyview.core.state import State
+from polyview.utils.bm25 import BM25Index
+from polyview.utils.text import estimate_tokens, normalize_whitespace
+
+logger = get_logger(__name__)
+
+# Maximum estimated number of tokens of article content sent to perspective identification
+ARTICLE_TOKEN_BUDGET = 6000
+
+# Lines of at most this many words are checked against the boilerplate patterns
+MAX_BOILERPLATE_LINE_WORDS = 12
+BOILERPLATE_PATTERN = re.compile(
+    r"cookie|subscribe|sign up|sign in|log in|newsletter|all rights reserved|"
+    r"privacy policy|terms of (?:use|service)|advertisement|skip to (?:main )?content|"
+    r"share (?:this|on)|follow us|read more|related articles|click here|"
+    r"download (?:the|our) app|^menu$|^home$|^search$",
+    re.IGNORECASE,
+)
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    Removes navigation and other page chrome from scraped text.
+
+    Short lines that match common boilerplate phrases are dropped, as are repeated lines
+    (menus and footers that appear several times on a page).
+    """
+    kept_lines = []
+    seen_lines = set()
+    for line in normalize_whitespace(text).split("\n"):
+        if not line:
+            kept_lines.append(line)
+            continue
+        is_short = len(line.split()) <= MAX_BOILERPLATE_LINE_WORDS
+        if is_short and (BOILERPLATE_PATTERN.search(line) or line in seen_lines):
+            continue
+        seen_lines.add(line)
+        kept_lines.append(line)
+    return normalize_whitespace("\n".join(kept_lines))
+
+
+def _split_paragraphs(text: str) -> list[str]:
+    """Splits on blank lines, or on single line breaks if the text has no blank lines."""
+    separator = "\n\n" if "\n\n" in text else "\n"
+    return [p.strip() for p in text.split(separator) if p.strip()]
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts text after the last word that still fits within max_tokens."""
+    words = text.split(" ")
+    kept, used = [], 0
+    for word in words:
+        used += estimate_tokens(word)
+        if used > max_tokens:
+            break
+        kept.append(word)
+    return " ".join(kept)
+
+
+def fit_to_token_budget(text: str, query: str, max_tokens: int) -> str:
+    """
+    Shortens text to roughly max_tokens by keeping the paragraphs most relevant to the
+    query (scored with BM25), in their original order. The first paragraph is always
+    kept, as it usually carries the article's framing.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    paragraphs = _split_paragraphs(text)
+    token_counts = [estimate_tokens(p) for p in paragraphs]
+    scores = BM25Index(paragraphs).score(query)
+
+    selected = {0}
+    used = token_counts[0]
+    for i in sorted(range(1, len(paragraphs)), key=lambda i: -scores[i]):
+        if used + token_counts[i] <= max_tokens:
+            selected.add(i)
+            used += token_counts[i]
+
+    result = "\n\n".join(paragraphs[i] for i in sorted(selected))
+    if used > max_tokens:
+        result = _truncate_to_tokens(result, max_tokens)
+    return result
+
+
+def preprocess_article(article: dict, query: str, max_tokens: int) -> dict:
+    """Returns a copy of the article with cleaned, budgeted content and its token counts."""
+    content = article.get("content") or ""
+    cleaned = fit_to_token_budget(strip_boilerplate(content), query, max_tokens)
+    return {
+        **article,
+        "content": cleaned,
+        "content_tokens_before": estimate_tokens(content),
+        "content_tokens_after": estimate_tokens(cleaned),
+    }
+
+
+def article_preprocessing_node(
+    state: State, config: RunnableConfig | None = None
+) -> dict:
+    """
+    Cleans article content before perspective identification.
+
+    Strips boilerplate, normalizes whitespace and fits each article to ARTICLE_TOKEN_BUDGET
+    by keeping its most relevant paragraphs. Token counts before and after are stored on
+    each article so the savings can be measured. The cleaned content replaces the
+    original in the ArticleStore.
+    """
+    articles = state.get("raw_articles") or []
+    if not articles:
+        logger.info("No articles to preprocess. Skipping preprocessing node..")
+        return {"raw_articles": []}
+
+    store = get_article_store(config)
+    query = " ".join([state.get("topic", ""), *(state.get("search_queries") or [])])
+    processed = [
+        store.put(preprocess_article(store.load(article), query, ARTICLE_TOKEN_BUDGET))
+        for article in articles
+    ]
+
+    tokens_before = sum(a["content_tokens_before"] for a in processed)
+    tokens_after = sum(a["content_tokens_after"] for a in processed)
+    logger.info(
+        f"Preprocessed {len(processed)} articles: ~{tokens_before} -> ~{tokens_after} tokens "
+        f"({tokens_before - tokens_after} saved)."
+    )
+    return {"raw_articles": processed}
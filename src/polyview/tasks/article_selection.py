@@ -0,0 +1,97 @@
+from langchain_core.runnables import RunnableConfig
+import numpy as np
+
+from polyview.core.article_store import get_article_store
+from polyview.core.logging import get_logger
+from polyview.core.profiles import get_run_profile
+from polyview.core.state import State
+from polyview.utils.vectors import (
+    cosine_similarity,
+    hashed_vectors,
+    maximal_marginal_relevance,
+)
+
+logger = get_logger(__name__)
+
+# Trade-off between relevance (0) and diversity (1) when selecting articles
+SELECTION_DIVERSITY = 0.3
+
+
+def select_articles(
+    articles: list[dict], topic: str, queries: list[str], k: int
+) -> list[dict]:
+    """
+    Picks up to k articles using maximal marginal relevance over hashed TF-IDF vectors.
+
+    Relevance is the article's BM25 relevance score when present (see relevance_filter),
+    otherwise its cosine similarity to the topic and queries.
+    """
+    if len(articles) <= k:
+        return articles
+
+    texts = [article.get("content") or "" for article in articles]
+    vectors = hashed_vectors([*texts, " ".join([topic, *queries])])
+    article_vectors, query_vector = vectors[:-1], vectors[-1:]
+
+    if all(article.get("relevance_score") is not None for article in articles):
+        relevance = np.array(
+            [article["relevance_score"] for article in articles], dtype=np.float32
+        )
+    else:
+        relevance = cosine_similarity(article_vectors, query_vector)[:, 0]
+    # Scale relevance to [0, 1] so it is comparable with the cosine similarities
+    max_relevance = relevance.max()
+    if max_relevance > 0:
+        relevance = relevance / max_relevance
+
+    selected = maximal_marginal_relevance(
+        article_vectors, relevance, k, diversity=SELECTION_DIVERSITY
+    )
+    return [articles[i] for i in sorted(selected)]
+
+
+def article_selection_node(state: State, config: RunnableConfig | None = None) -> dict:
+    """
+    Enforces the per-run article budget (see RunProfile) before perspective identification.
+
+    Articles that were already processed in an earlier research cycle are skipped. If more
+    candidates remain than the budget allows, a relevant yet diverse subset is selected,
+    so fewer extraction calls still cover the spread of viewpoints. The content of
+    articles that are skipped or not selected is deleted from the ArticleStore.
+    """
+    store = get_article_store(config)
+    article_budget = get_run_profile(config).article_budget
+    articles = state.get("raw_articles") or []
+    processed_ids = set(state.get("processed_article_ids") or [])
+
+    candidates = [a for a in articles if a["id"] not in processed_ids]
+    if len(candidates) < len(articles):
+        logger.info(
+            f"Skipping {len(articles) - len(candidates)} article(s) processed in an earlier cycle."
+        )
+
+    remaining_budget = max(0, article_budget - len(processed_ids))
+    selected_ids = {
+        a["id"]
+        for a in select_articles(
+            store.load_many(candidates),
+            state.get("topic", ""),
+            state.get("search_queries") or [],
+            remaining_budget,
+        )
+    }
+    selected = store.put_many([a for a in candidates if a["id"] in selected_ids])
+    # Articles found again were written back to the store by the search agent
+    store.release(
+        [a["id"] for a in articles if a["id"] in processed_ids]
+        + [a["id"] for a in candidates if a["id"] not in selected_ids]
+    )
+
+    logger.info(
+        f"Selected {len(selected)} of {len(candidates)} candidate articles "
+        f"(remaining budget: {remaining_budget}/{article_budget})."
+    )
+    return {
+        "raw_articles": selected,
+        "processed_article_ids": [a["id"] for a in selected],
+    }
@@ -1,18 +1,61 @@
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig
+import numpy as np
 from pydantic import BaseModel, Field
 
-from polyview.core.llm_config import llm
+from polyview.core.llm_config import llm, llm_lite
 from polyview.core.logging import get_logger
+from polyview.core.profiles import get_run_profile
 from polyview.core.state import (
     ArticlePerspectives,
     ConsolidatedPerspective,
+    CycleNovelty,
     ExtractedPerspective,
     FinalPerspective,
     State,
 )
+from polyview.utils.serialization import compact_json, log_token_savings
+from polyview.utils.text import NEUTRAL_STOPWORDS, STANCE_WORDS, tokenize
+from polyview.utils.vectors import (
+    collapse_near_duplicates,
+    cosine_similarity,
+    group_similar,
+    hashed_vectors,
+    normalize_rows,
+)
 
 logger = get_logger(__name__)
 
+# Existing perspective fields shown to the LLM when clustering new perspectives into them
+EXISTING_PERSPECTIVE_PROMPT_FIELDS = ("perspective_name", "narrative", "core_arguments")
+
+# Perspectives whose summaries are at least this similar are sent to the LLM only once
+PREGROUP_SIMILARITY_THRESHOLD = 0.85
+
+# Above this many (pre-grouped) perspectives, clustering runs hierarchically: batches are
+# clustered concurrently and the resulting clusters are merged in a second pass
+HIERARCHICAL_CLUSTERING_THRESHOLD = 60
+CLUSTERING_BATCH_SIZE = 40
+MAX_CLUSTERING_CONCURRENCY = 4
+# Batch-level clusters whose centroids are at least this similar are merged locally
+CLUSTER_MERGE_SIMILARITY = 0.6
+
+# In later iterations, new perspectives are assigned to an existing perspective without an
+# LLM call when their similarity to it is at least the threshold and exceeds the similarity
+# to the runner-up by the margin
+INCREMENTAL_ASSIGNMENT_THRESHOLD = 0.45
+INCREMENTAL_ASSIGNMENT_MARGIN = 0.1
+
+# Minimum token-set (Jaccard) similarity for a cluster name to match an existing
+# perspective whose normalized name differs
+NAME_MATCH_THRESHOLD = 0.6
+
+# Arguments, narratives and evidence at least this similar are collapsed into one entry
+NEAR_DUPLICATE_THRESHOLD = 0.8
+# Arguments at least this similar to an argument of the existing final perspective count
+# as known when measuring novelty, as synthesis rewords the arguments it merges
+KNOWN_ARGUMENT_SIMILARITY = 0.5
+
 
 class PerspectiveCluster(BaseModel):
     """A single cluster of similar perspectives."""
@@ -33,6 +76,54 @@ class ClusteringResult(BaseModel):
     clusters: list[PerspectiveCluster]
 
 
+def _name_tokens(name: str) -> frozenset[str]:
+    return frozenset(tokenize(name, stopwords=NEUTRAL_STOPWORDS))
+
+
+class PerspectiveIndex:
+    """
+    Looks up existing perspectives by name, tolerating rewording.
+
+    Names are normalized (case, punctuation, stopwords and word order are ignored) and
+    looked up in a dict. On a miss, perspectives sharing a token with the name are
+    found through an inverted index and the one with the highest token-set similarity
+    is returned if it reaches NAME_MATCH_THRESHOLD. Stance words ("for", "against",
+    "not") are kept and must agree, so a perspective never matches its opposite.
+    """
+
+    def __init__(self, perspectives: list[FinalPerspective]):
+        self._by_key: dict[str, FinalPerspective] = {}
+        self._tokens: list[frozenset[str]] = []
+        self._perspectives = perspectives
+        self._by_token: dict[str, list[int]] = {}
+        for i, perspective in enumerate(perspectives):
+            tokens = _name_tokens(perspective.perspective_name)
+            self._by_key.setdefault(self._key(tokens), perspective)
+            self._tokens.append(tokens)
+            for token in tokens:
+                self._by_token.setdefault(token, []).append(i)
+
+    @staticmethod
+    def _key(tokens: frozenset[str]) -> str:
+        return " ".join(sorted(tokens))
+
+    def find(self, name: str) -> FinalPerspective | None:
+        tokens = _name_tokens(name)
+        match = self._by_key.get(self._key(tokens))
+        if match is not None:
+            return match
+
+        candidates = {i for token in tokens for i in self._by_token.get(token, [])}
+        best_score, best = 0.0, None
+        for i in candidates:
+            if tokens & STANCE_WORDS != self._tokens[i] & STANCE_WORDS:
+                continue
+            score = len(tokens & self._tokens[i]) / len(tokens | self._tokens[i])
+            if score > best_score:
+                best_score, best = score, self._perspectives[i]
+        return best if best_score >= NAME_MATCH_THRESHOLD else None
+
+
 def _flatten_perspectives(
     article_perspectives_list: list[ArticlePerspectives],
 ) -> list[ExtractedPerspective]:
@@ -55,12 +146,228 @@ def _format_perspectives_for_prompt(
     all_perspectives: list[ExtractedPerspective],
 ) -> list[dict]:
     """Formats perspectives for the LLM prompt, including their original index and summary."""
+    return _format_summaries([p.perspective_summary for p in all_perspectives])
+
+
+def _format_summaries(summaries: list[str]) -> list[dict]:
+    return [{"index": i, "summary": summary} for i, summary in enumerate(summaries)]
+
+
+def _pregroup_perspectives(
+    all_perspectives: list[ExtractedPerspective],
+) -> list[list[int]]:
+    """
+    Groups near-identical perspective summaries locally, so the LLM only has to cluster
+    one representative (the first member) per group.
+    """
+    vectors = hashed_vectors(
+        [p.perspective_summary for p in all_perspectives], use_idf=False
+    )
+    return group_similar(vectors, PREGROUP_SIMILARITY_THRESHOLD)
+
+
+def _expand_indices(
+    result: ClusteringResult, groups: list[list[int]]
+) -> ClusteringResult:
+    """
+    Maps every index in a clustering result to the indices of groups[index], e.g. from
+    pre-group representatives back to all group members.
+    """
+    return ClusteringResult(
+        clusters=[
+            PerspectiveCluster(
+                cluster_name=cluster.cluster_name,
+                perspective_indices=[
+                    member
+                    for index in cluster.perspective_indices
+                    if 0 <= index < len(groups)
+                    for member in groups[index]
+                ],
+            )
+            for cluster in result.clusters
+        ]
+    )
+
+
+def _cluster_summaries(
+    chain: Runnable,
+    summaries: list[str],
+    vectors: np.ndarray,
+    extra_inputs: dict,
+) -> list[tuple[str, list[int]]]:
+    """
+    Clusters summaries with the LLM and returns (cluster name, member indices) pairs.
+
+    Small inputs are clustered in one call. Larger inputs are split into batches that are
+    clustered concurrently; the batch-level clusters are merged locally by centroid
+    similarity and then clustered again by name, recursively.
+    """
+    if len(summaries) <= HIERARCHICAL_CLUSTERING_THRESHOLD:
+        result = chain.invoke(
+            {"perspectives": compact_json(_format_summaries(summaries)), **extra_inputs}
+        )
+        return [
+            (
+                cluster.cluster_name,
+                [i for i in cluster.perspective_indices if 0 <= i < len(summaries)],
+            )
+            for cluster in result.clusters
+        ]
+
+    batches = [
+        list(range(start, min(start + CLUSTERING_BATCH_SIZE, len(summaries))))
+        for start in range(0, len(summaries), CLUSTERING_BATCH_SIZE)
+    ]
+    logger.info(
+        f"Clustering {len(summaries)} perspectives hierarchically in {len(batches)} batches."
+    )
+    responses = chain.batch(
+        [
+            {
+                "perspectives": compact_json(
+                    _format_summaries([summaries[i] for i in batch])
+                ),
+                **extra_inputs,
+            }
+            for batch in batches
+        ],
+        config={"max_concurrency": MAX_CLUSTERING_CONCURRENCY},
+        return_exceptions=True,
+    )
+
+    batch_clusters: list[tuple[str, list[int]]] = []
+    for batch, response in zip(batches, responses, strict=True):
+        if isinstance(response, Exception):
+            logger.warning(
+                f"Clustering batch failed, keeping its perspectives unclustered: {response}"
+            )
+            batch_clusters.extend((summaries[i], [i]) for i in batch)
+            continue
+        assigned: set[int] = set()
+        for cluster in response.clusters:
+            members = [
+                batch[i] for i in cluster.perspective_indices if 0 <= i < len(batch)
+            ]
+            if members:
+                batch_clusters.append((cluster.cluster_name, members))
+                assigned.update(members)
+        # Perspectives the LLM left out of every cluster are kept as singletons
+        batch_clusters.extend((summaries[i], [i]) for i in batch if i not in assigned)
+
+    if not batch_clusters:
+        return []
+
+    # Merge batch-level clusters with near-identical centroids before the merge pass
+    centroids = normalize_rows(
+        np.vstack([vectors[members].mean(axis=0) for _, members in batch_clusters])
+    )
+    merged_clusters = []
+    merged_centroids = []
+    for group in group_similar(centroids, CLUSTER_MERGE_SIMILARITY):
+        members = [m for i in group for m in batch_clusters[i][1]]
+        merged_clusters.append((batch_clusters[group[0]][0], members))
+        merged_centroids.append(vectors[members].mean(axis=0))
+
+    if (
+        len(merged_clusters) >= len(summaries)
+        and len(merged_clusters) > HIERARCHICAL_CLUSTERING_THRESHOLD
+    ):
+        logger.warning("Hierarchical clustering did not reduce the input. Stopping.")
+        return merged_clusters
+
+    merge_pass = _cluster_summaries(
+        chain,
+        [name for name, _ in merged_clusters],
+        normalize_rows(np.vstack(merged_centroids)),
+        extra_inputs,
+    )
     return [
-        {"index": i, "summary": p.perspective_summary}
-        for i, p in enumerate(all_perspectives)
+        (name, [m for i in indices for m in merged_clusters[i][1]])
+        for name, indices in merge_pass
     ]
 
 
+def _cluster_perspectives(
+    chain: Runnable, perspectives: list[ExtractedPerspective], extra_inputs: dict
+) -> ClusteringResult:
+    """Clusters perspectives by summary, hierarchically when there are many of them."""
+    vectors = hashed_vectors(
+        [" ".join([p.perspective_summary, *p.key_arguments]) for p in perspectives]
+    )
+    clusters = _cluster_summaries(
+        chain, [p.perspective_summary for p in perspectives], vectors, extra_inputs
+    )
+    return ClusteringResult(
+        clusters=[
+            PerspectiveCluster(cluster_name=name, perspective_indices=indices)
+            for name, indices in clusters
+        ]
+    )
+
+
+def _assign_to_existing_perspectives(
+    perspectives: list[ExtractedPerspective],
+    existing_perspectives: list[FinalPerspective],
+) -> tuple[ClusteringResult, list[int]]:
+    """
+    Assigns new perspectives to existing perspectives locally by vector similarity.
+
+    Returns the clusters for the confidently assigned perspectives (named after the
+    existing perspective) and the indices of the ambiguous ones, which still need to be
+    clustered by the LLM.
+    """
+    vectors = hashed_vectors(
+        [
+            " ".join([p.perspective_name, *p.core_arguments])
+            for p in existing_perspectives
+        ]
+        + [" ".join([p.perspective_summary, *p.key_arguments]) for p in perspectives]
+    )
+    existing_vectors = vectors[: len(existing_perspectives)]
+    similarity = cosine_similarity(
+        vectors[len(existing_perspectives) :], existing_vectors
+    )
+
+    assigned: dict[str, list[int]] = {}
+    ambiguous: list[int] = []
+    for i, scores in enumerate(similarity):
+        ranked = np.sort(scores)[::-1]
+        best = ranked[0]
+        runner_up = ranked[1] if len(ranked) > 1 else 0.0
+        if (
+            best >= INCREMENTAL_ASSIGNMENT_THRESHOLD
+            and best - runner_up >= INCREMENTAL_ASSIGNMENT_MARGIN
+        ):
+            name = existing_perspectives[int(np.argmax(scores))].perspective_name
+            assigned.setdefault(name, []).append(i)
+        else:
+            ambiguous.append(i)
+
+    local_result = ClusteringResult(
+        clusters=[
+            PerspectiveCluster(cluster_name=name, perspective_indices=indices)
+            for name, indices in assigned.items()
+        ]
+    )
+    return local_result, ambiguous
+
+
+def _merge_clusters_by_name(*results: ClusteringResult) -> ClusteringResult:
+    """Combines clustering results, merging the indices of clusters with the same name."""
+    merged: dict[str, list[int]] = {}
+    for result in results:
+        for cluster in result.clusters:
+            merged.setdefault(cluster.cluster_name, []).extend(
+                cluster.perspective_indices
+            )
+    return ClusteringResult(
+        clusters=[
+            PerspectiveCluster(cluster_name=name, perspective_indices=indices)
+            for name, indices in merged.items()
+        ]
+    )
+
+
 def _create_synthesis_prompt(
     cluster_name: str, aggregated_narratives: list[str]
 ) -> str:
@@ -83,6 +390,22 @@ def _process_clustering_result(
     """Processes the clustering result to consolidate arguments for each cluster."""
     consolidated_perspectives: list[ConsolidatedPerspective] = []
 
+    # Map (reworded) cluster names onto the existing perspectives they correspond to, and
+    # merge clusters that turn out to belong to the same existing perspective
+    perspective_index = PerspectiveIndex(existing_perspectives)
+    renamed_clusters = []
+    for cluster in result.clusters:
+        match = perspective_index.find(cluster.cluster_name)
+        if match is not None and match.perspective_name != cluster.cluster_name:
+            logger.info(
+                f"Matched cluster '{cluster.cluster_name}' to existing perspective '{match.perspective_name}'."
+            )
+            cluster = cluster.model_copy(
+                update={"cluster_name": match.perspective_name}
+            )
+        renamed_clusters.append(cluster)
+    result = _merge_clusters_by_name(ClusteringResult(clusters=renamed_clusters))
+
     for cluster in result.clusters:
         cluster_name = cluster.cluster_name
         aggregated_arguments = []
@@ -90,10 +413,7 @@ def _process_clustering_result(
         supporting_evidence = []
 
         # Check if the cluster corresponds to an existing perspective
-        existing_perspective: FinalPerspective | None = next(
-            (p for p in existing_perspectives if p.perspective_name == cluster_name),
-            None,
-        )
+        existing_perspective = perspective_index.find(cluster_name)
 
         if existing_perspective:
             logger.info(
@@ -113,30 +433,98 @@ def _process_clustering_result(
                 aggregated_narratives.append(perspective.contextual_narrative)
                 supporting_evidence.extend(perspective.evidence_provided)
 
-        preliminary_synthesis = _create_synthesis_prompt(
-            cluster_name, aggregated_narratives
+        # Collapse paraphrased claims locally instead of paying the LLM to merge them
+        argument_counts = collapse_near_duplicates(
+            aggregated_arguments, NEAR_DUPLICATE_THRESHOLD
+        )
+        evidence_counts = collapse_near_duplicates(
+            supporting_evidence, NEAR_DUPLICATE_THRESHOLD
+        )
+        unique_narratives = list(
+            collapse_near_duplicates(aggregated_narratives, NEAR_DUPLICATE_THRESHOLD)
+        )
+
+        # Perspectives extracted with the fast profile carry no narratives
+        preliminary_synthesis = (
+            _create_synthesis_prompt(cluster_name, unique_narratives)
+            if unique_narratives
+            else ""
         )
 
         consolidated_perspectives.append(
             ConsolidatedPerspective(
                 perspective_name=cluster_name,
-                aggregated_arguments=list(dict.fromkeys(aggregated_arguments)),
-                aggregated_narratives=list(dict.fromkeys(aggregated_narratives)),
-                supporting_evidence=list(dict.fromkeys(supporting_evidence)),
+                aggregated_arguments=list(argument_counts),
+                aggregated_narratives=unique_narratives,
+                supporting_evidence=list(evidence_counts),
                 preliminary_synthesis=preliminary_synthesis,
+                argument_counts=argument_counts,
+                evidence_counts=evidence_counts,
             )
         )
         logger.info(
-            f"Processed cluster '{cluster_name}' with {len(aggregated_arguments)} arguments."
+            f"Processed cluster '{cluster_name}' with {len(aggregated_arguments)} arguments "
+            f"({len(argument_counts)} after near-duplicate consolidation)."
         )
     return consolidated_perspectives
 
 
-def perspective_clustering_node(state: State) -> dict:
+def _count_new_arguments(arguments: list[str], known_arguments: list[str]) -> int:
+    """Counts the arguments that are not a (reworded) known argument."""
+    if not known_arguments:
+        return len(arguments)
+    known = set(known_arguments)
+    # Known arguments come first, so they lead every group they are part of
+    groups = collapse_near_duplicates(
+        [*known_arguments, *arguments], KNOWN_ARGUMENT_SIMILARITY
+    )
+    return sum(count for text, count in groups.items() if text not in known)
+
+
+def measure_novelty(
+    consolidated_perspectives: list[ConsolidatedPerspective],
+    existing_perspectives: list[FinalPerspective],
+) -> CycleNovelty:
+    """
+    Counts the clusters and arguments that this cycle added on top of the existing
+    final perspectives, relative to the totals known after the cycle. Arguments that
+    reword an argument of the existing perspective are not counted as new.
+    """
+    existing_by_name = {p.perspective_name: p for p in existing_perspectives}
+    consolidated_names = {p.perspective_name for p in consolidated_perspectives}
+
+    new_arguments = 0
+    total_arguments = sum(
+        len(p.core_arguments)
+        for p in existing_perspectives
+        if p.perspective_name not in consolidated_names
+    )
+    for consolidated in consolidated_perspectives:
+        existing = existing_by_name.get(consolidated.perspective_name)
+        new_arguments += _count_new_arguments(
+            consolidated.aggregated_arguments,
+            existing.core_arguments if existing else [],
+        )
+        total_arguments += len(consolidated.aggregated_arguments)
+
+    return CycleNovelty(
+        new_clusters=len(consolidated_names - existing_by_name.keys()),
+        total_clusters=len(consolidated_names | existing_by_name.keys()),
+        new_arguments=new_arguments,
+        total_arguments=total_arguments,
+    )
+
+
+def perspective_clustering_node(
+    state: State, config: RunnableConfig | None = None
+) -> dict:
     """
     Analyzes and clusters semantically similar perspectives into a consolidated view.
     On the first run, it creates new clusters from the extracted perspectives.
-    On subsequent runs, it can cluster new perspectives into existing ones.
+    On subsequent runs, it can cluster new perspectives into existing ones. Perspectives
+    that clearly match an existing perspective are assigned locally; only the ambiguous
+    ones are sent to the LLM. Only clusters that received new perspectives are returned,
+    together with what they added (cycle_novelty).
     """
     iteration = state.get("iteration", 1)
     raw_existing_perspectives = state.get("final_perspectives", [])
@@ -180,7 +568,8 @@ New perspectives to cluster:
         ]
     )
 
-    structured_llm = llm.with_structured_output(ClusteringResult)
+    model = llm_lite if get_run_profile(config).use_lite_model else llm
+    structured_llm = model.with_structured_output(ClusteringResult)
     chain = prompt | structured_llm
 
     article_perspectives_list = state.get("article_perspectives")
@@ -188,34 +577,63 @@ New perspectives to cluster:
 
     if not article_perspectives_list:
         logger.info("No perspectives found to consolidate. Skipping clustering node..")
-        return {"consolidated_perspectives": []}
+        return {"consolidated_perspectives": [], "cycle_novelty": CycleNovelty()}
 
     all_perspectives = _flatten_perspectives(article_perspectives_list)
     logger.debug(f"all_perspectives: {all_perspectives}")
 
     if not all_perspectives:
         logger.info("No perspectives found to consolidate. Skipping clustering node..")
-        return {"consolidated_perspectives": []}
+        return {"consolidated_perspectives": [], "cycle_novelty": CycleNovelty()}
 
-    perspectives_for_prompt = _format_perspectives_for_prompt(all_perspectives)
+    groups = _pregroup_perspectives(all_perspectives)
+    representatives = [all_perspectives[group[0]] for group in groups]
 
-    logger.info(f"--- Clustering {len(all_perspectives)} perspectives ---")
+    logger.info(
+        f"--- Clustering {len(all_perspectives)} perspectives "
+        f"({len(representatives)} after local pre-grouping) ---"
+    )
 
     if iteration > 1 and existing_perspectives:
-        existing_perspectives_json = [
-            p.model_dump_json(indent=2) for p in existing_perspectives
-        ]
-        result = chain.invoke(
-            {
-                "perspectives": perspectives_for_prompt,
-                "existing_perspectives": existing_perspectives_json,
-            }
+        result, ambiguous = _assign_to_existing_perspectives(
+            representatives, existing_perspectives
         )
+        logger.info(
+            f"Assigned {len(representatives) - len(ambiguous)} perspectives to existing "
+            f"perspectives locally, {len(ambiguous)} are left for the LLM."
+        )
+        if ambiguous:
+            existing_perspectives_json = compact_json(
+                existing_perspectives, EXISTING_PERSPECTIVE_PROMPT_FIELDS
+            )
+            log_token_savings(
+                "Perspective clustering",
+                existing_perspectives,
+                existing_perspectives_json,
+            )
+            llm_result = _cluster_perspectives(
+                chain,
+                [representatives[i] for i in ambiguous],
+                {"existing_perspectives": existing_perspectives_json},
+            )
+            result = _merge_clusters_by_name(
+                result, _expand_indices(llm_result, [[i] for i in ambiguous])
+            )
     else:
-        result = chain.invoke({"perspectives": perspectives_for_prompt})
+        result = _cluster_perspectives(chain, representatives, {})
 
+    result = _expand_indices(result, groups)
     consolidated_perspectives = _process_clustering_result(
         result, all_perspectives, existing_perspectives, iteration
     )
 
-    return {"consolidated_perspectives": consolidated_perspectives}
+    cycle_novelty = measure_novelty(consolidated_perspectives, existing_perspectives)
+    logger.info(
+        f"Cycle added {cycle_novelty.new_clusters} new cluster(s) and "
+        f"{cycle_novelty.new_arguments} new argument(s) "
+        f"(novelty {cycle_novelty.score:.2f})."
+    )
+    return {
+        "consolidated_perspectives": consolidated_perspectives,
+        "cycle_novelty": cycle_novelty,
+    }
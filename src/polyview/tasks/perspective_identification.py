@@ -1,12 +1,37 @@
+import re
+
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig
 from pydantic import BaseModel, Field
 
-from polyview.core.llm_config import llm
+from polyview.core.article_store import get_article_store
+from polyview.core.llm_config import llm, llm_lite
 from polyview.core.logging import get_logger
+from polyview.core.profiles import RunProfile, get_run_profile
 from polyview.core.state import ArticlePerspectives, ExtractedPerspective, State
+from polyview.utils.text import estimate_tokens
+from polyview.utils.vectors import group_similar, hashed_vectors
 
 logger = get_logger(__name__)
 
+# Articles longer than this (estimated tokens) are extracted chunk by chunk (map-reduce)
+LONG_ARTICLE_TOKEN_THRESHOLD = 2500
+CHUNK_TOKEN_SIZE = 1500
+CHUNK_TOKEN_OVERLAP = 200
+MAX_CHUNK_CONCURRENCY = 4
+# Chunk-level perspectives at least this similar are merged into one perspective
+CHUNK_MERGE_SIMILARITY = 0.5
+
+# Packing mode: short articles are bin-packed into shared extraction requests to save
+# requests-per-minute quota. Packs that fail validation fall back to per-article calls.
+ENABLE_ARTICLE_PACKING = False
+SHORT_ARTICLE_TOKEN_THRESHOLD = 600
+PACKED_REQUEST_TOKEN_BUDGET = 3000
+MAX_ARTICLES_PER_PACK = 6
+
+_SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+
 
 class ExtractedPerspectives(BaseModel):
     perspectives: list[ExtractedPerspective] = Field(
@@ -14,14 +39,304 @@ class ExtractedPerspectives(BaseModel):
     )
 
 
-def perspective_identification(state: State) -> dict:
+class PackedExtractedPerspectives(BaseModel):
+    articles: list[ArticlePerspectives] = Field(
+        description="The extracted perspectives of every article, keyed by the article's id."
+    )
+
+
+class FastExtractedPerspective(BaseModel):
+    """Slim output schema of the fast extraction profile."""
+
+    perspective_summary: str = Field(
+        description="A short descriptive name for the perspective."
+    )
+    key_arguments: list[str] = Field(
+        description="The main claims supporting this perspective in the article."
+    )
+    evidence_provided: list[str] = Field(
+        description="Specific evidence (stats, quotes, events) the article gives."
+    )
+
+    def to_extracted_perspective(self) -> ExtractedPerspective:
+        return ExtractedPerspective(
+            perspective_summary=self.perspective_summary,
+            key_arguments=self.key_arguments,
+            contextual_narrative="",
+            source_article_summary="",
+            inferred_assumptions=[],
+            evidence_provided=self.evidence_provided,
+        )
+
+
+class FastExtractedPerspectives(BaseModel):
+    perspectives: list[FastExtractedPerspective]
+
+
+class FastArticlePerspectives(BaseModel):
+    source_article_id: str
+    perspectives: list[FastExtractedPerspective]
+
+
+class PackedFastExtractedPerspectives(BaseModel):
+    articles: list[FastArticlePerspectives]
+
+
+# Structured-output schemas per extraction profile: (single article, packed articles).
+# "full" extracts every ExtractedPerspective field. "fast" only asks for the summary,
+# arguments and evidence, which cuts output tokens and schema size per call; the
+# remaining fields are left empty.
+EXTRACTION_SCHEMAS: dict[str, tuple[type[BaseModel], type[BaseModel]]] = {
+    "full": (ExtractedPerspectives, PackedExtractedPerspectives),
+    "fast": (FastExtractedPerspectives, PackedFastExtractedPerspectives),
+}
+
+
+def get_extraction_schemas(profile: str) -> tuple[type[BaseModel], type[BaseModel]]:
+    """Returns the (single article, packed articles) output schemas of a profile."""
+    if profile not in EXTRACTION_SCHEMAS:
+        raise ValueError(
+            f"Unknown extraction profile '{profile}'. "
+            f"Choose one of: {', '.join(EXTRACTION_SCHEMAS)}."
+        )
+    return EXTRACTION_SCHEMAS[profile]
+
+
+def _to_extracted_perspectives(
+    perspectives: list[ExtractedPerspective | FastExtractedPerspective],
+) -> list[ExtractedPerspective]:
+    return [
+        p.to_extracted_perspective() if isinstance(p, FastExtractedPerspective) else p
+        for p in perspectives
+    ]
+
+
+def split_into_chunks(text: str, chunk_tokens: int, overlap_tokens: int) -> list[str]:
     """
-    Identifies and extracts one or more perspectives from each article.
+    Splits text into chunks of roughly chunk_tokens estimated tokens on sentence
+    boundaries. Consecutive chunks share up to overlap_tokens worth of trailing sentences,
+    so perspectives that straddle a boundary are seen whole at least once.
+    """
+    sentences = [s for s in _SENTENCE_BOUNDARY_PATTERN.split(text) if s.strip()]
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    for sentence in sentences:
+        sentence_tokens = estimate_tokens(sentence)
+        if current and current_tokens + sentence_tokens > chunk_tokens:
+            chunks.append(" ".join(current))
+            # Carry the trailing sentences over as overlap for the next chunk
+            overlap: list[str] = []
+            overlap_used = 0
+            for previous in reversed(current):
+                overlap_used += estimate_tokens(previous)
+                if overlap_used > overlap_tokens:
+                    break
+                overlap.insert(0, previous)
+            current = overlap
+            current_tokens = sum(estimate_tokens(s) for s in current)
+        current.append(sentence)
+        current_tokens += sentence_tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
 
-    This node iterates through each raw article, invoking an LLM with structured output
-    to extract all discussed perspectives.
+
+def merge_chunk_perspectives(
+    perspectives: list[ExtractedPerspective],
+) -> list[ExtractedPerspective]:
     """
-    # TODO: parallelize llm calls instead of looping
+    Merges perspectives extracted from different chunks of the same article.
+
+    Perspectives are grouped by the similarity of their summary and arguments, and the
+    lists of each group are combined. The summary and source article summary of the
+    first member (the earliest chunk) are kept.
+    """
+    if len(perspectives) <= 1:
+        return perspectives
+
+    vectors = hashed_vectors(
+        [" ".join([p.perspective_summary, *p.key_arguments]) for p in perspectives],
+        use_idf=False,
+    )
+    merged = []
+    for group in group_similar(vectors, CHUNK_MERGE_SIMILARITY):
+        members = [perspectives[i] for i in group]
+        first = members[0]
+        merged.append(
+            ExtractedPerspective(
+                perspective_summary=first.perspective_summary,
+                key_arguments=list(
+                    dict.fromkeys(a for p in members for a in p.key_arguments)
+                ),
+                contextual_narrative=" ".join(
+                    dict.fromkeys(
+                        p.contextual_narrative
+                        for p in members
+                        if p.contextual_narrative
+                    )
+                ),
+                source_article_summary=first.source_article_summary,
+                inferred_assumptions=list(
+                    dict.fromkeys(a for p in members for a in p.inferred_assumptions)
+                ),
+                evidence_provided=list(
+                    dict.fromkeys(e for p in members for e in p.evidence_provided)
+                ),
+            )
+        )
+    return merged
+
+
+def _perspectives_from_response(
+    response: ExtractedPerspectives | FastExtractedPerspectives,
+) -> list[ExtractedPerspective]:
+    perspectives_list = response.perspectives
+    if not isinstance(perspectives_list, list):
+        logger.warning(
+            f"The 'perspectives' attribute is not a list. Response: {response}"
+        )
+        return []
+    return _to_extracted_perspectives(perspectives_list)
+
+
+def _extract_article_perspectives(
+    chain: Runnable, topic: str, article: dict
+) -> list[ExtractedPerspective]:
+    """
+    Extracts the perspectives of a single article. Long articles are split into
+    overlapping chunks that are extracted concurrently and merged afterwards.
+    """
+    content = article["content"]
+    if estimate_tokens(content) <= LONG_ARTICLE_TOKEN_THRESHOLD:
+        return _perspectives_from_response(
+            chain.invoke({"topic": topic, "article_text": content})
+        )
+
+    chunks = split_into_chunks(content, CHUNK_TOKEN_SIZE, CHUNK_TOKEN_OVERLAP)
+    logger.info(f"Long article {article['id']}: extracting {len(chunks)} chunks.")
+    responses = chain.batch(
+        [{"topic": topic, "article_text": chunk} for chunk in chunks],
+        config={"max_concurrency": MAX_CHUNK_CONCURRENCY},
+        return_exceptions=True,
+    )
+
+    if all(isinstance(response, Exception) for response in responses):
+        raise responses[0]
+
+    chunk_perspectives = []
+    for i, response in enumerate(responses):
+        if isinstance(response, Exception):
+            logger.warning(f"Chunk {i} of article {article['id']} failed: {response}")
+            continue
+        chunk_perspectives.extend(_perspectives_from_response(response))
+
+    return merge_chunk_perspectives(chunk_perspectives)
+
+
+def pack_articles(
+    articles: list[dict], token_budget: int, max_articles: int
+) -> list[list[dict]]:
+    """
+    Bin-packs articles into groups whose combined content fits token_budget, using
+    first-fit decreasing on the estimated token counts.
+    """
+    packs: list[list[dict]] = []
+    pack_tokens: list[int] = []
+    sized = [(estimate_tokens(a["content"]), a) for a in articles]
+    for tokens, article in sorted(sized, key=lambda item: -item[0]):
+        for i, pack in enumerate(packs):
+            if len(pack) < max_articles and pack_tokens[i] + tokens <= token_budget:
+                pack.append(article)
+                pack_tokens[i] += tokens
+                break
+        else:
+            packs.append([article])
+            pack_tokens.append(tokens)
+    return packs
+
+
+def _extract_packed_articles(
+    topic: str,
+    articles: list[dict],
+    extraction_profile: str = "full",
+    model: BaseChatModel = llm,
+) -> dict[str, list[ExtractedPerspective]]:
+    """
+    Extracts the perspectives of short articles with one request per pack of articles.
+
+    Returns the perspectives per article id for every article that was answered in a
+    valid packed response. Articles missing from the result are left for the regular
+    per-article extraction.
+    """
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You are an expert analyst skilled in identifying and deconstructing distinct viewpoints in a text.
+Your task is to extract all clearly identifiable perspectives regarding the topic of **{topic}** from each of the articles provided.
+
+A perspective is a specific viewpoint, stance, or framing.
+Analyze every article separately and return one entry per article with its exact article id as `source_article_id`.
+For each perspective you find, you must populate all fields of the requested output schema.
+
+Extract only what is explicitly presented or strongly implied in the text. Do not invent information. Keep each perspective distinct.
+                """,
+            ),
+            ("human", "Analyze the following articles:\n\n{articles_text}"),
+        ]
+    )
+    _, packed_schema = get_extraction_schemas(extraction_profile)
+    chain = prompt | model.with_structured_output(packed_schema)
+
+    short_articles = [
+        a
+        for a in articles
+        if estimate_tokens(a["content"]) <= SHORT_ARTICLE_TOKEN_THRESHOLD
+    ]
+    packs = pack_articles(
+        short_articles, PACKED_REQUEST_TOKEN_BUDGET, MAX_ARTICLES_PER_PACK
+    )
+
+    results: dict[str, list[ExtractedPerspective]] = {}
+    for pack in packs:
+        if len(pack) < 2:
+            continue
+        pack_ids = {a["id"] for a in pack}
+        articles_text = "\n\n".join(
+            f"--- Article id: {a['id']} ---\n{a['content']}" for a in pack
+        )
+        logger.info(f"Extracting a pack of {len(pack)} short articles in one request.")
+        try:
+            response = chain.invoke({"topic": topic, "articles_text": articles_text})
+            for article_result in response.articles:
+                if article_result.source_article_id in pack_ids:
+                    results[article_result.source_article_id] = (
+                        _to_extracted_perspectives(article_result.perspectives)
+                    )
+                else:
+                    logger.warning(
+                        f"Packed response returned unknown article id '{article_result.source_article_id}'."
+                    )
+        except Exception as e:
+            logger.warning(
+                f"Packed extraction failed, falling back to per-article calls: {e}"
+            )
+            continue
+
+        missing_ids = pack_ids - results.keys()
+        if missing_ids:
+            logger.warning(
+                f"Packed response is missing {len(missing_ids)} article(s), "
+                f"falling back to per-article calls for them."
+            )
+    return results
+
+
+def create_extraction_chain(profile: RunProfile) -> Runnable:
+    """Builds the single-article extraction chain for the profile's model and schema."""
+    model = llm_lite if profile.use_lite_model else llm
+    schema, _ = get_extraction_schemas(profile.extraction_profile)
 
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -31,7 +346,7 @@ def perspective_identification(state: State) -> dict:
 Your task is to extract all clearly identifiable perspectives from the article regarding the topic of **{topic}**.
 
 A perspective is a specific viewpoint, stance, or framing. 
-For each one you find, you must populate the fields as provided in the 'ExtractedPerspectives' object.
+For each one you find, you must populate all fields of the requested output schema.
 
 Extract only what is explicitly presented or strongly implied in the text. Do not invent information. Keep each perspective distinct.
                 """,
@@ -43,8 +358,41 @@ Extract only what is explicitly presented or strongly implied in the text. Do no
         ]
     )
 
-    structured_llm = llm.with_structured_output(ExtractedPerspectives)
-    chain = prompt | structured_llm
+    structured_llm = model.with_structured_output(schema)
+    return prompt | structured_llm
+
+
+def extract_article(chain: Runnable, topic: str, article: dict) -> ArticlePerspectives:
+    """Extracts the perspectives of a single article with a chain from create_extraction_chain."""
+    logger.info(f"Processing article {article['id']}: {article['url']}")
+    perspectives_list = _extract_article_perspectives(chain, topic, article)
+    logger.info(f"Found {len(perspectives_list)} perspective(s).")
+    return ArticlePerspectives(
+        source_article_id=article["id"], perspectives=perspectives_list
+    )
+
+
+def perspective_identification(
+    state: State, config: RunnableConfig | None = None
+) -> dict:
+    """
+    Identifies and extracts one or more perspectives from each article.
+
+    This node iterates through each raw article, invoking an LLM with structured output
+    to extract all discussed perspectives. With ENABLE_ARTICLE_PACKING, short articles are
+    first extracted several at a time in packed requests. The run profile selects the
+    model and the output schema; perspectives from the fast extraction profile have empty
+    narratives, source summaries and assumptions.
+
+    Article content is read from the session's ArticleStore one article at a time and
+    deleted from the store once all articles are processed.
+    """
+    profile = get_run_profile(config)
+    store = get_article_store(config)
+
+    # TODO: parallelize llm calls instead of looping
+
+    chain = create_extraction_chain(profile)
 
     articles_to_process = state.get("raw_articles")
     topic = state.get("topic")
@@ -55,30 +403,34 @@ Extract only what is explicitly presented or strongly implied in the text. Do no
         f"--- Identifying perspectives for {len(articles_to_process)} articles on topic: {topic} ---"
     )
 
+    packed_results: dict[str, list[ExtractedPerspective]] = {}
+    if ENABLE_ARTICLE_PACKING:
+        model = llm_lite if profile.use_lite_model else llm
+        packed_results = _extract_packed_articles(
+            topic,
+            store.load_many(articles_to_process),
+            profile.extraction_profile,
+            model,
+        )
+
     for article in articles_to_process:
         article_id = article["id"]
-        logger.info(f"Processing article {article_id}: {article['url']}")
         try:
-            extracted_object = chain.invoke(
-                {"topic": topic, "article_text": article["content"]}
-            )
-
-            perspectives_list = extracted_object.perspectives
-
-            if not isinstance(perspectives_list, list):
-                logger.warning(
-                    f"The 'perspectives' attribute is not a list. Response: {extracted_object}"
+            if article_id in packed_results:
+                perspectives_list = packed_results[article_id]
+                article_perspectives = ArticlePerspectives(
+                    source_article_id=article_id,
+                    perspectives=perspectives_list,
+                )
+                logger.info(f"Found {len(perspectives_list)} perspective(s).")
+            else:
+                article_perspectives = extract_article(
+                    chain, topic, store.load(article)
                 )
-                perspectives_list = []
-
-            article_perspectives = ArticlePerspectives(
-                source_article_id=article_id,
-                perspectives=perspectives_list,
-            )
             all_extracted_perspectives.append(article_perspectives)
-            logger.info(f"Found {len(perspectives_list)} perspective(s).")
 
         except Exception as e:
             logger.error(f"Processing article {article_id} failed: {e}")
 
+    store.release([article["id"] for article in articles_to_process])
     return {"article_perspectives": all_extracted_perspectives}
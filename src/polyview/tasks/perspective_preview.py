@@ -0,0 +1,60 @@
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel, Field
+
+from polyview.core.llm_config import llm_lite
+from polyview.core.logging import get_logger
+from polyview.utils.serialization import compact_json
+
+logger = get_logger(__name__)
+
+# The preview only looks at the start of the first few search results
+MAX_PREVIEW_ARTICLES = 10
+PREVIEW_SNIPPET_CHARS = 600
+
+
+class PreviewPerspective(BaseModel):
+    perspective_name: str = Field(
+        description="A short descriptive name for the perspective."
+    )
+    summary: str = Field(description="One or two sentences describing the perspective.")
+
+
+class PerspectivePreview(BaseModel):
+    perspectives: list[PreviewPerspective]
+
+
+async def generate_preview(
+    topic: str, articles: list[dict], config: RunnableConfig | None = None
+) -> list[PreviewPerspective]:
+    """
+    Drafts a rough list of perspectives from search result snippets with the lite model.
+
+    This is a quick first impression shown while the full analysis runs; it is replaced
+    by the final perspectives once those are synthesized.
+    """
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You give a quick first overview of the debate on **{topic}**.
+Based only on the search result snippets provided, list the main distinct perspectives on the topic, each with a short, neutral summary.
+This is a rough preview; do not invent perspectives the snippets give no hint of.""",
+            ),
+            ("human", "Search result snippets:\n{snippets}"),
+        ]
+    )
+    chain = prompt | llm_lite.with_structured_output(PerspectivePreview)
+
+    snippets = [
+        {
+            "title": article.get("title"),
+            "snippet": (article.get("content") or "")[:PREVIEW_SNIPPET_CHARS],
+        }
+        for article in articles[:MAX_PREVIEW_ARTICLES]
+    ]
+    logger.info(f"Generating a perspective preview from {len(snippets)} snippets.")
+    preview: PerspectivePreview = await chain.ainvoke(
+        {"topic": topic, "snippets": compact_json(snippets)}, config
+    )
+    return preview.perspectives
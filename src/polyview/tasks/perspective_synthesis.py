@@ -1,35 +1,153 @@
+import hashlib
+import json
+
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel
 
-from polyview.core.llm_config import llm
+from polyview.core.llm_config import llm, llm_lite
 from polyview.core.logging import get_logger
-from polyview.core.state import FinalPerspective, State
+from polyview.core.metrics import record_cache_lookups
+from polyview.core.profiles import get_run_profile
+from polyview.core.state import ConsolidatedPerspective, FinalPerspective, State
+from polyview.utils.serialization import compact_json, log_token_savings
+from polyview.utils.streaming import emit_event
 
 logger = get_logger(__name__)
 
+# Perspectives are synthesized in batches of this size, so the first ones can be streamed
+# to clients while the rest are still being synthesized
+SYNTHESIS_BATCH_SIZE = 3
+MAX_SYNTHESIS_CONCURRENCY = 4
+
+# Consolidated perspective fields the synthesis prompt works from
+SYNTHESIS_PROMPT_FIELDS = (
+    "perspective_name",
+    "preliminary_synthesis",
+    "aggregated_narratives",
+    "aggregated_arguments",
+    "supporting_evidence",
+    "argument_counts",
+    "evidence_counts",
+)
+
 
 class FinalPerspectives(BaseModel):
     final_perspectives: list[FinalPerspective]
 
 
-def perspective_synthesis_node(state: State) -> dict:
+def fingerprint_perspective(
+    perspective: ConsolidatedPerspective | FinalPerspective,
+) -> str:
+    """
+    Content hash of a perspective's name and aggregated lists, independent of their order.
+
+    A final perspective is hashed as the consolidated perspective it would turn into if
+    a cycle added nothing new to it (its arguments, narrative and evidence), so an
+    unchanged cluster maps back to the final perspective it was synthesized into.
+    """
+    if isinstance(perspective, FinalPerspective):
+        arguments = perspective.core_arguments
+        narratives = [perspective.narrative]
+    else:
+        arguments = perspective.aggregated_arguments
+        narratives = perspective.aggregated_narratives
+    content = [
+        perspective.perspective_name,
+        sorted(set(arguments)),
+        sorted(set(narratives)),
+        sorted(set(perspective.supporting_evidence)),
+    ]
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+def _match_synthesized(
+    to_synthesize: list[ConsolidatedPerspective],
+    synthesized: list[FinalPerspective],
+) -> dict[str, FinalPerspective]:
+    """Maps the fingerprints of consolidated perspectives to their synthesized result."""
+    by_name = {p.perspective_name: p for p in synthesized}
+    matches = {}
+    for i, consolidated in enumerate(to_synthesize):
+        final = by_name.get(consolidated.perspective_name)
+        if final is None and len(synthesized) == len(to_synthesize):
+            # The LLM renamed the perspective; fall back to the position in the output
+            final = synthesized[i]
+        if final is not None:
+            matches[fingerprint_perspective(consolidated)] = final
+    return matches
+
+
+def _emit_perspectives(perspectives: list[FinalPerspective]) -> None:
+    for perspective in perspectives:
+        emit_event({"type": "perspective", "perspective": perspective})
+
+
+def perspective_synthesis_node(
+    state: State, config: RunnableConfig | None = None
+) -> dict:
     """
     Synthesizes and de-duplicates arguments within each consolidated perspective for all perspectives at once.
 
     This node takes the clustered perspectives (from perspective_clustering_node) and uses an LLM
     to refine their arguments, merging similar or duplicate arguments into a single, concise statement
-    for each perspective, in a single LLM call.
+    for each perspective. Perspectives are synthesized in concurrent batches of
+    SYNTHESIS_BATCH_SIZE, and every final perspective is written to the custom stream as
+    soon as its batch is done. Existing final perspectives without a
+    consolidated counterpart were not changed this cycle and are carried over as they are.
+    Consolidated perspectives whose content fingerprint was synthesized before reuse the
+    cached result, so the LLM only sees new or modified clusters.
     """
-    consolidated_perspectives = state.get("consolidated_perspectives")
+    consolidated_perspectives = [
+        ConsolidatedPerspective.model_validate(p) if isinstance(p, dict) else p
+        for p in state.get("consolidated_perspectives") or []
+    ]
+    existing_perspectives = [
+        FinalPerspective.model_validate(p) if isinstance(p, dict) else p
+        for p in state.get("final_perspectives") or []
+    ]
+    consolidated_names = {p.perspective_name for p in consolidated_perspectives}
+    unchanged_perspectives = [
+        p for p in existing_perspectives if p.perspective_name not in consolidated_names
+    ]
 
     if not consolidated_perspectives:
         logger.info(
             "No consolidated perspectives found for synthesis. Skipping synthesis node.."
         )
-        return {"final_perspectives": []}
+        return {"final_perspectives": unchanged_perspectives}
+
+    # Reuse the final perspective of clusters whose content did not change
+    synthesis_cache = dict(state.get("synthesis_cache") or {})
+    cached_perspectives = []
+    to_synthesize = []
+    for consolidated in consolidated_perspectives:
+        cached = synthesis_cache.get(fingerprint_perspective(consolidated))
+        if cached is not None:
+            cached_perspectives.append(
+                FinalPerspective.model_validate(cached)
+                if isinstance(cached, dict)
+                else cached
+            )
+        else:
+            to_synthesize.append(consolidated)
+
+    record_cache_lookups(
+        "synthesis", hits=len(cached_perspectives), misses=len(to_synthesize)
+    )
+    if unchanged_perspectives or cached_perspectives:
+        logger.info(
+            f"Keeping {len(unchanged_perspectives) + len(cached_perspectives)} unchanged "
+            f"perspective(s) from the previous cycle."
+        )
+    unchanged_perspectives += cached_perspectives
+    _emit_perspectives(cached_perspectives)
+
+    if not to_synthesize:
+        return {"final_perspectives": unchanged_perspectives}
 
     logger.info(
-        f"--- Synthesizing arguments for {len(consolidated_perspectives)} consolidated perspectives in one go ---"
+        f"--- Synthesizing arguments for {len(to_synthesize)} consolidated perspectives ---"
     )
 
     prompt = ChatPromptTemplate.from_messages(
@@ -44,6 +162,10 @@ For each perspective provided, you must perform the following steps:
 3.  **Identify Common Assumptions**: Based on the narrative and arguments, identify the underlying `common_assumptions` of the perspective.
 4.  **Determine Strengths and Weaknesses**: Analyze the `core_arguments` and `supporting_evidence`. Identify the `strengths` (e.g., well-supported by evidence, logically consistent) and `weaknesses` (e.g., relies on unstated assumptions, lacks evidence for key claims) of the perspective.
 
+`argument_counts` and `evidence_counts` give how many times each argument and piece of evidence (or a near-duplicate of it) was made across the source articles. Give arguments and evidence made by many sources more weight in the `narrative` and the `core_arguments`, but do not treat how often a claim is repeated as proof that it is true.
+
+Perspectives from fast runs may have no `aggregated_narratives` or `preliminary_synthesis`. In that case, write the `narrative` from the arguments and evidence alone.
+
 Your output must be a list of `FinalPerspective` objects, fully populated.
 """,
             ),
@@ -54,23 +176,70 @@ Your output must be a list of `FinalPerspective` objects, fully populated.
         ]
     )
 
-    structured_llm = llm.with_structured_output(FinalPerspectives)
+    model = llm_lite if get_run_profile(config).use_lite_model else llm
+    structured_llm = model.with_structured_output(FinalPerspectives)
     chain = prompt | structured_llm
 
-    try:
-        final_perspectives_obj: FinalPerspectives = chain.invoke(
-            {"perspectives_json": consolidated_perspectives}
+    batches = [
+        to_synthesize[start : start + SYNTHESIS_BATCH_SIZE]
+        for start in range(0, len(to_synthesize), SYNTHESIS_BATCH_SIZE)
+    ]
+    inputs = [
+        {"perspectives_json": compact_json(batch, SYNTHESIS_PROMPT_FIELDS)}
+        for batch in batches
+    ]
+    log_token_savings(
+        "Perspective synthesis",
+        to_synthesize,
+        "".join(i["perspectives_json"] for i in inputs),
+    )
+
+    if len(batches) == 1:
+        try:
+            responses = [(0, chain.invoke(inputs[0]))]
+        except Exception as e:
+            responses = [(0, e)]
+    else:
+        responses = chain.batch_as_completed(
+            inputs,
+            config={"max_concurrency": MAX_SYNTHESIS_CONCURRENCY},
+            return_exceptions=True,
         )
+
+    synthesized_batches: dict[int, list[FinalPerspective]] = {}
+    failed_names: set[str] = set()
+    for i, response in responses:
+        if isinstance(response, Exception):
+            logger.error(f"Error synthesizing a batch of perspectives: {response}")
+            failed_names.update(p.perspective_name for p in batches[i])
+            continue
+        batch_synthesized = response.final_perspectives
         logger.info(
-            f"Successfully synthesized arguments for {len(final_perspectives_obj.final_perspectives)} perspectives."
+            f"Successfully synthesized arguments for {len(batch_synthesized)} perspectives."
         )
-        logger.debug(f"Final perspectives: {final_perspectives_obj}")
-
-    except Exception as e:
+        logger.debug(f"Final perspectives: {response}")
+        # Send each batch to clients as soon as it is ready
+        _emit_perspectives(batch_synthesized)
+        synthesized_batches[i] = batch_synthesized
+        synthesis_cache.update(_match_synthesized(batches[i], batch_synthesized))
+
+    if not synthesized_batches:
+        # Unchanged and cached perspectives were already sent to clients and are kept
         logger.error(
-            f"Error synthesizing arguments for all perspectives: {e}\n"
-            f"Using consolidated perspectives as backup"
+            "Error synthesizing arguments for all perspectives. "
+            "Keeping the perspectives of the previous cycle as backup"
         )
-        return {"final_perspectives": []}
 
-    return {"final_perspectives": final_perspectives_obj.final_perspectives}
+    synthesized = [
+        p for i in sorted(synthesized_batches) for p in synthesized_batches[i]
+    ]
+    synthesis_cache.update({fingerprint_perspective(p): p for p in synthesized})
+    # Perspectives of failed batches keep their version from the previous cycle
+    kept_perspectives = [
+        p for p in existing_perspectives if p.perspective_name in failed_names
+    ]
+
+    return {
+        "final_perspectives": unchanged_perspectives + kept_perspectives + synthesized,
+        "synthesis_cache": synthesis_cache,
+    }
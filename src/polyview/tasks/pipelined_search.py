@@ -0,0 +1,169 @@
+from typing import TYPE_CHECKING
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+from polyview.agents.search_agent import (
+    collect_search_queries,
+    create_search_agent_input,
+    parse_tool_message,
+    search_agent_graph,
+)
+from polyview.core.article_store import get_article_store, without_content
+from polyview.core.logging import get_logger
+from polyview.core.metrics import record_cache_lookups
+from polyview.core.profiles import get_run_profile
+from polyview.core.state import ArticlePerspectives, State
+from polyview.tasks.article_preprocessing import (
+    ARTICLE_TOKEN_BUDGET,
+    preprocess_article,
+)
+from polyview.tasks.perspective_identification import (
+    create_extraction_chain,
+    extract_article,
+)
+from polyview.tasks.relevance_filter import (
+    MIN_RELEVANCE_SCORE,
+    score_article_relevance,
+)
+from polyview.utils.messages import compact_tool_messages
+from polyview.utils.streaming import emit_event
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+logger = get_logger(__name__)
+
+# Maximum number of articles that are extracted concurrently while the search continues
+MAX_PIPELINE_CONCURRENCY = 4
+
+
+def pipelined_search_node(state: State, config: RunnableConfig | None = None) -> dict:
+    """
+    Runs the search agent and perspective identification as one pipeline.
+
+    The search subgraph is streamed, and every article is scored, preprocessed and
+    submitted for extraction as soon as the tool call that found it returns, so the
+    extraction calls overlap with the remaining search rounds. Articles are taken in the
+    order they arrive until the article budget is used up; unlike the barriered graph,
+    there is no diversity-based selection over the full result set. Articles prefetched
+    by the previous cycle are used instead of searching, if there are any.
+
+    Only the metadata of accepted articles goes into the state; their content is only kept
+    in memory until extracted, and is written to the custom stream as an "articles" event
+    for each batch of accepted articles. Prefetched content is deleted from the
+    ArticleStore afterwards.
+    """
+    profile = get_run_profile(config)
+    store = get_article_store(config)
+    topic = state["topic"]
+    processed_ids = set(state.get("processed_article_ids") or [])
+    remaining_budget = max(0, profile.article_budget - len(processed_ids))
+    chain = create_extraction_chain(profile)
+
+    seen_urls: set[str] = set()
+    accepted: list[dict] = []
+    futures: dict[Future, dict] = {}
+
+    def submit_new_articles(results: list[dict], queries: list[str]) -> None:
+        new_articles = [
+            r
+            for r in results
+            if r["url"] not in seen_urls and r["id"] not in processed_ids
+        ]
+        seen_urls.update(r["url"] for r in results)
+        if not new_articles:
+            return
+
+        query = " ".join([topic, *queries])
+        new_articles = store.load_many(new_articles)
+        batch: list[dict] = []
+        scores = score_article_relevance(new_articles, topic, queries)
+        for article, score in zip(new_articles, scores, strict=True):
+            if score < MIN_RELEVANCE_SCORE:
+                logger.debug(
+                    f"Dropping article {article['id']} ({article.get('url')}) with relevance score {score:.3f}."
+                )
+                continue
+            if len(accepted) >= remaining_budget:
+                break
+            article = preprocess_article(
+                {**article, "relevance_score": round(float(score), 4)},
+                query,
+                ARTICLE_TOKEN_BUDGET,
+            )
+            # The content is extracted from memory, so it is not written to the store
+            accepted.append(without_content(article))
+            batch.append(article)
+            futures[executor.submit(extract_article, chain, topic, article)] = article
+        if batch:
+            # Lets clients work with the content (e.g. for a preview) as it arrives
+            emit_event({"type": "articles", "articles": batch})
+
+    # The context is copied into the worker threads, so their LLM calls are traced as
+    # part of this node
+    with ContextThreadPoolExecutor(max_workers=MAX_PIPELINE_CONCURRENCY) as executor:
+        prefetched_articles = state.get("prefetched_articles") or []
+        if prefetched_articles:
+            logger.info(
+                f"Starting research cycle from {len(prefetched_articles)} prefetched articles."
+            )
+            messages = []
+            submit_new_articles(
+                prefetched_articles, state.get("prefetched_queries") or []
+            )
+        else:
+            logger.info("--- Invoking Search Subgraph (pipelined) ---")
+            search_input = create_search_agent_input(topic, profile)
+            messages = list(search_input["messages"])
+            for update in search_agent_graph.stream(
+                search_input, config, stream_mode="updates"
+            ):
+                for node_name, node_update in update.items():
+                    node_messages = (node_update or {}).get("messages", [])
+                    messages.extend(node_messages)
+                    if node_name == "tools":
+                        submit_new_articles(
+                            [
+                                result
+                                for message in node_messages
+                                if isinstance(message, ToolMessage)
+                                for result in parse_tool_message(message)
+                            ],
+                            collect_search_queries(messages),
+                        )
+
+        article_perspectives: list[ArticlePerspectives] = []
+        for future, article in futures.items():
+            try:
+                article_perspectives.append(future.result())
+            except Exception as e:
+                logger.error(f"Processing article {article['id']} failed: {e}")
+
+    search_queries = (
+        state.get("prefetched_queries") or []
+        if prefetched_articles
+        else collect_search_queries(messages)
+    )
+    hits = len(search_queries) if prefetched_articles else 0
+    record_cache_lookups(
+        "search_prefetch", hits=hits, misses=len(search_queries) - hits
+    )
+
+    # Extraction is done, so the content of prefetched articles is no longer needed
+    store.release([a["id"] for a in prefetched_articles])
+
+    logger.info(
+        f"Pipelined search accepted {len(accepted)} of {len(seen_urls)} articles "
+        f"(remaining budget: {remaining_budget}/{profile.article_budget})."
+    )
+    return {
+        "raw_articles": accepted,
+        "search_queries": search_queries,
+        "prefetched_articles": [],
+        "prefetched_queries": [],
+        "messages": compact_tool_messages(messages),
+        "processed_article_ids": [a["id"] for a in accepted],
+        "article_perspectives": article_perspectives,
+    }
@@ -0,0 +1,65 @@
+from langchain_core.runnables import RunnableConfig
+import numpy as np
+
+from polyview.core.article_store import get_article_store
+from polyview.core.logging import get_logger
+from polyview.core.state import State
+from polyview.utils.bm25 import BM25Index
+
+logger = get_logger(__name__)
+
+# Articles scoring below this normalized BM25 score (0-1) against both the topic and
+# every search query are dropped before perspective identification
+MIN_RELEVANCE_SCORE = 0.1
+
+
+def score_article_relevance(
+    articles: list[dict], topic: str, queries: list[str]
+) -> np.ndarray:
+    """
+    Scores each article's content against the topic and the search queries that were used
+    to find it. An article's score is its best normalized BM25 score over all of them.
+    """
+    if not articles:
+        return np.zeros(0, dtype=np.float32)
+
+    index = BM25Index([article.get("content") or "" for article in articles])
+    scores = index.score_many([topic, *queries])
+    return scores.max(axis=0)
+
+
+def relevance_filter_node(state: State, config: RunnableConfig | None = None) -> dict:
+    """
+    Drops off-topic articles with a local BM25 pass, so they never cost an LLM call.
+
+    Tavily's match score is relative to a single query, so tangential results can still
+    pass it. This node scores every article against the topic and all generated queries,
+    records the score on the article and keeps only those above MIN_RELEVANCE_SCORE.
+    The content of dropped articles is deleted from the ArticleStore.
+    """
+    articles = state.get("raw_articles") or []
+    if not articles:
+        logger.info("No articles to score. Skipping relevance filter..")
+        return {"raw_articles": []}
+
+    store = get_article_store(config)
+    topic = state.get("topic", "")
+    queries = state.get("search_queries") or []
+    scores = score_article_relevance(store.load_many(articles), topic, queries)
+
+    relevant_articles = []
+    for article, score in zip(articles, scores, strict=True):
+        scored_article = {**article, "relevance_score": round(float(score), 4)}
+        if score >= MIN_RELEVANCE_SCORE:
+            relevant_articles.append(store.put(scored_article))
+        else:
+            store.release([article["id"]])
+            logger.debug(
+                f"Dropping article {article['id']} ({article.get('url')}) with relevance score {score:.3f}."
+            )
+
+    logger.info(
+        f"Relevance filter kept {len(relevant_articles)} of {len(articles)} articles "
+        f"(min score {MIN_RELEVANCE_SCORE})."
+    )
+    return {"raw_articles": relevant_articles}
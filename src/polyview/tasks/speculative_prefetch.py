@@ -0,0 +1,73 @@
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+from polyview.agents.search_agent import article_id, run_search
+from polyview.core.article_store import get_article_store
+from polyview.core.logging import get_logger
+from polyview.core.profiles import get_run_profile
+from polyview.core.state import State
+from polyview.tasks.query_generation_agent import query_generation_agent
+
+logger = get_logger(__name__)
+
+MAX_PREFETCH_CONCURRENCY = 3
+
+
+def _prefetch_query(query: str, max_results: int) -> list[dict]:
+    try:
+        return run_search({"query": query}, max_results)
+    except Exception as e:
+        logger.warning(f"Prefetch search for '{query}' failed: {e}")
+        return []
+
+
+def prefetch_searches_node(state: State, config: RunnableConfig | None = None) -> dict:
+    """
+    Speculatively searches for the next research cycle while the current one is being
+    clustered and synthesized, which keeps the search side busy while the LLM is.
+
+    Follow-up queries are generated for the next iteration and run against the search
+    tool. The results are kept in prefetched_articles, which the next cycle's search
+    starts from, with their content in the ArticleStore. If the supervisor stops the
+    research instead, they are never used.
+    Does nothing unless the run profile enables speculative_prefetch, or if this is the
+    last allowed cycle anyway.
+    """
+    profile = get_run_profile(config)
+    iteration = state.get("iteration", 1)
+    if not profile.speculative_prefetch or iteration >= profile.max_iterations:
+        return {"prefetched_articles": [], "prefetched_queries": []}
+
+    used_queries = set(state.get("search_queries") or [])
+    generated = query_generation_agent({**state, "iteration": iteration + 1})
+    queries = [q for q in generated["search_queries"] if q not in used_queries]
+    queries = queries[: profile.max_initial_search_queries]
+    logger.info(
+        f"Prefetching {len(queries)} searches for research cycle {iteration + 1}."
+    )
+
+    with ContextThreadPoolExecutor(max_workers=MAX_PREFETCH_CONCURRENCY) as executor:
+        responses = list(
+            executor.map(
+                lambda q: _prefetch_query(q, profile.max_search_results_per_query),
+                queries,
+            )
+        )
+
+    processed_ids = set(state.get("processed_article_ids") or [])
+    articles: dict[str, dict] = {}
+    for results in responses:
+        for res in results:
+            if "url" not in res:
+                continue
+            res_id = article_id(res["url"])
+            if res_id not in processed_ids and res_id not in articles:
+                articles[res_id] = {**res, "id": res_id}
+
+    logger.info(f"Prefetched {len(articles)} new articles.")
+    return {
+        "prefetched_articles": get_article_store(config).put_many(
+            list(articles.values())
+        ),
+        "prefetched_queries": queries,
+    }
@@ -4,9 +4,21 @@ from langchain_core.prompts import ChatPromptTemplate
 from polyview.core.llm_config import llm
 from polyview.core.logging import get_logger
 from polyview.core.state import State
+from polyview.utils.serialization import compact_json, log_token_savings
 
 logger = get_logger(__name__)
 
+# Final perspective fields the summary is written from
+SUMMARY_PROMPT_FIELDS = (
+    "perspective_name",
+    "narrative",
+    "core_arguments",
+    "supporting_evidence",
+    "strengths",
+    "weaknesses",
+    "rated_perspective_strength",
+)
+
 
 async def summarize_node(state: State):
     """
@@ -70,6 +82,10 @@ async def summarize_node(state: State):
 
     chain = prompt_template | llm | StrOutputParser()
 
+    perspectives = state.get("final_perspectives") or []
+    perspectives_json = compact_json(perspectives, SUMMARY_PROMPT_FIELDS)
+    log_token_savings("Summarization", perspectives, perspectives_json)
+
     logger.info("Starting summarization")
-    summary = await chain.ainvoke({"perspectives": state.get("final_perspectives")})
+    summary = await chain.ainvoke({"perspectives": perspectives_json})
     return {"summary": summary}
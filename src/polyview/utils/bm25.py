@@ -0,0 +1,82 @@
+import numpy as np
+
+from polyview.utils.text import tokenize
+
+
+class BM25Index:
+    """
+    An in-memory Okapi BM25 index over a small corpus of documents.
+
+    The corpus is stored as a dense document-term frequency matrix, so scoring a query
+    against every document is a handful of vectorized NumPy operations.
+    """
+
+    def __init__(self, documents: list[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        tokenized_docs = [tokenize(doc) for doc in documents]
+        self.vocabulary: dict[str, int] = {}
+        for tokens in tokenized_docs:
+            for token in tokens:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+
+        self.term_frequencies = np.zeros(
+            (len(tokenized_docs), len(self.vocabulary)), dtype=np.float32
+        )
+        for row, tokens in enumerate(tokenized_docs):
+            if tokens:
+                columns = np.fromiter(
+                    (self.vocabulary[t] for t in tokens), dtype=np.int64
+                )
+                np.add.at(self.term_frequencies[row], columns, 1)
+
+        doc_lengths = self.term_frequencies.sum(axis=1)
+        avg_doc_length = doc_lengths.mean() if len(doc_lengths) else 0.0
+        # Per-document length normalisation, precomputed once for all queries
+        self._length_norm = self.k1 * (
+            1 - self.b + self.b * doc_lengths / max(avg_doc_length, 1e-9)
+        )
+
+        doc_count = len(tokenized_docs)
+        doc_frequencies = (self.term_frequencies > 0).sum(axis=0)
+        self.idf = np.log(
+            1 + (doc_count - doc_frequencies + 0.5) / (doc_frequencies + 0.5)
+        )
+
+    def __len__(self) -> int:
+        return self.term_frequencies.shape[0]
+
+    def score(self, query: str) -> np.ndarray:
+        """Returns the BM25 score of every document in the corpus for the given query."""
+        columns = [self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary]
+        if not columns or not len(self):
+            return np.zeros(len(self), dtype=np.float32)
+
+        tf = self.term_frequencies[:, columns]
+        weights = tf * (self.k1 + 1) / (tf + self._length_norm[:, None])
+        return (weights * self.idf[columns]).sum(axis=1)
+
+    def normalized_score(self, query: str) -> np.ndarray:
+        """
+        Returns BM25 scores scaled to [0, 1] by the score a document would get if it
+        saturated every query term, which makes scores comparable across queries.
+        """
+        tokens = tokenize(query)
+        columns = [self.vocabulary[t] for t in tokens if t in self.vocabulary]
+        # Query terms that appear in no document count with the maximum possible idf
+        missing_terms = len(tokens) - len(columns)
+        max_idf = np.log(1 + (len(self) + 0.5) / 0.5)
+        upper_bound = (self.idf[columns].sum() + missing_terms * max_idf) * (
+            self.k1 + 1
+        )
+        if upper_bound <= 0:
+            return np.zeros(len(self), dtype=np.float32)
+        return self.score(query) / upper_bound
+
+    def score_many(self, queries: list[str], normalized: bool = True) -> np.ndarray:
+        """Returns a (queries x documents) matrix of (normalized) BM25 scores."""
+        if not queries:
+            return np.zeros((0, len(self)), dtype=np.float32)
+        scorer = self.normalized_score if normalized else self.score
+        return np.vstack([scorer(query) for query in queries])
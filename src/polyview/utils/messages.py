@@ -0,0 +1,44 @@
+import json
+
+from langchain_core.messages import BaseMessage, RemoveMessage, ToolMessage
+
+from polyview.utils.serialization import compact_json
+
+# Fields of a search result that are kept in a compacted ToolMessage
+TOOL_RESULT_SUMMARY_FIELDS = ("title", "url", "score")
+
+
+def compact_tool_messages(messages: list[BaseMessage]) -> list[BaseMessage]:
+    """
+    Drops the payload of search tool results once they have been processed.
+
+    ToolMessages holding a list of search results keep only the title, URL and score of
+    each result; the article content is kept in the ArticleStore instead. Other messages,
+    including tool errors, are returned unchanged.
+    """
+    compacted = []
+    for message in messages:
+        if isinstance(message, ToolMessage):
+            try:
+                results = json.loads(message.content)
+            except (json.JSONDecodeError, TypeError):
+                results = None
+            if isinstance(results, list) and all(isinstance(r, dict) for r in results):
+                message = message.model_copy(
+                    update={
+                        "content": compact_json(results, TOOL_RESULT_SUMMARY_FIELDS)
+                    }
+                )
+        compacted.append(message)
+    return compacted
+
+
+def messages_to_remove(
+    messages: list[BaseMessage], keep_last: int
+) -> list[RemoveMessage]:
+    """
+    Returns RemoveMessage updates for all but the last keep_last messages, for use with
+    the add_messages reducer. Messages without an id cannot be removed and are skipped.
+    """
+    expired = messages[: max(0, len(messages) - keep_last)]
+    return [RemoveMessage(id=message.id) for message in expired if message.id]
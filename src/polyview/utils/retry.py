@@ -6,6 +6,8 @@ import time
 
 from google.api_core.exceptions import ResourceExhausted
 
+from polyview.core.tracing import arecord_retry_wait, record_retry_wait
+
 logger = logging.getLogger(__name__)
 
 # langchain_google_genai has an internal retry delay which causes discrepancy with the set delay time
@@ -13,6 +15,12 @@ logger = logging.getLogger(__name__)
 LANGCHAIN_INTERNAL_RETRY_DELAY = 2  # Observed internal delay from logs
 
 
+def _model_name(args: tuple) -> str | None:
+    """The model of the LLM whose method is retried, if the method is called on one."""
+    model = getattr(args[0], "model", None) if args else None
+    return model.removeprefix("models/") if isinstance(model, str) else None
+
+
 class _RetryHandler:
     """A helper class to manage the state and logic of retrying."""
 
@@ -58,7 +66,8 @@ class _RetryHandler:
 def gemini_api_delayed_retry(max_retries=3, fallback_delay_seconds=61):
     """
     A decorator to handle Gemini API rate limiting by retrying with a dynamic
-    delay. Supports both sync and async functions.
+    delay. Supports both sync and async functions. Each wait is reported as a trace span
+    when tracing is enabled.
     """
 
     def decorator(func):
@@ -70,7 +79,11 @@ def gemini_api_delayed_retry(max_retries=3, fallback_delay_seconds=61):
                     return await func(*args, **kwargs)
                 except ResourceExhausted as e:
                     delay = handler.handle_exception(e)
+                    wait_started_at = time.time_ns()
                     await asyncio.sleep(delay)
+                    await arecord_retry_wait(
+                        wait_started_at, delay, handler.retries, _model_name(args)
+                    )
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
@@ -80,7 +93,11 @@ def gemini_api_delayed_retry(max_retries=3, fallback_delay_seconds=61):
                     return func(*args, **kwargs)
                 except ResourceExhausted as e:
                     delay = handler.handle_exception(e)
+                    wait_started_at = time.time_ns()
                     time.sleep(delay)
+                    record_retry_wait(
+                        wait_started_at, delay, handler.retries, _model_name(args)
+                    )
 
         return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
 
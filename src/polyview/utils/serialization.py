@@ -0,0 +1,53 @@
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+from polyview.core.logging import get_logger
+from polyview.utils.text import estimate_tokens
+
+logger = get_logger(__name__)
+
+
+def _to_dict(item: BaseModel | dict, fields: tuple[str, ...] | None) -> dict[str, Any]:
+    data = item.model_dump() if isinstance(item, BaseModel) else dict(item)
+    if fields is not None:
+        data = {field: data[field] for field in fields if field in data}
+    # Empty values carry no information for the LLM, only tokens
+    return {
+        key: value for key, value in data.items() if value not in (None, "", [], {})
+    }
+
+
+def compact_json(
+    items: list[BaseModel | dict], fields: tuple[str, ...] | None = None
+) -> str:
+    """
+    Serializes models or dicts to minified JSON for use in a prompt.
+
+    Only the given fields are kept (all fields if None), in the given order, and empty
+    values are dropped.
+    """
+    return json.dumps(
+        [_to_dict(item, fields) for item in items],
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def log_token_savings(label: str, items: list[BaseModel | dict], compact: str) -> None:
+    """
+    Logs the estimated prompt tokens saved by a compact payload compared to the items
+    serialized as full, indented JSON.
+    """
+    verbose = json.dumps(
+        [item.model_dump() if isinstance(item, BaseModel) else item for item in items],
+        indent=2,
+        default=str,
+    )
+    tokens_before, tokens_after = estimate_tokens(verbose), estimate_tokens(compact)
+    logger.info(
+        f"{label}: serialized payload ~{tokens_before} -> ~{tokens_after} tokens "
+        f"({tokens_before - tokens_after} saved)."
+    )
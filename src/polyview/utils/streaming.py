@@ -0,0 +1,20 @@
+from langgraph.config import get_stream_writer
+
+from polyview.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def emit_event(event: dict) -> None:
+    """
+    Writes an event to the graph's "custom" stream. Outside of a graph run (e.g. when a
+    node is called directly) the event is dropped.
+    """
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        logger.debug(
+            f"Not running in a graph, dropping event of type {event.get('type')}."
+        )
+        return
+    writer(event)
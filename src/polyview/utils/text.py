@@ -0,0 +1,76 @@
+import re
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:['’][a-z]+)?")
+_ESTIMATE_PATTERN = re.compile(r"\w+|[^\w\s]")
+_INLINE_WHITESPACE_PATTERN = re.compile(r"[ \t\u00a0]+")
+
+# Small English stopword list, kept local so scoring doesn't need an NLP dependency
+STOPWORDS = frozenset(
+    """
+    a about above after again against all am an and any are as at be because been
+    before being below between both but by can could did do does doing down during
+    each few for from further had has have having he her here hers herself him
+    himself his how i if in into is it its itself just me more most my myself no nor
+    not now of off on once only or other our ours ourselves out over own same she
+    should so some such than that the their theirs them themselves then there these
+    they this those through to too under until up very was we were what when where
+    which while who whom why will with would you your yours yourself yourselves
+    """.split()
+)
+
+# Stopwords that decide which side a text takes ("for" or "against" something, "no" or
+# "not"). Texts that are compared for agreement keep them, see NEUTRAL_STOPWORDS.
+STANCE_WORDS = frozenset({"against", "for", "no", "nor", "not"})
+NEUTRAL_STOPWORDS = STOPWORDS - STANCE_WORDS
+
+# Words that state a direction of change, mapped to "increase" or "decrease", so that
+# paraphrases ("raises", "boosts") compare equal and opposites ("raised", "lowered") don't
+DIRECTION_WORDS = {
+    **dict.fromkeys(
+        """
+        increase increases increased increasing raise raises raised raising rise rises
+        rose risen rising boost boosts boosted boosting grow grows grew grown growing
+        growth gain gains gained gaining higher more improve improves improved
+        improving expand expands expanded expanding up
+        """.split(),
+        "increase",
+    ),
+    **dict.fromkeys(
+        """
+        decrease decreases decreased decreasing lower lowers lowered lowering reduce
+        reduces reduced reducing reduction cut cuts cutting fall falls fell fallen
+        falling decline declines declined declining drop drops dropped dropping shrink
+        shrinks shrank shrinking loss losses lose loses lost less fewer worsen worsens
+        worsened down
+        """.split(),
+        "decrease",
+    ),
+}
+
+
+def tokenize(
+    text: str, remove_stopwords: bool = True, stopwords: frozenset[str] = STOPWORDS
+) -> list[str]:
+    """Lowercases and splits text into word tokens, optionally dropping stopwords."""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if remove_stopwords:
+        return [t for t in tokens if t not in stopwords]
+    return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of LLM tokens in a text without a tokenizer dependency.
+
+    Counts words and punctuation marks, with long words counting as several sub-word
+    pieces. This lands close to ~4 characters per token for English prose.
+    """
+    return sum(1 + len(piece) // 10 for piece in _ESTIMATE_PATTERN.findall(text))
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapses runs of spaces and tabs, trims lines and keeps at most one blank line."""
+    lines = [
+        _INLINE_WHITESPACE_PATTERN.sub(" ", line).strip() for line in text.splitlines()
+    ]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
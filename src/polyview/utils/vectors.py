@@ -0,0 +1,171 @@
+from collections import Counter
+import zlib
+
+import numpy as np
+
+from polyview.utils.text import (
+    DIRECTION_WORDS,
+    NEUTRAL_STOPWORDS,
+    STANCE_WORDS,
+    tokenize,
+)
+
+DEFAULT_N_FEATURES = 2**14
+
+
+def _ngrams(tokens: list[str], ngram_range: tuple[int, int]) -> list[str]:
+    min_n, max_n = ngram_range
+    return [
+        " ".join(tokens[i : i + n])
+        for n in range(min_n, max_n + 1)
+        for i in range(len(tokens) - n + 1)
+    ]
+
+
+def hashed_vectors(
+    texts: list[str],
+    n_features: int = DEFAULT_N_FEATURES,
+    ngram_range: tuple[int, int] = (1, 2),
+    use_idf: bool = True,
+    remove_stopwords: bool = True,
+) -> np.ndarray:
+    """
+    Embeds texts as L2-normalized, hashed word n-gram vectors (the "hashing trick").
+
+    Features are hashed with crc32, so vectors are stable across processes and batches and
+    can be compared with vectors computed earlier. With use_idf, term counts are weighted
+    by an inverse document frequency computed over the given texts. remove_stopwords is
+    passed on to tokenize.
+    """
+    matrix = np.zeros((len(texts), n_features), dtype=np.float32)
+    for row, text in enumerate(texts):
+        features = _ngrams(tokenize(text, remove_stopwords), ngram_range)
+        if features:
+            columns = np.fromiter(
+                (zlib.crc32(f.encode()) % n_features for f in features),
+                dtype=np.int64,
+            )
+            np.add.at(matrix[row], columns, 1)
+
+    if use_idf and len(texts) > 1:
+        doc_frequencies = (matrix > 0).sum(axis=0)
+        idf = np.log((1 + len(texts)) / (1 + doc_frequencies)) + 1
+        matrix *= idf.astype(np.float32)
+
+    return normalize_rows(matrix)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalizes each row, leaving all-zero rows untouched."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Cosine similarity between every row of a and every row of b (rows L2-normalized)."""
+    return a @ b.T
+
+
+def maximal_marginal_relevance(
+    vectors: np.ndarray, relevance: np.ndarray, k: int, diversity: float = 0.3
+) -> list[int]:
+    """
+    Greedily selects k rows that are relevant yet dissimilar to each other.
+
+    Each step picks the row maximizing
+    (1 - diversity) * relevance - diversity * (max similarity to already selected rows).
+    Returns the selected row indices in selection order.
+    """
+    n = len(vectors)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    selected: list[int] = []
+    available = np.ones(n, dtype=bool)
+    max_similarity = np.zeros(n, dtype=np.float32)
+    for _ in range(k):
+        scores = (1 - diversity) * relevance - diversity * max_similarity
+        scores = np.where(available, scores, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        max_similarity = np.maximum(max_similarity, vectors @ vectors[best])
+    return selected
+
+
+def group_similar(vectors: np.ndarray, threshold: float) -> list[list[int]]:
+    """
+    Greedily groups rows whose cosine similarity to a group's first member is at least
+    threshold. Groups and their members keep the original row order.
+    """
+    groups: list[list[int]] = []
+    if not len(vectors):
+        return groups
+
+    similarity = cosine_similarity(vectors, vectors)
+    assigned = np.zeros(len(vectors), dtype=bool)
+    for i in range(len(vectors)):
+        if assigned[i]:
+            continue
+        members = np.flatnonzero(~assigned & (similarity[i] >= threshold))
+        members = members[members >= i]
+        assigned[members] = True
+        groups.append([i, *(int(m) for m in members if m != i)])
+    return groups
+
+
+def _claim_tokens(text: str) -> list[str]:
+    """Tokens of a claim with direction words canonicalized and stance words kept."""
+    tokens = []
+    for token in tokenize(text, remove_stopwords=False):
+        if token.endswith(("n't", "n’t")):
+            token = "not"
+        token = DIRECTION_WORDS.get(token, token)
+        if token not in NEUTRAL_STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def _claim_signature(tokens: list[str]) -> tuple[str, ...]:
+    """The numbers, stance words and directions of a claim, in order."""
+    return tuple(
+        t
+        for t in tokens
+        if t in STANCE_WORDS or t in ("increase", "decrease") or t.isdigit()
+    )
+
+
+def collapse_near_duplicates(texts: list[str], threshold: float) -> dict[str, int]:
+    """
+    Collapses texts whose hashed TF-IDF vectors have a cosine similarity of at least
+    threshold to an earlier text. Returns the first text of every group, in order, with
+    the number of texts it absorbed (including itself).
+
+    Words stating a direction of change are canonicalized first (see DIRECTION_WORDS),
+    so "boosts" and "increases" match. Texts are only collapsed if they agree on their
+    numbers, stance words ("for", "not") and directions, so a claim never absorbs its
+    opposite, however similar the rest of the sentence is.
+    """
+    exact_counts = Counter(t for t in texts if t.strip())
+    unique_texts = list(exact_counts)
+    if not unique_texts:
+        return {}
+
+    claims = [_claim_tokens(text) for text in unique_texts]
+    by_signature: dict[tuple[str, ...], list[int]] = {}
+    for i, tokens in enumerate(claims):
+        by_signature.setdefault(_claim_signature(tokens), []).append(i)
+
+    vectors = hashed_vectors(
+        [" ".join(tokens) for tokens in claims], remove_stopwords=False
+    )
+    groups = sorted(
+        [indices[j] for j in group]
+        for indices in by_signature.values()
+        for group in group_similar(vectors[indices], threshold)
+    )
+    return {
+        unique_texts[group[0]]: sum(exact_counts[unique_texts[i]] for i in group)
+        for group in groups
+    }
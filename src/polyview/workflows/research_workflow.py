@@ -1,30 +1,39 @@
 from typing import Literal
 
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph
 
 from polyview.agents.search_agent import run_search_agent
 from polyview.core.logging import get_logger
-from polyview.core.state import State
+from polyview.core.profiles import get_run_profile
+from polyview.core.state import CycleNovelty, State
+from polyview.tasks.article_preprocessing import article_preprocessing_node
+from polyview.tasks.article_selection import article_selection_node
 from polyview.tasks.perspective_clustering import perspective_clustering_node
 from polyview.tasks.perspective_identification import perspective_identification
 from polyview.tasks.perspective_synthesis import perspective_synthesis_node
+from polyview.tasks.pipelined_search import pipelined_search_node
+from polyview.tasks.relevance_filter import relevance_filter_node
+from polyview.tasks.speculative_prefetch import prefetch_searches_node
 from polyview.utils.helper import print_state_node
+from polyview.utils.messages import messages_to_remove
 
 logger = get_logger(__name__)
 
-MAX_ITERATIONS = 2
-MIN_ARTICLES_TO_SUMMARIZE = 3
-MIN_PERSPECTIVES_TO_SUMMARIZE = 2
 
-
-def research_supervisor_node(state: State) -> dict:
+def research_supervisor_node(
+    state: State, config: RunnableConfig | None = None
+) -> dict:
     """
     Manages the high-level research loop.
 
     Responsibilities:
     1.  On the first run, it initializes the state with the user's topic.
-    2.  On subsequent runs, it increments the iteration counter to track progress.
+    2.  On subsequent runs, it increments the iteration counter to track progress and
+        records the novelty of the cycle that just finished. It also removes all but the
+        latest messages (see RunProfile.message_retention), so the state does not grow
+        with every cycle.
     """
     iteration = state.get("iteration", 0)
 
@@ -39,38 +48,77 @@ def research_supervisor_node(state: State) -> dict:
             "messages": [AIMessage(content=f"Starting research for '{topic}'.")],
         }
 
+    cycle_novelty = state.get("cycle_novelty") or CycleNovelty()
+    if isinstance(cycle_novelty, dict):
+        cycle_novelty = CycleNovelty.model_validate(cycle_novelty)
+    novelty = round(cycle_novelty.score, 3)
+    logger.info(
+        f"Research cycle {iteration} novelty: {novelty} "
+        f"({cycle_novelty.new_clusters}/{cycle_novelty.total_clusters} new clusters, "
+        f"{cycle_novelty.new_arguments}/{cycle_novelty.total_arguments} new arguments)."
+    )
+
+    # Leave room for the message added below
+    retention = get_run_profile(config).message_retention
+    removed_messages = messages_to_remove(state.get("messages") or [], retention - 1)
+    if removed_messages:
+        logger.debug(f"Removing {len(removed_messages)} old message(s) from the state.")
+
     iteration += 1
     logger.info(f"Beginning research cycle {iteration}.")
     return {
         "iteration": iteration,
-        "messages": [AIMessage(content=f"Running research cycle {iteration}...")],
+        "novelty": novelty,
+        "messages": [
+            *removed_messages,
+            AIMessage(content=f"Running research cycle {iteration}..."),
+        ],
     }
 
 
-def decide_what_to_do(state: State) -> Literal["search_agent", "debug_state"]:
+def decide_what_to_do(
+    state: State, config: RunnableConfig | None = None
+) -> Literal["search_agent", "pipelined_search", "debug_state"]:
     """
     Decision point for the graph.
 
     This function evaluates the current state to decide whether to continue
     gathering data ("query_generation") or to proceed with summarizing the findings.
+    The limits come from the run profile in the graph config, which also selects the
+    pipelined search, where extraction overlaps with the search.
     """
+    profile = get_run_profile(config)
     iteration = state["iteration"]
     raw_articles = state.get("raw_articles", [])
     perspectives = state.get("final_perspectives", [])
 
     logger.info(
         f"Decision point: Iteration: {iteration}, "
-        f"Articles: {len(raw_articles)} (need {MIN_ARTICLES_TO_SUMMARIZE}), "
-        f"Perspectives: {len(perspectives)} (need {MIN_PERSPECTIVES_TO_SUMMARIZE})"
+        f"Articles: {len(raw_articles)} (need {profile.min_articles_to_summarize}), "
+        f"Perspectives: {len(perspectives)} (need {profile.min_perspectives_to_summarize})"
     )
 
-    if iteration > MAX_ITERATIONS:
+    if iteration > profile.max_iterations:
         logger.info("Decision: Max iterations reached. Continuing.")
         return "debug_state"
 
+    if len(state.get("processed_article_ids", [])) >= profile.article_budget:
+        logger.info("Decision: Article budget exhausted. Continuing.")
+        return "debug_state"
+
+    novelty = state.get("novelty")
+    if iteration > 1 and novelty is not None and novelty < profile.min_novelty:
+        logger.info(
+            f"Decision: Research saturated (novelty {novelty} < {profile.min_novelty}). "
+            f"Continuing."
+        )
+        return "debug_state"
+
     if iteration > 1:
-        has_enough_articles = len(raw_articles) >= MIN_ARTICLES_TO_SUMMARIZE
-        has_enough_perspectives = len(perspectives) >= MIN_PERSPECTIVES_TO_SUMMARIZE
+        has_enough_articles = len(raw_articles) >= profile.min_articles_to_summarize
+        has_enough_perspectives = (
+            len(perspectives) >= profile.min_perspectives_to_summarize
+        )
 
         if has_enough_articles and has_enough_perspectives:
             logger.info(
@@ -79,15 +127,20 @@ def decide_what_to_do(state: State) -> Literal["search_agent", "debug_state"]:
             return "debug_state"
 
     logger.info("Decision: More data or perspectives needed. Continuing research.")
-    return "search_agent"
+    return "pipelined_search" if profile.pipelined else "search_agent"
 
 
 workflow = StateGraph(State)
 workflow.add_node("supervisor", research_supervisor_node)
 workflow.add_node("search_agent", run_search_agent)
+workflow.add_node("pipelined_search", pipelined_search_node)
+workflow.add_node("relevance_filter", relevance_filter_node)
+workflow.add_node("article_selection", article_selection_node)
+workflow.add_node("article_preprocessing", article_preprocessing_node)
 workflow.add_node("perspective_identification", perspective_identification)
 workflow.add_node("perspective_clustering", perspective_clustering_node)
 workflow.add_node("perspective_synthesis", perspective_synthesis_node)
+workflow.add_node("prefetch_searches", prefetch_searches_node)
 workflow.add_node("debug_state", print_state_node)
 
 
@@ -97,13 +150,22 @@ workflow.add_conditional_edges(
     decide_what_to_do,
     {
         "search_agent": "search_agent",
+        "pipelined_search": "pipelined_search",
         "debug_state": "debug_state",
     },
 )
-workflow.add_edge("search_agent", "perspective_identification")
+workflow.add_edge("search_agent", "relevance_filter")
+workflow.add_edge("relevance_filter", "article_selection")
+workflow.add_edge("article_selection", "article_preprocessing")
+workflow.add_edge("article_preprocessing", "perspective_identification")
 workflow.add_edge("perspective_identification", "perspective_clustering")
+# The pipelined search already filtered, preprocessed and extracted its articles
+workflow.add_edge("pipelined_search", "perspective_clustering")
 workflow.add_edge("perspective_clustering", "perspective_synthesis")
-workflow.add_edge("perspective_synthesis", "supervisor")
+# The next cycle's searches are prefetched while clustering and synthesis run
+workflow.add_edge("perspective_identification", "prefetch_searches")
+workflow.add_edge("pipelined_search", "prefetch_searches")
+workflow.add_edge(["perspective_synthesis", "prefetch_searches"], "supervisor")
 workflow.set_finish_point("debug_state")
 
 graph = workflow.compile()
@@ -0,0 +1,137 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+import pytest
+
+from polyview.api.main import app
+from polyview.api.routes import analysis
+from polyview.core.article_store import ArticleStore
+from polyview.core.profiles import RunProfile
+from polyview.core.usage import UsageAccountant
+from polyview.tasks.perspective_preview import PreviewPerspective
+
+
+@pytest.fixture
+def checkpointed_graph(monkeypatch):
+    graph = MagicMock()
+    graph.aget_state = AsyncMock(
+        return_value=MagicMock(
+            values={"topic": "rent control"}, metadata={"profile": {}}
+        )
+    )
+    monkeypatch.setattr(app.state, "research_graph", graph, raising=False)
+    monkeypatch.setattr(analysis, "queued_sessions", set())
+    monkeypatch.setattr(analysis, "running_sessions", set())
+    monkeypatch.setattr(analysis, "active_connections", {})
+    monkeypatch.setattr(analysis, "session_message_queues", {})
+    return graph
+
+
+@patch("polyview.api.routes.analysis.run_analysis_workflow", new_callable=AsyncMock)
+def test_resume_starts_workflow(mock_run, checkpointed_graph):
+    response = TestClient(app).post("/api/v1/resume/session-1")
+
+    assert response.status_code == 200
+    assert response.json()["session_id"] == "session-1"
+    mock_run.assert_awaited_once()
+    assert mock_run.call_args.args[0] == "session-1"
+    assert mock_run.call_args.args[-1] is True
+
+
+@patch("polyview.api.routes.analysis.run_analysis_workflow", new_callable=AsyncMock)
+def test_resume_rejects_running_session_without_clients(mock_run, checkpointed_graph):
+    # The last client disconnected, but the run goes on
+    analysis.running_sessions.add("session-1")
+
+    response = TestClient(app).post("/api/v1/resume/session-1")
+
+    assert response.status_code == 409
+    mock_run.assert_not_called()
+
+
+def test_summarize_rejects_unknown_perspective_shape():
+    response = TestClient(app).post(
+        "/api/v1/summarize", json={"final_perspectives": [{"name": "Tenants"}]}
+    )
+
+    assert response.status_code == 422
+
+
+ARTICLE = {"id": "a1", "url": "https://example.com/a1", "content": "Rents rose."}
+
+
+class _SearchOnlyGraph:
+    """Finds articles, then waits for the preview before finishing like the real graph."""
+
+    def __init__(self, preview_sent: asyncio.Event, pipelined: bool = False):
+        self.preview_sent = preview_sent
+        self.pipelined = pipelined
+
+    async def astream(self, workflow_input, config, stream_mode):
+        store = ArticleStore("session-1")
+        if self.pipelined:
+            # Pipelined search never stores the content and sends it along instead
+            yield "custom", {"type": "articles", "articles": [ARTICLE]}
+            yield "updates", {"pipelined_search": {"raw_articles": [ARTICLE["id"]]}}
+        else:
+            article = store.put(ARTICLE)
+            yield "updates", {"search_agent": {"raw_articles": [article]}}
+            # The next nodes release the content before the preview task runs
+            store.release([ARTICLE["id"]])
+        await asyncio.wait_for(self.preview_sent.wait(), timeout=1)
+        yield "updates", {"perspective_synthesis": {"final_perspectives": []}}
+
+
+async def _no_summary(*args, **kwargs):
+    return
+    yield
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+@patch.object(UsageAccountant, "record")
+@patch("polyview.api.routes.analysis.summarization_workflow")
+@patch("polyview.api.routes.analysis.generate_preview", new_callable=AsyncMock)
+def test_workflow_sends_preview_and_records_time_to_first_insight(
+    mock_preview, mock_summarization, mock_record, monkeypatch, pipelined
+):
+    monkeypatch.setattr(analysis, "session_message_queues", {})
+    mock_summarization.astream = _no_summary
+    previews_before = (
+        REGISTRY.get_sample_value("polyview_time_to_first_insight_seconds_count") or 0.0
+    )
+
+    async def run():
+        preview_sent = asyncio.Event()
+
+        async def preview(*args, **kwargs):
+            preview_sent.set()
+            return [PreviewPerspective(perspective_name="A", summary="About A")]
+
+        mock_preview.side_effect = preview
+        queue = asyncio.Queue()
+        analysis.session_message_queues["session-1"] = queue
+        await analysis.run_analysis_workflow(
+            "session-1",
+            "rent control",
+            RunProfile(),
+            _SearchOnlyGraph(preview_sent, pipelined),
+        )
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    events = asyncio.run(run())
+
+    [preview] = [
+        e["data"]
+        for e in events
+        if e["type"] == "partial_result" and e["data"]["type"] == "preview"
+    ]
+    assert preview["perspectives"] == [{"perspective_name": "A", "summary": "About A"}]
+    assert preview["time_to_first_insight"] >= 0
+    assert mock_preview.call_args.args[:2] == ("rent control", [ARTICLE])
+    assert events[-1] == {"type": "end_of_stream"}
+    assert (
+        REGISTRY.get_sample_value("polyview_time_to_first_insight_seconds_count")
+        == previews_before + 1
+    )
@@ -0,0 +1,16 @@
+from fastapi.testclient import TestClient
+
+from polyview.api.main import app
+from polyview.api.routes import analysis
+
+
+def test_metrics_endpoint_reports_sessions(monkeypatch):
+    monkeypatch.setattr(analysis, "queued_sessions", {"session-1"})
+    monkeypatch.setattr(analysis, "running_sessions", set())
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'polyview_sessions{state="queued"} 1.0' in response.text
+    assert "polyview_websocket_subscribers" in response.text
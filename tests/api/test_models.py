@@ -0,0 +1,61 @@
+from pydantic import ValidationError
+import pytest
+
+from polyview.api.models import PerspectiveUpdate, SummarizeRequest
+from polyview.core.state import FinalPerspective
+
+
+def test_perspective_update_is_keyed_by_perspective_name():
+    perspective = FinalPerspective(
+        perspective_name="Tenant protection",
+        narrative="Rent control protects tenants.",
+        core_arguments=["Stable rents"],
+        supporting_evidence=["Study A", "Study B"],
+        common_assumptions=[],
+        strengths=["Well-sourced"],
+        weaknesses=[],
+        rated_perspective_strength=4,
+    )
+
+    update = PerspectiveUpdate.from_final_perspective(perspective)
+
+    assert update.id == update.title == "Tenant protection"
+    assert update.summary == "Rent control protects tenants."
+    assert [e.id for e in update.evidence] == [
+        "Tenant protection-evidence-0",
+        "Tenant protection-evidence-1",
+    ]
+
+
+def test_summarize_request_maps_client_perspectives_to_summary_fields():
+    request = SummarizeRequest.model_validate(
+        {
+            "final_perspectives": [
+                {
+                    "id": "Tenant protection",
+                    "title": "Tenant protection",
+                    "summary": "Rent control protects tenants.",
+                    "evidence": [
+                        {"id": "e-0", "statement": "Study A", "source": "example.com"}
+                    ],
+                    "rated_perspective_strength": 4,
+                }
+            ]
+        }
+    )
+
+    assert request.summary_input() == [
+        {
+            "perspective_name": "Tenant protection",
+            "narrative": "Rent control protects tenants.",
+            "supporting_evidence": ["Study A"],
+            "strengths": [],
+            "weaknesses": [],
+            "rated_perspective_strength": 4,
+        }
+    ]
+
+
+def test_summarize_request_rejects_unknown_perspective_shape():
+    with pytest.raises(ValidationError):
+        SummarizeRequest.model_validate({"final_perspectives": [{"name": "Tenants"}]})
@@ -1,3 +1,13 @@
 from dotenv import load_dotenv
+import pytest
 
 load_dotenv()
+
+
+@pytest.fixture(autouse=True)
+def article_store_dir(tmp_path, monkeypatch):
+    """Keeps article content written by the nodes under test in a temporary directory."""
+    monkeypatch.setattr(
+        "polyview.core.article_store.ARTICLE_STORE_DIR", tmp_path / "articles"
+    )
+    return tmp_path / "articles"
@@ -0,0 +1,67 @@
+from polyview.core.article_store import (
+    DEFAULT_SESSION,
+    ArticleStore,
+    get_article_store,
+)
+
+
+def test_put_moves_content_to_store():
+    store = ArticleStore("session-1")
+    article = {"id": "a", "url": "http://a.com", "content": "Full text."}
+
+    stored = store.put(article)
+
+    assert stored == {"id": "a", "url": "http://a.com"}
+    assert store.get_content("a") == "Full text."
+    assert store.load(stored) == article
+
+
+def test_put_without_content_is_noop():
+    store = ArticleStore("session-1")
+    article = {"id": "a", "url": "http://a.com"}
+
+    assert store.put(article) is article
+    assert not store.path.exists()
+
+
+def test_load_keeps_existing_content():
+    store = ArticleStore("session-1")
+    store.put({"id": "a", "url": "http://a.com", "content": "Stored."})
+
+    article = {"id": "a", "url": "http://a.com", "content": "In memory."}
+    assert store.load(article)["content"] == "In memory."
+
+
+def test_missing_content_loads_empty():
+    assert ArticleStore("session-1").load({"id": "missing"})["content"] == ""
+
+
+def test_release_and_clear():
+    store = ArticleStore("session-1")
+    store.put_many(
+        [
+            {"id": "a", "url": "http://a.com", "content": "A"},
+            {"id": "b", "url": "http://b.com", "content": "B"},
+        ]
+    )
+
+    store.release(["a"])
+    assert store.get_content("a") == ""
+    assert store.get_content("b") == "B"
+
+    store.clear()
+    assert not store.path.exists()
+
+
+def test_sessions_are_isolated():
+    ArticleStore("session-1").put({"id": "a", "url": "u", "content": "One"})
+    ArticleStore("session-2").put({"id": "a", "url": "u", "content": "Two"})
+
+    assert ArticleStore("session-1").get_content("a") == "One"
+    assert ArticleStore("session-2").get_content("a") == "Two"
+
+
+def test_get_article_store_uses_thread_id():
+    config = {"configurable": {"thread_id": "session-1"}}
+    assert get_article_store(config).path.name == "session-1"
+    assert get_article_store(None).path.name == DEFAULT_SESSION
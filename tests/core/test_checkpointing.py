@@ -0,0 +1,150 @@
+import asyncio
+from datetime import timedelta
+from typing import TypedDict
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from polyview.core.checkpointing import compact_checkpoints, open_checkpointer
+from polyview.core.state import (
+    ConsolidatedPerspective,
+    CycleNovelty,
+    FinalPerspective,
+    RawArticle,
+    State,
+)
+
+
+class CounterState(TypedDict):
+    count: int
+
+
+def _increment(state: CounterState) -> dict:
+    return {"count": state["count"] + 1}
+
+
+def _build_graph(saver):
+    graph = StateGraph(CounterState)
+    graph.add_node("first", _increment)
+    graph.add_node("second", _increment)
+    graph.add_edge(START, "first")
+    graph.add_edge("first", "second")
+    graph.add_edge("second", END)
+    return graph.compile(checkpointer=saver)
+
+
+async def _run_and_compact(db_path: str, retention: timedelta):
+    async with open_checkpointer(db_path) as saver:
+        graph = _build_graph(saver)
+        config = {"configurable": {"thread_id": "session-1"}}
+        await graph.ainvoke({"count": 0}, config)
+        checkpoints_before = [c async for c in saver.alist(config)]
+
+        result = await compact_checkpoints(saver, retention)
+
+        checkpoints_after = [c async for c in saver.alist(config)]
+        state = await graph.aget_state(config)
+    return result, checkpoints_before, checkpoints_after, state
+
+
+def test_compaction_keeps_only_latest_checkpoint(tmp_path):
+    db_path = str(tmp_path / "checkpoints.db")
+    (expired, deleted), before, after, state = asyncio.run(
+        _run_and_compact(db_path, timedelta(days=1))
+    )
+
+    assert expired == 0
+    assert len(before) > 1
+    assert deleted == len(before) - 1
+    assert len(after) == 1
+    assert after[0].config == before[0].config
+    assert state.values == {"count": 2}
+
+
+def test_compaction_deletes_expired_sessions(tmp_path):
+    db_path = str(tmp_path / "checkpoints.db")
+    (expired, _), _, after, state = asyncio.run(_run_and_compact(db_path, timedelta(0)))
+
+    assert expired == 1
+    assert after == []
+    assert not state.values
+
+
+def test_interrupted_run_resumes_from_last_checkpoint(tmp_path):
+    db_path = str(tmp_path / "checkpoints.db")
+
+    async def run():
+        async with open_checkpointer(db_path) as saver:
+            graph = _build_graph(saver)
+            config = {"configurable": {"thread_id": "session-1"}}
+            # Stop after the first node, as if the run had been interrupted
+            async for _ in graph.astream(
+                {"count": 0}, config, interrupt_after=["first"]
+            ):
+                pass
+            interrupted = await graph.aget_state(config)
+            resumed = await graph.ainvoke(None, config)
+        return interrupted, resumed
+
+    interrupted, resumed = asyncio.run(run())
+
+    assert interrupted.next == ("second",)
+    assert interrupted.values == {"count": 1}
+    assert resumed == {"count": 2}
+
+
+def test_research_state_round_trips_through_saver(tmp_path):
+    db_path = str(tmp_path / "checkpoints.db")
+    consolidated = ConsolidatedPerspective(
+        perspective_name="Tenant advocates",
+        aggregated_arguments=["Rent control keeps housing affordable."],
+        aggregated_narratives=["Tenants are priced out."],
+        supporting_evidence=["Rents rose 30% in five years."],
+        preliminary_synthesis="Rent control protects tenants.",
+        argument_counts={"Rent control keeps housing affordable.": 2},
+    )
+    final = FinalPerspective(
+        perspective_name="Tenant advocates",
+        narrative="Rent control protects tenants.",
+        core_arguments=["Rent control keeps housing affordable."],
+        supporting_evidence=["Rents rose 30% in five years."],
+        common_assumptions=["Housing is a right."],
+        strengths=["Backed by rent data."],
+        weaknesses=["Ignores supply effects."],
+        rated_perspective_strength=4,
+    )
+
+    def synthesize(state: State) -> dict:
+        # Node updates are also stored in the checkpoint metadata
+        return {
+            "raw_articles": [RawArticle(id="a1", url="https://example.com/a1")],
+            "consolidated_perspectives": [consolidated],
+            "final_perspectives": [final],
+            "synthesis_cache": {"fingerprint": final},
+            "cycle_novelty": CycleNovelty(new_clusters=1, total_clusters=1),
+            "messages": [AIMessage(content="Synthesis done.")],
+        }
+
+    async def run():
+        async with open_checkpointer(db_path) as saver:
+            graph = StateGraph(State)
+            graph.add_node("perspective_synthesis", synthesize)
+            graph.add_edge(START, "perspective_synthesis")
+            graph.add_edge("perspective_synthesis", END)
+            graph = graph.compile(checkpointer=saver)
+            config = {"configurable": {"thread_id": "session-1"}}
+            await graph.ainvoke({"topic": "rent control"}, config)
+
+        # Read back through a new connection, as after a restart
+        async with open_checkpointer(db_path) as saver:
+            return await saver.aget_tuple({"configurable": {"thread_id": "session-1"}})
+
+    values = asyncio.run(run()).checkpoint["channel_values"]
+
+    assert values["topic"] == "rent control"
+    assert values["raw_articles"] == [RawArticle(id="a1", url="https://example.com/a1")]
+    assert values["consolidated_perspectives"] == [consolidated]
+    assert values["final_perspectives"] == [final]
+    assert values["synthesis_cache"] == {"fingerprint": final}
+    assert values["cycle_novelty"] == CycleNovelty(new_clusters=1, total_clusters=1)
+    assert values["messages"][0].content == "Synthesis done."
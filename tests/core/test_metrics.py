@@ -0,0 +1,101 @@
+from typing import TypedDict
+
+from google.api_core.exceptions import ResourceExhausted
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+from prometheus_client import REGISTRY
+
+from polyview.core.metrics import record_cache_lookups
+from polyview.utils.retry import gemini_api_delayed_retry
+
+MODEL = "FakeMessagesListChatModel"
+
+
+class AnswerState(TypedDict):
+    answer: str
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _build_graph():
+    model = FakeMessagesListChatModel(
+        responses=[
+            AIMessage(
+                content="An answer.",
+                usage_metadata={
+                    "input_tokens": 12,
+                    "output_tokens": 3,
+                    "total_tokens": 15,
+                },
+            )
+        ]
+    )
+    failures = [ResourceExhausted("Quota exceeded.")]
+
+    @gemini_api_delayed_retry(max_retries=3, fallback_delay_seconds=0)
+    def call_model():
+        if failures:
+            raise failures.pop()
+        return model.invoke("A question.")
+
+    graph = StateGraph(AnswerState)
+    graph.add_node("respond", lambda state: {"answer": call_model().content})
+    graph.add_edge(START, "respond")
+    graph.add_edge("respond", END)
+    return graph.compile()
+
+
+def test_graph_runs_update_metrics():
+    node_runs = _sample(
+        "polyview_node_duration_seconds_count", node="respond", status="ok"
+    )
+    llm_calls = _sample(
+        "polyview_llm_calls_total", model=MODEL, node="respond", status="ok"
+    )
+    input_tokens = _sample(
+        "polyview_llm_tokens_total", model=MODEL, node="respond", direction="input"
+    )
+    retries = _sample(
+        "polyview_llm_rate_limit_retries_total", model="None", node="respond"
+    )
+
+    _build_graph().invoke({"answer": ""})
+
+    assert (
+        _sample("polyview_node_duration_seconds_count", node="respond", status="ok")
+        == node_runs + 1
+    )
+    assert (
+        _sample("polyview_llm_calls_total", model=MODEL, node="respond", status="ok")
+        == llm_calls + 1
+    )
+    assert (
+        _sample(
+            "polyview_llm_tokens_total",
+            model=MODEL,
+            node="respond",
+            direction="input",
+        )
+        == input_tokens + 12
+    )
+    assert (
+        _sample("polyview_llm_rate_limit_retries_total", model="None", node="respond")
+        == retries + 1
+    )
+
+
+def test_record_cache_lookups():
+    hits = _sample("polyview_cache_lookups_total", cache="test", result="hit")
+    misses = _sample("polyview_cache_lookups_total", cache="test", result="miss")
+
+    record_cache_lookups("test", hits=2, misses=1)
+
+    assert _sample("polyview_cache_lookups_total", cache="test", result="hit") == (
+        hits + 2
+    )
+    assert _sample("polyview_cache_lookups_total", cache="test", result="miss") == (
+        misses + 1
+    )
@@ -0,0 +1,62 @@
+from pydantic import ValidationError
+import pytest
+
+from polyview.api.models import AnalysisRequest
+from polyview.core.profiles import (
+    PROFILE_PRESETS,
+    RunProfile,
+    get_run_profile,
+    resolve_profile,
+)
+
+
+class TestResolveProfile:
+    def test_returns_preset_without_overrides(self):
+        assert resolve_profile("quick") is PROFILE_PRESETS["quick"]
+
+    def test_applies_overrides_on_top_of_preset(self):
+        profile = resolve_profile("deep", {"max_iterations": 1})
+        assert profile.max_iterations == 1
+        assert profile.article_budget == PROFILE_PRESETS["deep"].article_budget
+
+    def test_rejects_unknown_profile(self):
+        with pytest.raises(ValueError, match="Unknown profile"):
+            resolve_profile("exhaustive")
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"max_iterations": 0},
+            {"unknown_knob": 1},
+            {"min_initial_search_queries": 4, "max_initial_search_queries": 2},
+        ],
+    )
+    def test_rejects_invalid_overrides(self, overrides):
+        with pytest.raises(ValidationError):
+            resolve_profile("standard", overrides)
+
+
+class TestGetRunProfile:
+    def test_defaults_to_standard_profile(self):
+        assert get_run_profile(None) == RunProfile()
+        assert get_run_profile({"configurable": {}}) == RunProfile()
+
+    def test_accepts_profile_names_and_instances(self):
+        assert (
+            get_run_profile({"configurable": {"profile": "quick"}}).max_iterations == 1
+        )
+        profile = RunProfile(article_budget=4)
+        assert get_run_profile({"configurable": {"profile": profile}}) is profile
+
+
+class TestAnalysisRequest:
+    def test_resolves_profile_with_overrides(self):
+        request = AnalysisRequest(
+            topic="rent control", profile="quick", overrides={"article_budget": 3}
+        )
+        assert request.run_profile().article_budget == 3
+        assert request.run_profile().extraction_profile == "fast"
+
+    def test_invalid_overrides_fail_validation(self):
+        with pytest.raises(ValidationError):
+            AnalysisRequest(topic="rent control", overrides={"article_budget": -1})
@@ -0,0 +1,112 @@
+import json
+from typing import TypedDict
+
+from google.api_core.exceptions import ResourceExhausted
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+import pytest
+
+from polyview.core.tracing import TracingCallbackHandler, trace_id_for
+from polyview.utils.retry import gemini_api_delayed_retry
+
+
+class AnswerState(TypedDict):
+    answer: str
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    return tmp_path / "traces.jsonl"
+
+
+def _read_spans(trace_file) -> dict[str, dict]:
+    spans = {}
+    for line in trace_file.read_text().splitlines():
+        for resource_spans in json.loads(line)["resourceSpans"]:
+            for scope_spans in resource_spans["scopeSpans"]:
+                for span in scope_spans["spans"]:
+                    spans[span["name"]] = span
+    return spans
+
+
+def _attributes(span: dict) -> dict:
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+def _build_graph():
+    model = FakeMessagesListChatModel(
+        responses=[
+            AIMessage(
+                content="An answer.",
+                usage_metadata={
+                    "input_tokens": 12,
+                    "output_tokens": 3,
+                    "total_tokens": 15,
+                },
+            )
+        ]
+    )
+    failures = [ResourceExhausted("Quota exceeded.")]
+
+    @gemini_api_delayed_retry(max_retries=3, fallback_delay_seconds=0)
+    def call_model():
+        if failures:
+            raise failures.pop()
+        return model.invoke("A question.")
+
+    graph = StateGraph(AnswerState)
+    graph.add_node("respond", lambda state: {"answer": call_model().content})
+    graph.add_edge(START, "respond")
+    graph.add_edge("respond", END)
+    return graph.compile()
+
+
+def test_records_nested_spans_for_session(trace_file):
+    tracer = TracingCallbackHandler(path=str(trace_file), endpoint=None)
+    config = {"configurable": {"thread_id": "session-1"}, "callbacks": [tracer]}
+
+    _build_graph().invoke({"answer": ""}, config)
+
+    spans = _read_spans(trace_file)
+    graph_span, node_span = spans["LangGraph"], spans["respond"]
+    llm_span, retry_span = spans["llm FakeMessagesListChatModel"], spans["retry_wait"]
+
+    assert {s["traceId"] for s in spans.values()} == {trace_id_for("session-1")}
+    assert "parentSpanId" not in graph_span
+    assert node_span["parentSpanId"] == graph_span["spanId"]
+    assert llm_span["parentSpanId"] == node_span["spanId"]
+    assert retry_span["parentSpanId"] == node_span["spanId"]
+
+    assert _attributes(graph_span)["session.id"] == "session-1"
+    assert _attributes(llm_span)["gen_ai.usage.input_tokens"] == "12"
+    assert _attributes(llm_span)["gen_ai.usage.output_tokens"] == "3"
+    assert _attributes(retry_span)["retry.attempt"] == "1"
+
+
+def test_records_errors(trace_file):
+    tracer = TracingCallbackHandler(path=str(trace_file), endpoint=None)
+
+    def fail(state):
+        raise ValueError("boom")
+
+    graph = StateGraph(AnswerState)
+    graph.add_node("fail", fail)
+    graph.add_edge(START, "fail")
+    graph.add_edge("fail", END)
+
+    with pytest.raises(ValueError, match="boom"):
+        graph.compile().invoke({"answer": ""}, {"callbacks": [tracer]})
+
+    span = _read_spans(trace_file)["fail"]
+    assert span["status"]["message"] == "ValueError: boom"
+
+
+def test_record_span_is_exported_on_flush(trace_file):
+    tracer = TracingCallbackHandler(path=str(trace_file), endpoint=None)
+    tracer.record_span("queue_wait", "session-1", 1_000, 2_000, {"message.type": "x"})
+    tracer.flush()
+
+    span = _read_spans(trace_file)["queue_wait"]
+    assert span["traceId"] == trace_id_for("session-1")
+    assert span["endTimeUnixNano"] == "2000"
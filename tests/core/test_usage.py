@@ -0,0 +1,137 @@
+import asyncio
+import json
+from typing import TypedDict
+
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+import pytest
+
+from polyview.core.usage import (
+    ModelPrice,
+    UsageAccountant,
+    load_model_prices,
+    queue_usage_updates,
+)
+
+MODEL = "FakeMessagesListChatModel"
+
+
+class AnswerState(TypedDict):
+    answer: str
+
+
+def _fake_model(calls: int = 1):
+    return FakeMessagesListChatModel(
+        responses=[
+            AIMessage(
+                content="An answer.",
+                usage_metadata={
+                    "input_tokens": 1000,
+                    "output_tokens": 200,
+                    "total_tokens": 1200,
+                },
+            )
+        ]
+        * calls
+    )
+
+
+def _build_graph(model):
+    # The inner node's call is attributed to the outer node that runs the subgraph
+    subgraph = StateGraph(AnswerState)
+    subgraph.add_node("inner", lambda state: {"answer": model.invoke("Q").content})
+    subgraph.add_edge(START, "inner")
+    subgraph.add_edge("inner", END)
+    subgraph = subgraph.compile()
+
+    graph = StateGraph(AnswerState)
+    graph.add_node("outer", lambda state, config: subgraph.invoke(state, config))
+    graph.add_node("respond", lambda state: {"answer": model.invoke("Q").content})
+    graph.add_edge(START, "outer")
+    graph.add_edge("outer", "respond")
+    graph.add_edge("respond", END)
+    return graph.compile()
+
+
+@pytest.fixture
+def prices():
+    return {MODEL: ModelPrice(input_per_million=1.0, output_per_million=10.0)}
+
+
+def test_attributes_usage_to_nodes_and_models(prices):
+    updates = []
+    accountant = UsageAccountant(
+        "session-1", "rent control", on_update=updates.append, prices=prices
+    )
+
+    _build_graph(_fake_model(2)).invoke({"answer": ""}, {"callbacks": [accountant]})
+
+    totals = accountant.totals()
+    assert totals.calls == 2
+    assert totals.input_tokens == 2000
+    assert totals.output_tokens == 400
+    assert totals.cost_usd == pytest.approx(2 * (0.001 + 0.002))
+    assert {(e.node, e.model, e.calls) for e in totals.entries} == {
+        ("outer", MODEL, 1),
+        ("respond", MODEL, 1),
+    }
+    assert [u.calls for u in updates] == [1, 2]
+
+
+def test_unpriced_models_cost_nothing():
+    accountant = UsageAccountant("session-1", "rent control", prices={})
+    _fake_model().invoke("Q", {"callbacks": [accountant]})
+
+    totals = accountant.totals()
+    assert totals.input_tokens == 1000
+    assert totals.cost_usd == 0
+    assert totals.entries[0].node == "none"
+
+
+def test_record_appends_totals(tmp_path, prices):
+    log_path = tmp_path / "usage.jsonl"
+    accountant = UsageAccountant("session-1", "rent control", prices=prices)
+    _fake_model().invoke("Q", {"callbacks": [accountant]})
+
+    accountant.record(str(log_path), status="completed")
+    accountant.record(str(log_path), status="completed")
+
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert len(records) == 2
+    assert records[0]["session_id"] == "session-1"
+    assert records[0]["topic"] == "rent control"
+    assert records[0]["status"] == "completed"
+    assert records[0]["output_tokens"] == 200
+
+
+def test_load_model_prices_applies_overrides(tmp_path):
+    prices_path = tmp_path / "prices.json"
+    prices_path.write_text(
+        json.dumps(
+            {"gemini-2.5-flash": {"input_per_million": 1, "output_per_million": 2}}
+        )
+    )
+
+    prices = load_model_prices(str(prices_path))
+
+    assert prices["gemini-2.5-flash"].output_per_million == 2
+    assert "gemini-2.5-flash-lite-preview-06-17" in prices
+
+
+def test_queue_usage_updates_sends_status_events(prices):
+    async def run():
+        queue = asyncio.Queue()
+        accountant = UsageAccountant(
+            "session-1",
+            "rent control",
+            on_update=queue_usage_updates(queue),
+            prices=prices,
+        )
+        await _fake_model().ainvoke("Q", {"callbacks": [accountant]})
+        return await asyncio.wait_for(queue.get(), timeout=1)
+
+    event = asyncio.run(run())
+    assert event["type"] == "status"
+    assert event["usage"]["input_tokens"] == 1000
+    assert "entries" not in event["usage"]
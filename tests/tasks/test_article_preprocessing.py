@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+from polyview.tasks.article_preprocessing import (
+    article_preprocessing_node,
+    fit_to_token_budget,
+    preprocess_article,
+    strip_boilerplate,
+)
+from polyview.utils.text import estimate_tokens
+
+
+class TestStripBoilerplate:
+    def test_removes_navigation_and_repeated_lines(self):
+        text = (
+            "Skip to content\n"
+            "Home\n"
+            "Menu\n\n"
+            "Cities   are testing   congestion pricing to cut traffic.\n\n"
+            "Subscribe to our newsletter\n"
+            "Menu\n"
+            "All rights reserved."
+        )
+        assert strip_boilerplate(text) == (
+            "Cities are testing congestion pricing to cut traffic."
+        )
+
+    def test_keeps_long_lines_mentioning_boilerplate_words(self):
+        line = (
+            "Critics say residents will subscribe to fewer transit passes if congestion "
+            "pricing is introduced without better bus service across the region."
+        )
+        assert strip_boilerplate(line) == line
+
+
+class TestFitToTokenBudget:
+    def test_short_text_is_unchanged(self):
+        assert fit_to_token_budget("A short text.", "query", 100) == "A short text."
+
+    def test_keeps_lede_and_most_relevant_paragraphs(self):
+        paragraphs = [
+            "Congestion pricing starts in the city next month.",
+            "The weather was sunny during the announcement and many people attended.",
+            "Congestion pricing critics argue the toll burdens commuters from outer boroughs.",
+        ]
+        text = "\n\n".join(paragraphs)
+        budget = estimate_tokens(paragraphs[0]) + estimate_tokens(paragraphs[2])
+        result = fit_to_token_budget(text, "congestion pricing critics toll", budget)
+        assert result == f"{paragraphs[0]}\n\n{paragraphs[2]}"
+
+    def test_truncates_single_oversized_paragraph(self):
+        text = " ".join(["word"] * 50)
+        result = fit_to_token_budget(text, "word", 10)
+        assert estimate_tokens(result) <= 10
+
+
+class TestPreprocessArticle:
+    def test_records_token_counts(self):
+        article = {"id": "a", "url": "http://a.com", "content": "Home\nReal content."}
+        result = preprocess_article(article, "content", 100)
+        assert result["content"] == "Real content."
+        assert result["content_tokens_before"] > result["content_tokens_after"]
+
+
+class TestArticlePreprocessingNode:
+    @patch("polyview.tasks.article_preprocessing.ARTICLE_TOKEN_BUDGET", 5)
+    def test_applies_budget_to_all_articles(self):
+        state = {
+            "topic": "test",
+            "raw_articles": [
+                {"id": "a", "url": "http://a.com", "content": " ".join(["x"] * 20)},
+                {"id": "b", "url": "http://b.com", "content": "short"},
+            ],
+        }
+        result = article_preprocessing_node(state)
+        assert [a["content_tokens_after"] for a in result["raw_articles"]] == [5, 1]
+
+    def test_handles_missing_articles(self):
+        assert article_preprocessing_node({}) == {"raw_articles": []}
@@ -0,0 +1,84 @@
+import pytest
+
+from polyview.core.article_store import ArticleStore
+from polyview.core.profiles import RunProfile
+from polyview.tasks.article_selection import article_selection_node, select_articles
+
+
+@pytest.fixture
+def sample_raw_articles():
+    return [
+        {
+            "id": "a1",
+            "url": "http://a.com",
+            "content": "Rent control protects tenants from sudden rent increases.",
+            "relevance_score": 0.9,
+        },
+        {
+            "id": "a2",
+            "url": "http://b.com",
+            "content": "Rent control protects tenants from sudden rent increases, advocates say.",
+            "relevance_score": 0.85,
+        },
+        {
+            "id": "a3",
+            "url": "http://c.com",
+            "content": "Economists argue rent control reduces housing supply over time.",
+            "relevance_score": 0.6,
+        },
+    ]
+
+
+class TestSelectArticles:
+    def test_returns_all_articles_within_budget(self, sample_raw_articles):
+        assert select_articles(sample_raw_articles, "rent control", [], 5) == (
+            sample_raw_articles
+        )
+
+    def test_selects_diverse_subset(self, sample_raw_articles):
+        selected = select_articles(sample_raw_articles, "rent control", [], 2)
+        assert [a["id"] for a in selected] == ["a1", "a3"]
+
+    def test_falls_back_to_similarity_without_scores(self, sample_raw_articles):
+        articles = [
+            {k: v for k, v in a.items() if k != "relevance_score"}
+            for a in sample_raw_articles
+        ]
+        selected = select_articles(articles, "rent control housing supply", [], 1)
+        assert [a["id"] for a in selected] == ["a3"]
+
+
+class TestArticleSelectionNode:
+    def test_skips_processed_articles(self, sample_raw_articles):
+        state = {
+            "raw_articles": sample_raw_articles,
+            "topic": "rent control",
+            "processed_article_ids": ["a1"],
+        }
+        result = article_selection_node(state)
+        assert [a["id"] for a in result["raw_articles"]] == ["a2", "a3"]
+        assert result["processed_article_ids"] == ["a2", "a3"]
+
+    def test_releases_content_of_skipped_articles(self, sample_raw_articles):
+        store = ArticleStore()
+        state = {
+            "raw_articles": store.put_many(sample_raw_articles),
+            "topic": "rent control",
+            "processed_article_ids": ["a1"],
+        }
+        config = {"configurable": {"profile": RunProfile(article_budget=2)}}
+
+        result = article_selection_node(state, config)
+
+        [selected] = result["raw_articles"]
+        assert sorted(p.stem for p in store.path.iterdir()) == [selected["id"]]
+
+    def test_respects_remaining_budget(self, sample_raw_articles):
+        state = {
+            "raw_articles": sample_raw_articles,
+            "topic": "rent control",
+            "processed_article_ids": ["old"],
+        }
+        config = {"configurable": {"profile": RunProfile(article_budget=2)}}
+        result = article_selection_node(state, config)
+        assert len(result["raw_articles"]) == 1
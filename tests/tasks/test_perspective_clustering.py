@@ -1,18 +1,27 @@
-from unittest.mock import patch
+import json
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from polyview.core.state import (
     ArticlePerspectives,
+    ConsolidatedPerspective,
     ExtractedPerspective,
     FinalPerspective,
 )
 from polyview.tasks.perspective_clustering import (
     ClusteringResult,
     PerspectiveCluster,
+    PerspectiveIndex,
+    _assign_to_existing_perspectives,
+    _cluster_perspectives,
+    _expand_indices,
     _flatten_perspectives,
     _format_perspectives_for_prompt,
+    _merge_clusters_by_name,
+    _pregroup_perspectives,
     _process_clustering_result,
+    measure_novelty,
 )
 
 
@@ -111,6 +120,282 @@ class TestFormatPerspectivesForPrompt:
         assert formatted[2] == {"index": 2, "summary": "Summary 2A"}
 
 
+class TestPregroupPerspectives:
+    def test_distinct_summaries_stay_separate(self, sample_flattened_perspectives):
+        assert _pregroup_perspectives(sample_flattened_perspectives) == [[0], [1], [2]]
+
+    def test_groups_near_identical_summaries(self, sample_flattened_perspectives):
+        near_duplicate = sample_flattened_perspectives[0].model_copy(
+            update={"perspective_summary": "summary 1A."}
+        )
+        groups = _pregroup_perspectives(
+            [*sample_flattened_perspectives, near_duplicate]
+        )
+        assert groups == [[0, 3], [1], [2]]
+
+
+class TestExpandIndices:
+    def test_expands_representatives_to_members(self):
+        result = ClusteringResult(
+            clusters=[
+                PerspectiveCluster(cluster_name="A", perspective_indices=[0, 2]),
+                PerspectiveCluster(cluster_name="B", perspective_indices=[1, 99]),
+            ]
+        )
+        expanded = _expand_indices(result, [[0, 3], [1], [2, 4]])
+        assert expanded.clusters[0].perspective_indices == [0, 3, 2, 4]
+        assert expanded.clusters[1].perspective_indices == [1]
+
+
+class TestClusterPerspectives:
+    def test_small_input_uses_single_call(self, sample_flattened_perspectives):
+        chain = MagicMock()
+        chain.invoke.return_value = ClusteringResult(
+            clusters=[
+                PerspectiveCluster(cluster_name="A", perspective_indices=[0, 2, 7])
+            ]
+        )
+        result = _cluster_perspectives(chain, sample_flattened_perspectives, {})
+        chain.batch.assert_not_called()
+        assert result.clusters[0].perspective_indices == [0, 2]
+
+    @patch("polyview.tasks.perspective_clustering.HIERARCHICAL_CLUSTERING_THRESHOLD", 3)
+    @patch("polyview.tasks.perspective_clustering.CLUSTERING_BATCH_SIZE", 2)
+    def test_large_input_is_clustered_hierarchically(
+        self, sample_flattened_perspectives
+    ):
+        perspectives = sample_flattened_perspectives + [
+            sample_flattened_perspectives[1].model_copy(
+                update={
+                    "perspective_summary": "Summary 3A",
+                    "key_arguments": ["Arg 3A.1"],
+                }
+            )
+        ]
+        chain = MagicMock()
+        chain.batch.return_value = [
+            ClusteringResult(
+                clusters=[
+                    PerspectiveCluster(cluster_name="A", perspective_indices=[0, 1]),
+                ]
+            ),
+            Exception("Batch failed"),
+        ]
+        # Merge pass over the names ["A", "Summary 2A", "Summary 3A"]
+        chain.invoke.return_value = ClusteringResult(
+            clusters=[
+                PerspectiveCluster(cluster_name="Merged A", perspective_indices=[0, 1]),
+                PerspectiveCluster(cluster_name="Merged B", perspective_indices=[2]),
+            ]
+        )
+
+        result = _cluster_perspectives(chain, perspectives, {"extra": "value"})
+
+        batch_inputs = chain.batch.call_args.args[0]
+        assert len(batch_inputs) == 2
+        assert all(i["extra"] == "value" for i in batch_inputs)
+        merge_input = json.loads(chain.invoke.call_args.args[0]["perspectives"])
+        assert [p["summary"] for p in merge_input] == [
+            "A",
+            "Summary 2A",
+            "Summary 3A",
+        ]
+        assert [(c.cluster_name, c.perspective_indices) for c in result.clusters] == [
+            ("Merged A", [0, 1, 2]),
+            ("Merged B", [3]),
+        ]
+
+    @patch("polyview.tasks.perspective_clustering.HIERARCHICAL_CLUSTERING_THRESHOLD", 3)
+    @patch("polyview.tasks.perspective_clustering.CLUSTERING_BATCH_SIZE", 2)
+    def test_perspectives_left_out_of_batch_clusters_are_kept(
+        self, sample_flattened_perspectives
+    ):
+        perspectives = sample_flattened_perspectives + [
+            sample_flattened_perspectives[1].model_copy(
+                update={
+                    "perspective_summary": "Summary 3A",
+                    "key_arguments": ["Arg 3A.1"],
+                }
+            )
+        ]
+        chain = MagicMock()
+        chain.batch.return_value = [
+            ClusteringResult(
+                clusters=[PerspectiveCluster(cluster_name="A", perspective_indices=[0])]
+            ),
+            ClusteringResult(
+                clusters=[
+                    PerspectiveCluster(cluster_name="B", perspective_indices=[0, 1])
+                ]
+            ),
+        ]
+        chain.invoke.return_value = ClusteringResult(
+            clusters=[
+                PerspectiveCluster(cluster_name="Merged A", perspective_indices=[0, 1]),
+                PerspectiveCluster(cluster_name="Merged B", perspective_indices=[2]),
+            ]
+        )
+
+        result = _cluster_perspectives(chain, perspectives, {})
+
+        merge_input = json.loads(chain.invoke.call_args.args[0]["perspectives"])
+        assert [p["summary"] for p in merge_input] == ["A", "Summary 1B", "B"]
+        assert [(c.cluster_name, c.perspective_indices) for c in result.clusters] == [
+            ("Merged A", [0, 1]),
+            ("Merged B", [2, 3]),
+        ]
+
+    @patch("polyview.tasks.perspective_clustering.HIERARCHICAL_CLUSTERING_THRESHOLD", 3)
+    @patch("polyview.tasks.perspective_clustering.CLUSTERING_BATCH_SIZE", 2)
+    def test_batches_without_clusters_keep_perspectives_unclustered(
+        self, sample_flattened_perspectives
+    ):
+        perspectives = sample_flattened_perspectives + [
+            sample_flattened_perspectives[1].model_copy(
+                update={
+                    "perspective_summary": "Summary 3A",
+                    "key_arguments": ["Arg 3A.1"],
+                }
+            )
+        ]
+        chain = MagicMock()
+        chain.batch.return_value = [
+            ClusteringResult(clusters=[]),
+            ClusteringResult(clusters=[]),
+        ]
+
+        result = _cluster_perspectives(chain, perspectives, {})
+
+        chain.invoke.assert_not_called()
+        assert [(c.cluster_name, c.perspective_indices) for c in result.clusters] == [
+            ("Summary 1A", [0]),
+            ("Summary 1B", [1]),
+            ("Summary 2A", [2]),
+            ("Summary 3A", [3]),
+        ]
+
+
+class TestAssignToExistingPerspectives:
+    def test_assigns_clear_matches_and_leaves_ambiguous(self):
+        existing = [
+            FinalPerspective(
+                perspective_name="Remote work boosts productivity",
+                narrative="",
+                core_arguments=["Reduced commute time", "Fewer office distractions"],
+                common_assumptions=[],
+                strengths=[],
+                weaknesses=[],
+                supporting_evidence=[],
+                rated_perspective_strength=3,
+            ),
+            FinalPerspective(
+                perspective_name="Remote work harms company culture",
+                narrative="",
+                core_arguments=["Less spontaneous collaboration", "Harder onboarding"],
+                common_assumptions=[],
+                strengths=[],
+                weaknesses=[],
+                supporting_evidence=[],
+                rated_perspective_strength=3,
+            ),
+        ]
+        new = [
+            ExtractedPerspective(
+                perspective_summary="Remote work boosts productivity",
+                key_arguments=["Reduced commute time"],
+                contextual_narrative="",
+                source_article_summary="",
+                inferred_assumptions=[],
+                evidence_provided=[],
+            ),
+            ExtractedPerspective(
+                perspective_summary="Four-day weeks are the real future",
+                key_arguments=["Shorter weeks retain staff"],
+                contextual_narrative="",
+                source_article_summary="",
+                inferred_assumptions=[],
+                evidence_provided=[],
+            ),
+        ]
+
+        result, ambiguous = _assign_to_existing_perspectives(new, existing)
+
+        assert [(c.cluster_name, c.perspective_indices) for c in result.clusters] == [
+            ("Remote work boosts productivity", [0])
+        ]
+        assert ambiguous == [1]
+
+
+class TestMergeClustersByName:
+    def test_merges_clusters_with_the_same_name(self):
+        merged = _merge_clusters_by_name(
+            ClusteringResult(
+                clusters=[PerspectiveCluster(cluster_name="A", perspective_indices=[0])]
+            ),
+            ClusteringResult(
+                clusters=[
+                    PerspectiveCluster(cluster_name="B", perspective_indices=[1]),
+                    PerspectiveCluster(cluster_name="A", perspective_indices=[2]),
+                ]
+            ),
+        )
+        assert [(c.cluster_name, c.perspective_indices) for c in merged.clusters] == [
+            ("A", [0, 2]),
+            ("B", [1]),
+        ]
+
+
+def _final_perspective(name: str) -> FinalPerspective:
+    return FinalPerspective(
+        perspective_name=name,
+        narrative=f"Narrative of {name}",
+        core_arguments=[f"Argument of {name}"],
+        common_assumptions=[],
+        strengths=[],
+        weaknesses=[],
+        supporting_evidence=[],
+        rated_perspective_strength=3,
+    )
+
+
+class TestPerspectiveIndex:
+    @pytest.fixture
+    def index(self):
+        return PerspectiveIndex(
+            [
+                _final_perspective("Economic Impact Concerns"),
+                _final_perspective("Skeptical/Contrarian"),
+            ]
+        )
+
+    def test_exact_and_normalized_matches(self, index):
+        assert index.find("Economic Impact Concerns").perspective_name == (
+            "Economic Impact Concerns"
+        )
+        assert index.find("contrarian, skeptical").perspective_name == (
+            "Skeptical/Contrarian"
+        )
+
+    def test_reworded_name_matches(self, index):
+        match = index.find("Concerns about the Economic Impact of the policy")
+        assert match.perspective_name == "Economic Impact Concerns"
+
+    def test_opposing_names_do_not_match(self):
+        index = PerspectiveIndex(
+            [
+                _final_perspective("For Nuclear Power"),
+                _final_perspective("Economic Impact Concerns"),
+            ]
+        )
+        assert index.find("Against Nuclear Power") is None
+        assert index.find("Nuclear power, for").perspective_name == "For Nuclear Power"
+        assert index.find("No Economic Impact Concerns") is None
+
+    def test_unrelated_name_does_not_match(self, index):
+        assert index.find("Economic Optimism") is None
+        assert index.find("Scientific Consensus") is None
+
+
 class TestProcessClusteringResult:
     @patch(
         "polyview.tasks.perspective_clustering._create_synthesis_prompt",
@@ -242,3 +527,162 @@ class TestProcessClusteringResult:
         assert cluster_a_found is not None
         assert "Existing Arg" in cluster_a_found.aggregated_arguments
         assert "Existing Narrative" in cluster_a_found.aggregated_narratives
+
+    @patch(
+        "polyview.tasks.perspective_clustering._create_synthesis_prompt",
+        return_value="Synthesized Narrative",
+    )
+    def test_reworded_clusters_merge_into_existing_perspective(
+        self, mock_synthesis, sample_flattened_perspectives
+    ):
+        clustering_result = ClusteringResult(
+            clusters=[
+                PerspectiveCluster(
+                    cluster_name="Economic impact concerns", perspective_indices=[0]
+                ),
+                PerspectiveCluster(
+                    cluster_name="Concerns: Economic Impact", perspective_indices=[1]
+                ),
+            ]
+        )
+
+        consolidated_list = _process_clustering_result(
+            clustering_result,
+            sample_flattened_perspectives,
+            [_final_perspective("Economic Impact Concerns")],
+            iteration=2,
+        )
+
+        assert len(consolidated_list) == 1
+        cluster = consolidated_list[0]
+        assert cluster.perspective_name == "Economic Impact Concerns"
+        assert cluster.aggregated_arguments == [
+            "Argument of Economic Impact Concerns",
+            "Arg 1A.1",
+            "Arg 1A.2",
+            "Arg 1B.1",
+            "Arg 1B.2",
+        ]
+
+    @patch(
+        "polyview.tasks.perspective_clustering._create_synthesis_prompt",
+        return_value="Synthesized Narrative",
+    )
+    def test_near_duplicate_arguments_are_collapsed_with_counts(
+        self, mock_synthesis, sample_flattened_perspectives
+    ):
+        paraphrasing = sample_flattened_perspectives[1].model_copy(
+            update={
+                "key_arguments": [
+                    "Carbon taxes cut emissions at the lowest cost.",
+                    "Carbon taxes cut emissions at the lowest cost",
+                ],
+                "evidence_provided": ["Evidence 1A"],
+            }
+        )
+        clustering_result = ClusteringResult(
+            clusters=[
+                PerspectiveCluster(cluster_name="Cluster", perspective_indices=[0, 1])
+            ]
+        )
+
+        consolidated_list = _process_clustering_result(
+            clustering_result,
+            [sample_flattened_perspectives[0], paraphrasing],
+            [],
+            iteration=1,
+        )
+
+        cluster = consolidated_list[0]
+        assert cluster.argument_counts == {
+            "Arg 1A.1": 1,
+            "Arg 1A.2": 1,
+            "Carbon taxes cut emissions at the lowest cost.": 2,
+        }
+        assert cluster.supporting_evidence == ["Evidence 1A"]
+        assert cluster.evidence_counts == {"Evidence 1A": 2}
+
+    @patch("polyview.tasks.perspective_clustering._create_synthesis_prompt")
+    def test_clusters_without_narratives_skip_preliminary_synthesis(
+        self, mock_synthesis, sample_flattened_perspectives
+    ):
+        fast_perspective = sample_flattened_perspectives[0].model_copy(
+            update={"contextual_narrative": ""}
+        )
+        clustering_result = ClusteringResult(
+            clusters=[PerspectiveCluster(cluster_name="Fast", perspective_indices=[0])]
+        )
+
+        consolidated_list = _process_clustering_result(
+            clustering_result, [fast_perspective], [], iteration=1
+        )
+
+        mock_synthesis.assert_not_called()
+        assert consolidated_list[0].aggregated_narratives == []
+        assert consolidated_list[0].preliminary_synthesis == ""
+
+
+class TestMeasureNovelty:
+    def test_counts_new_clusters_and_arguments(self):
+        existing = [_final_perspective("A"), _final_perspective("B")]
+        consolidated = [
+            ConsolidatedPerspective(
+                perspective_name="A",
+                aggregated_arguments=[*existing[0].core_arguments, "New argument"],
+                aggregated_narratives=[],
+                supporting_evidence=[],
+                preliminary_synthesis="",
+            ),
+            ConsolidatedPerspective(
+                perspective_name="C",
+                aggregated_arguments=["C argument"],
+                aggregated_narratives=[],
+                supporting_evidence=[],
+                preliminary_synthesis="",
+            ),
+        ]
+
+        novelty = measure_novelty(consolidated, existing)
+
+        assert novelty.new_clusters == 1
+        assert novelty.total_clusters == 3
+        assert novelty.new_arguments == 2
+        assert novelty.total_arguments == (
+            len(existing[0].core_arguments) + 1 + 1 + len(existing[1].core_arguments)
+        )
+
+    def test_reworded_arguments_are_not_new(self):
+        existing = _final_perspective("A").model_copy(
+            update={
+                "core_arguments": [
+                    "Rent control reduces the supply of rental housing over time."
+                ]
+            }
+        )
+        consolidated = ConsolidatedPerspective(
+            perspective_name="A",
+            aggregated_arguments=[
+                "Over time, rent control shrinks the rental housing supply.",
+                "Over time, rent control grows the rental housing supply.",
+                "Landlords convert rental units into condominiums.",
+            ],
+            aggregated_narratives=[],
+            supporting_evidence=[],
+            preliminary_synthesis="",
+        )
+
+        novelty = measure_novelty([consolidated], [existing])
+
+        # The opposite claim and the unrelated one are new, the rewording is not
+        assert novelty.new_arguments == 2
+        assert novelty.total_arguments == 3
+
+    def test_first_cycle_is_fully_novel(self):
+        consolidated = ConsolidatedPerspective(
+            perspective_name="A",
+            aggregated_arguments=["Argument"],
+            aggregated_narratives=[],
+            supporting_evidence=[],
+            preliminary_synthesis="",
+        )
+        assert measure_novelty([consolidated], []).score == 1.0
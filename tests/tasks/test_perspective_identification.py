@@ -2,11 +2,20 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from polyview.core.state import ExtractedPerspective
+from polyview.core.profiles import RunProfile
+from polyview.core.state import ArticlePerspectives, ExtractedPerspective
 from polyview.tasks.perspective_identification import (
     ExtractedPerspectives,
+    FastExtractedPerspective,
+    FastExtractedPerspectives,
+    PackedExtractedPerspectives,
+    get_extraction_schemas,
+    merge_chunk_perspectives,
+    pack_articles,
     perspective_identification,
+    split_into_chunks,
 )
+from polyview.utils.text import estimate_tokens
 
 
 @pytest.fixture
@@ -75,3 +84,183 @@ def test_perspective_identification_llm_failure(
 
     assert len(result["article_perspectives"]) == 1
     assert result["article_perspectives"][0].source_article_id == "article2"
+
+
+def _perspective(summary: str, arguments: list[str]) -> ExtractedPerspective:
+    return ExtractedPerspective(
+        perspective_summary=summary,
+        key_arguments=arguments,
+        contextual_narrative=f"Narrative of {summary}",
+        source_article_summary=f"Source summary of {summary}",
+        inferred_assumptions=[],
+        evidence_provided=[f"Evidence of {summary}"],
+    )
+
+
+class TestSplitIntoChunks:
+    def test_short_text_is_a_single_chunk(self):
+        assert split_into_chunks("One sentence. Two sentences.", 100, 10) == [
+            "One sentence. Two sentences."
+        ]
+
+    def test_chunks_overlap(self):
+        text = " ".join(f"Sentence number {i} is here." for i in range(20))
+        chunks = split_into_chunks(text, chunk_tokens=30, overlap_tokens=6)
+        assert len(chunks) > 1
+        assert all(estimate_tokens(c) <= 30 for c in chunks)
+        for previous, current in zip(chunks, chunks[1:], strict=False):
+            assert current.split(". ")[0] in previous
+
+
+class TestMergeChunkPerspectives:
+    def test_merges_similar_perspectives(self):
+        merged = merge_chunk_perspectives(
+            [
+                _perspective("Rent control protects tenants", ["Stable rents"]),
+                _perspective("Rent control hurts housing supply", ["Fewer new builds"]),
+                _perspective("Rent control protects tenants", ["Prevents evictions"]),
+            ]
+        )
+        assert len(merged) == 2
+        assert merged[0].key_arguments == ["Stable rents", "Prevents evictions"]
+        assert merged[0].source_article_summary == (
+            "Source summary of Rent control protects tenants"
+        )
+
+
+@patch("polyview.tasks.perspective_identification.LONG_ARTICLE_TOKEN_THRESHOLD", 10)
+@patch("polyview.tasks.perspective_identification.CHUNK_TOKEN_SIZE", 10)
+@patch("polyview.tasks.perspective_identification.CHUNK_TOKEN_OVERLAP", 0)
+@patch("polyview.tasks.perspective_identification.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_identification.llm")
+def test_perspective_identification_long_article_map_reduce(
+    mock_llm, mock_prompt_template, mock_llm_response
+):
+    mock_prompt = MagicMock()
+    mock_prompt_template.from_messages.return_value = mock_prompt
+    mock_final_chain = MagicMock()
+    mock_prompt.__or__.return_value = mock_final_chain
+    mock_final_chain.batch.return_value = [
+        mock_llm_response,
+        Exception("Chunk failed"),
+        mock_llm_response,
+    ]
+
+    long_article = {
+        "id": "long",
+        "url": "http://long.com",
+        "content": "First part of the text. Second part of the text. Third part of the text.",
+    }
+    result = perspective_identification({"raw_articles": [long_article], "topic": "t"})
+
+    assert len(mock_final_chain.batch.call_args.args[0]) == 3
+    mock_final_chain.invoke.assert_not_called()
+    assert len(result["article_perspectives"]) == 1
+    # Identical chunk-level perspectives are merged into one
+    assert len(result["article_perspectives"][0].perspectives) == 1
+
+
+class TestPackArticles:
+    def test_respects_token_budget_and_pack_size(self):
+        articles = [
+            {"id": str(i), "content": " ".join(["word"] * size)}
+            for i, size in enumerate([40, 30, 20, 10, 10])
+        ]
+        packs = pack_articles(articles, token_budget=50, max_articles=2)
+        assert [[a["id"] for a in pack] for pack in packs] == [
+            ["0", "3"],
+            ["1", "2"],
+            ["4"],
+        ]
+
+
+@patch("polyview.tasks.perspective_identification.ENABLE_ARTICLE_PACKING", True)
+@patch("polyview.tasks.perspective_identification.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_identification.llm")
+def test_perspective_identification_packed_with_fallback(
+    mock_llm, mock_prompt_template, sample_raw_articles, mock_llm_response
+):
+    single_chain = MagicMock()
+    single_chain.invoke.return_value = mock_llm_response
+    packed_chain = MagicMock()
+    packed_chain.invoke.return_value = PackedExtractedPerspectives(
+        articles=[
+            ArticlePerspectives(
+                source_article_id="article1",
+                perspectives=mock_llm_response.perspectives,
+            ),
+            ArticlePerspectives(source_article_id="unknown", perspectives=[]),
+        ]
+    )
+    single_prompt, packed_prompt = MagicMock(), MagicMock()
+    mock_prompt_template.from_messages.side_effect = [single_prompt, packed_prompt]
+    single_prompt.__or__.return_value = single_chain
+    packed_prompt.__or__.return_value = packed_chain
+
+    state = {"raw_articles": sample_raw_articles, "topic": "test"}
+    result = perspective_identification(state)
+
+    assert packed_chain.invoke.call_count == 1
+    # article2 was missing from the packed response and is extracted on its own
+    assert single_chain.invoke.call_count == 1
+    assert [ap.source_article_id for ap in result["article_perspectives"]] == [
+        "article1",
+        "article2",
+    ]
+
+
+@patch("polyview.tasks.perspective_identification.ENABLE_ARTICLE_PACKING", True)
+@patch("polyview.tasks.perspective_identification.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_identification.llm")
+def test_perspective_identification_packed_failure_falls_back(
+    mock_llm, mock_prompt_template, sample_raw_articles, mock_llm_response
+):
+    mock_prompt = MagicMock()
+    mock_prompt_template.from_messages.return_value = mock_prompt
+    mock_final_chain = MagicMock()
+    mock_prompt.__or__.return_value = mock_final_chain
+    # The packed call returns a single-article schema, which fails validation
+    mock_final_chain.invoke.return_value = mock_llm_response
+
+    state = {"raw_articles": sample_raw_articles, "topic": "test"}
+    result = perspective_identification(state)
+
+    assert mock_final_chain.invoke.call_count == 3
+    assert len(result["article_perspectives"]) == 2
+
+
+@patch("polyview.tasks.perspective_identification.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_identification.llm")
+def test_fast_profile_uses_slim_schema(
+    mock_llm, mock_prompt_template, sample_raw_articles
+):
+    mock_prompt = MagicMock()
+    mock_prompt_template.from_messages.return_value = mock_prompt
+    mock_final_chain = MagicMock()
+    mock_prompt.__or__.return_value = mock_final_chain
+    mock_final_chain.invoke.return_value = FastExtractedPerspectives(
+        perspectives=[
+            FastExtractedPerspective(
+                perspective_summary="Test Summary",
+                key_arguments=["Arg 1"],
+                evidence_provided=["Test Evidence"],
+            )
+        ]
+    )
+
+    result = perspective_identification(
+        {"raw_articles": sample_raw_articles[:1], "topic": "test"},
+        {"configurable": {"profile": RunProfile(extraction_profile="fast")}},
+    )
+
+    mock_llm.with_structured_output.assert_called_once_with(FastExtractedPerspectives)
+    perspective = result["article_perspectives"][0].perspectives[0]
+    assert isinstance(perspective, ExtractedPerspective)
+    assert perspective.key_arguments == ["Arg 1"]
+    assert perspective.contextual_narrative == ""
+    assert perspective.inferred_assumptions == []
+
+
+def test_unknown_extraction_profile_raises():
+    with pytest.raises(ValueError, match="Unknown extraction profile"):
+        get_extraction_schemas("thorough")
@@ -0,0 +1,31 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from polyview.tasks.perspective_preview import (
+    PREVIEW_SNIPPET_CHARS,
+    PerspectivePreview,
+    PreviewPerspective,
+    generate_preview,
+)
+
+
+@patch("polyview.tasks.perspective_preview.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_preview.llm_lite")
+def test_generate_preview_from_snippets(mock_llm, mock_prompt_template):
+    mock_prompt = MagicMock()
+    mock_prompt_template.from_messages.return_value = mock_prompt
+    mock_chain = MagicMock()
+    mock_prompt.__or__.return_value = mock_chain
+    mock_chain.ainvoke = AsyncMock(
+        return_value=PerspectivePreview(
+            perspectives=[PreviewPerspective(perspective_name="A", summary="About A")]
+        )
+    )
+    articles = [{"title": "T", "content": "x" * 2000, "url": "http://a.com"}]
+
+    perspectives = asyncio.run(generate_preview("topic", articles))
+
+    assert [p.perspective_name for p in perspectives] == ["A"]
+    snippets = json.loads(mock_chain.ainvoke.call_args.args[0]["snippets"])
+    assert snippets == [{"title": "T", "snippet": "x" * PREVIEW_SNIPPET_CHARS}]
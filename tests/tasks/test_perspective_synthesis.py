@@ -1,3 +1,4 @@
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -5,6 +6,7 @@ import pytest
 from polyview.core.state import ConsolidatedPerspective, FinalPerspective
 from polyview.tasks.perspective_synthesis import (
     FinalPerspectives,
+    fingerprint_perspective,
     perspective_synthesis_node,
 )
 
@@ -75,3 +77,200 @@ def test_perspective_synthesis_llm_failure(
     result = perspective_synthesis_node(state)
 
     assert len(result["final_perspectives"]) == 0
+
+
+def _final_perspective(name: str) -> FinalPerspective:
+    return FinalPerspective(
+        perspective_name=name,
+        narrative="",
+        core_arguments=[],
+        common_assumptions=[],
+        strengths=[],
+        weaknesses=[],
+        supporting_evidence=[],
+        rated_perspective_strength=3,
+    )
+
+
+@patch("polyview.tasks.perspective_synthesis.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_synthesis.llm")
+def test_perspective_synthesis_keeps_unchanged_perspectives(
+    mock_llm, mock_prompt_template, sample_consolidated_perspectives
+):
+    mock_prompt = MagicMock()
+    mock_prompt_template.from_messages.return_value = mock_prompt
+    mock_final_chain = MagicMock()
+    mock_prompt.__or__.return_value = mock_final_chain
+    mock_final_chain.invoke.return_value = FinalPerspectives(
+        final_perspectives=[_final_perspective("A")]
+    )
+
+    state = {
+        "consolidated_perspectives": sample_consolidated_perspectives,
+        "final_perspectives": [_final_perspective("A"), _final_perspective("B")],
+    }
+    result = perspective_synthesis_node(state)
+
+    assert [p.perspective_name for p in result["final_perspectives"]] == ["B", "A"]
+
+
+@patch("polyview.tasks.perspective_synthesis.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_synthesis.llm")
+def test_all_batches_failing_keeps_cached_and_previous_perspectives(
+    mock_llm, mock_prompt_template, sample_consolidated_perspectives
+):
+    mock_prompt = MagicMock()
+    mock_prompt_template.from_messages.return_value = mock_prompt
+    mock_final_chain = MagicMock()
+    mock_prompt.__or__.return_value = mock_final_chain
+    mock_final_chain.invoke.side_effect = Exception("LLM Error")
+
+    cached = _final_perspective("A").model_copy(update={"narrative": "Cached"})
+    failed = sample_consolidated_perspectives[0].model_copy(
+        update={"perspective_name": "B"}
+    )
+    previous = [_final_perspective("A"), _final_perspective("B")]
+    unchanged = _final_perspective("C")
+    state = {
+        "consolidated_perspectives": [*sample_consolidated_perspectives, failed],
+        "final_perspectives": [*previous, unchanged],
+        "synthesis_cache": {
+            fingerprint_perspective(sample_consolidated_perspectives[0]): cached
+        },
+    }
+    result = perspective_synthesis_node(state)
+
+    assert result["final_perspectives"] == [unchanged, cached, previous[1]]
+
+
+def test_perspective_synthesis_without_new_material_keeps_existing():
+    existing = [_final_perspective("A")]
+    state = {"consolidated_perspectives": [], "final_perspectives": existing}
+    assert perspective_synthesis_node(state) == {"final_perspectives": existing}
+
+
+class TestFingerprintPerspective:
+    def test_ignores_order_and_duplicates(self):
+        first = ConsolidatedPerspective(
+            perspective_name="A",
+            aggregated_arguments=["x", "y"],
+            aggregated_narratives=["n"],
+            supporting_evidence=["e"],
+            preliminary_synthesis="draft 1",
+        )
+        second = first.model_copy(
+            update={
+                "aggregated_arguments": ["y", "x", "x"],
+                "preliminary_synthesis": "draft 2",
+            }
+        )
+        assert fingerprint_perspective(first) == fingerprint_perspective(second)
+
+    def test_unchanged_cluster_matches_its_final_perspective(self):
+        final = _final_perspective("A").model_copy(
+            update={"core_arguments": ["x"], "narrative": "n"}
+        )
+        consolidated = ConsolidatedPerspective(
+            perspective_name="A",
+            aggregated_arguments=["x"],
+            aggregated_narratives=["n"],
+            supporting_evidence=[],
+            preliminary_synthesis="",
+        )
+        assert fingerprint_perspective(final) == fingerprint_perspective(consolidated)
+
+
+@patch("polyview.tasks.perspective_synthesis.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_synthesis.llm")
+def test_perspective_synthesis_reuses_cached_perspectives(
+    mock_llm, mock_prompt_template, sample_consolidated_perspectives
+):
+    mock_prompt = MagicMock()
+    mock_prompt_template.from_messages.return_value = mock_prompt
+    mock_final_chain = MagicMock()
+    mock_prompt.__or__.return_value = mock_final_chain
+    mock_final_chain.invoke.return_value = FinalPerspectives(
+        final_perspectives=[_final_perspective("B")]
+    )
+
+    cached = _final_perspective("A")
+    new_cluster = sample_consolidated_perspectives[0].model_copy(
+        update={"perspective_name": "B"}
+    )
+    state = {
+        "consolidated_perspectives": [*sample_consolidated_perspectives, new_cluster],
+        "synthesis_cache": {
+            fingerprint_perspective(sample_consolidated_perspectives[0]): cached
+        },
+    }
+    result = perspective_synthesis_node(state)
+
+    prompt_input = mock_final_chain.invoke.call_args.args[0]["perspectives_json"]
+    assert [p["perspective_name"] for p in json.loads(prompt_input)] == ["B"]
+    assert [p.perspective_name for p in result["final_perspectives"]] == ["A", "B"]
+    assert fingerprint_perspective(new_cluster) in result["synthesis_cache"]
+
+
+@patch("polyview.tasks.perspective_synthesis.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_synthesis.llm")
+def test_prompt_includes_argument_and_evidence_counts(
+    mock_llm, mock_prompt_template, sample_consolidated_perspectives
+):
+    mock_prompt = MagicMock()
+    mock_prompt_template.from_messages.return_value = mock_prompt
+    mock_final_chain = MagicMock()
+    mock_prompt.__or__.return_value = mock_final_chain
+    mock_final_chain.invoke.return_value = FinalPerspectives(
+        final_perspectives=[_final_perspective("A")]
+    )
+
+    consolidated = sample_consolidated_perspectives[0].model_copy(
+        update={
+            "aggregated_arguments": ["Rents stay stable."],
+            "supporting_evidence": ["Study A"],
+            "argument_counts": {"Rents stay stable.": 3},
+            "evidence_counts": {"Study A": 2},
+        }
+    )
+    perspective_synthesis_node({"consolidated_perspectives": [consolidated]})
+
+    prompt_input = mock_final_chain.invoke.call_args.args[0]["perspectives_json"]
+    [perspective] = json.loads(prompt_input)
+    assert perspective["argument_counts"] == {"Rents stay stable.": 3}
+    assert perspective["evidence_counts"] == {"Study A": 2}
+
+
+@patch("polyview.tasks.perspective_synthesis.emit_event")
+@patch("polyview.tasks.perspective_synthesis.SYNTHESIS_BATCH_SIZE", 1)
+@patch("polyview.tasks.perspective_synthesis.ChatPromptTemplate")
+@patch("polyview.tasks.perspective_synthesis.llm")
+def test_batches_are_synthesized_and_streamed_as_completed(
+    mock_llm, mock_prompt_template, mock_emit, sample_consolidated_perspectives
+):
+    mock_prompt = MagicMock()
+    mock_prompt_template.from_messages.return_value = mock_prompt
+    mock_final_chain = MagicMock()
+    mock_prompt.__or__.return_value = mock_final_chain
+    mock_final_chain.batch_as_completed.return_value = iter(
+        [
+            (1, FinalPerspectives(final_perspectives=[_final_perspective("B")])),
+            (0, Exception("LLM Error")),
+        ]
+    )
+
+    second = sample_consolidated_perspectives[0].model_copy(
+        update={"perspective_name": "B"}
+    )
+    state = {
+        "consolidated_perspectives": [sample_consolidated_perspectives[0], second],
+        "final_perspectives": [_final_perspective("A")],
+    }
+    result = perspective_synthesis_node(state)
+
+    assert len(mock_final_chain.batch_as_completed.call_args.args[0]) == 2
+    streamed = [
+        c.args[0]["perspective"].perspective_name for c in mock_emit.call_args_list
+    ]
+    assert streamed == ["B"]
+    # The failed batch keeps the perspective of the previous cycle
+    assert [p.perspective_name for p in result["final_perspectives"]] == ["A", "B"]
@@ -0,0 +1,132 @@
+import json
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, ToolMessage
+import pytest
+
+from polyview.core.article_store import ArticleStore
+from polyview.core.profiles import RunProfile
+from polyview.core.state import ArticlePerspectives
+from polyview.tasks.pipelined_search import pipelined_search_node
+
+
+def _tool_update(call_id: str, results: list[dict]) -> dict:
+    return {
+        "tools": {
+            "messages": [ToolMessage(content=json.dumps(results), tool_call_id=call_id)]
+        }
+    }
+
+
+def _agent_update(call_id: str, query: str) -> dict:
+    return {
+        "agent": {
+            "messages": [
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {
+                            "name": "tavily_search",
+                            "args": {"query": query},
+                            "id": call_id,
+                        }
+                    ],
+                )
+            ]
+        }
+    }
+
+
+@pytest.fixture
+def stream_updates():
+    rent_control = "Rent control caps rent increases for tenants in the city."
+    return [
+        _agent_update("1", "rent control"),
+        _tool_update(
+            "1",
+            [
+                {"url": "http://a.com", "content": rent_control},
+                {"url": "http://b.com", "content": f"{rent_control} Landlords object."},
+            ],
+        ),
+        _agent_update("2", "rent control effects"),
+        _tool_update(
+            "2",
+            [
+                {"url": "http://a.com", "content": rent_control},
+                {"url": "http://c.com", "content": f"{rent_control} Supply drops."},
+            ],
+        ),
+        {"agent": {"messages": [AIMessage(content="END")]}},
+    ]
+
+
+@patch("polyview.tasks.pipelined_search.create_extraction_chain")
+@patch("polyview.tasks.pipelined_search.extract_article")
+@patch("polyview.tasks.pipelined_search.search_agent_graph")
+def test_extracts_new_articles_as_they_arrive(
+    mock_graph, mock_extract, mock_create_chain, stream_updates
+):
+    mock_graph.stream.return_value = iter(stream_updates)
+    mock_extract.side_effect = lambda chain, topic, article: ArticlePerspectives(
+        source_article_id=article["id"], perspectives=[]
+    )
+
+    result = pipelined_search_node({"topic": "rent control"})
+
+    urls = [a["url"] for a in result["raw_articles"]]
+    assert urls == ["http://a.com", "http://b.com", "http://c.com"]
+    assert mock_extract.call_count == 3
+    assert [p.source_article_id for p in result["article_perspectives"]] == [
+        a["id"] for a in result["raw_articles"]
+    ]
+    assert result["processed_article_ids"] == [a["id"] for a in result["raw_articles"]]
+    assert result["search_queries"] == ["rent control", "rent control effects"]
+
+
+@patch("polyview.tasks.pipelined_search.create_extraction_chain")
+@patch("polyview.tasks.pipelined_search.extract_article")
+@patch("polyview.tasks.pipelined_search.search_agent_graph")
+def test_respects_budget_and_extraction_failures(
+    mock_graph, mock_extract, mock_create_chain, stream_updates
+):
+    mock_graph.stream.return_value = iter(stream_updates)
+    mock_extract.side_effect = Exception("LLM Error")
+
+    result = pipelined_search_node(
+        {"topic": "rent control"},
+        {"configurable": {"profile": RunProfile(article_budget=2)}},
+    )
+
+    assert len(result["raw_articles"]) == 2
+    assert result["article_perspectives"] == []
+
+
+@patch("polyview.tasks.pipelined_search.create_extraction_chain")
+@patch("polyview.tasks.pipelined_search.extract_article")
+@patch("polyview.tasks.pipelined_search.search_agent_graph")
+def test_leaves_no_content_in_store(
+    mock_graph, mock_extract, mock_create_chain, stream_updates
+):
+    mock_graph.stream.return_value = iter(stream_updates)
+    mock_extract.side_effect = lambda chain, topic, article: ArticlePerspectives(
+        source_article_id=article["id"], perspectives=[]
+    )
+
+    with patch("polyview.tasks.pipelined_search.emit_event") as mock_emit:
+        result = pipelined_search_node({"topic": "rent control"})
+
+    assert all("content" not in a for a in result["raw_articles"])
+    # The content is sent along to clients instead, one event per tool call
+    emitted = [call.args[0] for call in mock_emit.call_args_list]
+    assert [e["type"] for e in emitted] == ["articles", "articles"]
+    assert [a["url"] for e in emitted for a in e["articles"]] == [
+        a["url"] for a in result["raw_articles"]
+    ]
+    assert all(a["content"] for e in emitted for a in e["articles"])
+    # Extraction works on the content in memory, so nothing is written to the store
+    assert not ArticleStore().path.exists()
+    assert all(
+        "Rent control" in call.args[2]["content"]
+        for call in mock_extract.call_args_list
+    )
@@ -0,0 +1,76 @@
+import pytest
+
+from polyview.core.article_store import ArticleStore
+from polyview.tasks.relevance_filter import (
+    MIN_RELEVANCE_SCORE,
+    relevance_filter_node,
+    score_article_relevance,
+)
+
+
+@pytest.fixture
+def sample_raw_articles():
+    return [
+        {
+            "id": "on-topic",
+            "url": "http://a.com",
+            "content": "The four-day work week improves productivity, a new trial of the work week finds.",
+        },
+        {
+            "id": "query-match",
+            "url": "http://b.com",
+            "content": "Employers worry shorter schedules hurt customer service and overtime costs.",
+        },
+        {
+            "id": "off-topic",
+            "url": "http://c.com",
+            "content": "Local bakery wins award for sourdough bread recipe.",
+        },
+    ]
+
+
+class TestScoreArticleRelevance:
+    def test_empty_articles(self):
+        assert len(score_article_relevance([], "topic", [])) == 0
+
+    def test_query_matches_count_towards_score(self, sample_raw_articles):
+        topic_only = score_article_relevance(
+            sample_raw_articles, "four-day work week", []
+        )
+        with_queries = score_article_relevance(
+            sample_raw_articles,
+            "four-day work week",
+            ["employers shorter schedules overtime costs"],
+        )
+        assert topic_only[1] == 0
+        assert with_queries[1] > 0
+
+
+class TestRelevanceFilterNode:
+    def test_drops_off_topic_articles_and_records_scores(self, sample_raw_articles):
+        state = {
+            "raw_articles": sample_raw_articles,
+            "topic": "four-day work week",
+            "search_queries": ["employers shorter schedules overtime costs"],
+        }
+        result = relevance_filter_node(state)
+
+        kept_ids = [a["id"] for a in result["raw_articles"]]
+        assert kept_ids == ["on-topic", "query-match"]
+        assert all(
+            a["relevance_score"] >= MIN_RELEVANCE_SCORE for a in result["raw_articles"]
+        )
+
+    def test_handles_missing_articles(self):
+        assert relevance_filter_node({"topic": "x"}) == {"raw_articles": []}
+
+    def test_moves_content_to_article_store(self, sample_raw_articles):
+        state = {"raw_articles": sample_raw_articles, "topic": "four-day work week"}
+        result = relevance_filter_node(state)
+
+        store = ArticleStore()
+        kept = result["raw_articles"][0]
+        assert "content" not in kept
+        assert store.load(kept)["content"] == sample_raw_articles[0]["content"]
+        # Dropped articles are released from the store
+        assert store.get_content("off-topic") == ""
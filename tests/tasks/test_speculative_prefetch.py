@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+import pytest
+
+from polyview.agents.search_agent import article_id
+from polyview.core.profiles import RunProfile
+from polyview.tasks.speculative_prefetch import prefetch_searches_node
+
+
+@pytest.fixture
+def config():
+    return {"configurable": {"profile": RunProfile(speculative_prefetch=True)}}
+
+
+@patch("polyview.tasks.speculative_prefetch.run_search")
+@patch("polyview.tasks.speculative_prefetch.query_generation_agent")
+def test_prefetches_new_articles_for_next_cycle(mock_queries, mock_search, config):
+    mock_queries.return_value = {"search_queries": ["old query", "q1", "q2"]}
+    mock_search.side_effect = [
+        [{"url": "http://a.com"}, {"url": "http://b.com"}],
+        [{"url": "http://b.com"}, {"url": "http://c.com"}],
+    ]
+    state = {
+        "topic": "rent control",
+        "iteration": 1,
+        "search_queries": ["old query"],
+        "processed_article_ids": [article_id("http://c.com")],
+    }
+
+    result = prefetch_searches_node(state, config)
+
+    assert mock_queries.call_args.args[0]["iteration"] == 2
+    assert result["prefetched_queries"] == ["q1", "q2"]
+    assert [a["url"] for a in result["prefetched_articles"]] == [
+        "http://a.com",
+        "http://b.com",
+    ]
+
+
+@patch("polyview.tasks.speculative_prefetch.query_generation_agent")
+def test_skips_prefetch_in_last_cycle_or_when_disabled(mock_queries, config):
+    assert prefetch_searches_node({"iteration": 2}, config)["prefetched_articles"] == []
+    assert prefetch_searches_node({"iteration": 1})["prefetched_articles"] == []
+    mock_queries.assert_not_called()
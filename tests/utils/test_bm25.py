@@ -0,0 +1,39 @@
+import numpy as np
+
+from polyview.utils.bm25 import BM25Index
+
+
+class TestBM25Index:
+    def test_scores_matching_document_highest(self):
+        index = BM25Index(
+            [
+                "Electric cars reduce emissions in cities.",
+                "The football season starts next week.",
+                "Battery costs for electric cars keep falling.",
+            ]
+        )
+        scores = index.score("electric cars")
+        assert scores[1] == 0
+        assert scores[0] > 0
+        assert scores[2] > 0
+
+    def test_unknown_query_terms_score_zero(self):
+        index = BM25Index(["Some text about policy."])
+        assert np.all(index.score("quantum entanglement") == 0)
+
+    def test_normalized_scores_are_bounded(self):
+        index = BM25Index(["tax tax tax policy", "tax reform", "weather report"])
+        scores = index.normalized_score("tax policy")
+        assert np.all(scores >= 0)
+        assert np.all(scores <= 1)
+        assert scores[0] > scores[1] > scores[2]
+
+    def test_score_many_shape(self):
+        index = BM25Index(["a first document", "a second document"])
+        assert index.score_many(["first", "second", "third"]).shape == (3, 2)
+        assert index.score_many([]).shape == (0, 2)
+
+    def test_empty_corpus(self):
+        index = BM25Index([])
+        assert len(index) == 0
+        assert index.score("anything").shape == (0,)
@@ -0,0 +1,43 @@
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+
+from polyview.utils.messages import compact_tool_messages, messages_to_remove
+
+
+class TestCompactToolMessages:
+    def test_drops_result_content(self):
+        results = [
+            {"title": "A", "url": "http://a.com", "content": "Long text.", "score": 0.9}
+        ]
+        message = ToolMessage(
+            content=json.dumps(results), tool_call_id="call_1", id="tool-1"
+        )
+
+        [compacted] = compact_tool_messages([message])
+
+        assert json.loads(compacted.content) == [
+            {"title": "A", "url": "http://a.com", "score": 0.9}
+        ]
+        assert compacted.tool_call_id == "call_1"
+        assert compacted.id == "tool-1"
+
+    def test_keeps_errors_and_other_messages(self):
+        messages = [
+            HumanMessage(content="Search."),
+            ToolMessage(content=json.dumps({"error": "boom"}), tool_call_id="call_1"),
+            ToolMessage(content="not json", tool_call_id="call_2"),
+        ]
+        assert compact_tool_messages(messages) == messages
+
+
+class TestMessagesToRemove:
+    def test_removes_all_but_last(self):
+        messages = [AIMessage(content=str(i), id=f"m{i}") for i in range(5)]
+        removals = messages_to_remove(messages, 2)
+        assert [r.id for r in removals] == ["m0", "m1", "m2"]
+        assert all(isinstance(r, RemoveMessage) for r in removals)
+
+    def test_nothing_to_remove_below_limit(self):
+        messages = [AIMessage(content="a", id="m0")]
+        assert messages_to_remove(messages, 2) == []
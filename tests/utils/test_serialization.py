@@ -0,0 +1,25 @@
+import json
+
+from pydantic import BaseModel
+
+from polyview.utils.serialization import compact_json
+
+
+class _Item(BaseModel):
+    name: str
+    arguments: list[str]
+    note: str = ""
+
+
+class TestCompactJson:
+    def test_output_is_minified(self):
+        result = compact_json([{"name": "A", "arguments": ["x", "y"]}])
+        assert result == '[{"name":"A","arguments":["x","y"]}]'
+
+    def test_selects_fields_in_order_and_drops_empty_values(self):
+        items = [_Item(name="A", arguments=["x"]), _Item(name="B", arguments=[])]
+        result = compact_json(items, fields=("arguments", "name", "note"))
+        assert json.loads(result) == [{"arguments": ["x"], "name": "A"}, {"name": "B"}]
+
+    def test_keeps_non_ascii_characters(self):
+        assert compact_json([{"name": "Ökonomie"}]) == '[{"name":"Ökonomie"}]'
@@ -0,0 +1,117 @@
+import numpy as np
+
+from polyview.utils.vectors import (
+    collapse_near_duplicates,
+    cosine_similarity,
+    hashed_vectors,
+    maximal_marginal_relevance,
+)
+
+
+class TestHashedVectors:
+    def test_rows_are_normalized(self):
+        vectors = hashed_vectors(["carbon tax policy", "a carbon tax", ""])
+        norms = np.linalg.norm(vectors, axis=1)
+        assert np.allclose(norms[:2], 1)
+        assert norms[2] == 0
+
+    def test_similar_texts_are_closer(self):
+        vectors = hashed_vectors(
+            [
+                "Carbon taxes reduce emissions efficiently.",
+                "A carbon tax reduces emissions efficiently.",
+                "The striker scored twice in the final.",
+            ]
+        )
+        similarity = cosine_similarity(vectors, vectors)
+        assert similarity[0, 1] > similarity[0, 2]
+
+    def test_vectors_are_stable_without_idf(self):
+        first = hashed_vectors(["remote work"], use_idf=False)
+        second = hashed_vectors(["remote work", "other text"], use_idf=False)
+        assert np.allclose(first[0], second[0])
+
+
+class TestMaximalMarginalRelevance:
+    def test_prefers_diverse_items(self):
+        vectors = hashed_vectors(
+            [
+                "nuclear power is safe and clean",
+                "nuclear power is safe and clean energy",
+                "renewables are cheaper than nuclear",
+            ],
+            use_idf=False,
+        )
+        relevance = np.array([1.0, 0.95, 0.8], dtype=np.float32)
+        selected = maximal_marginal_relevance(vectors, relevance, k=2, diversity=0.5)
+        assert selected == [0, 2]
+
+    def test_k_larger_than_items(self):
+        vectors = hashed_vectors(["a b", "c d"])
+        selected = maximal_marginal_relevance(vectors, np.ones(2), k=5)
+        assert sorted(selected) == [0, 1]
+
+    def test_zero_k(self):
+        vectors = hashed_vectors(["a b"])
+        assert maximal_marginal_relevance(vectors, np.ones(1), k=0) == []
+
+
+class TestCollapseNearDuplicates:
+    def test_collapses_paraphrases_and_counts_them(self):
+        result = collapse_near_duplicates(
+            [
+                "Rent control keeps housing affordable for tenants.",
+                "Rent control keeps housing affordable for tenants",
+                "Rent control reduces the supply of new housing.",
+                "Rent control keeps housing affordable for tenants.",
+            ],
+            threshold=0.8,
+        )
+        assert result == {
+            "Rent control keeps housing affordable for tenants.": 3,
+            "Rent control reduces the supply of new housing.": 1,
+        }
+
+    def test_keeps_negated_claims_apart(self):
+        result = collapse_near_duplicates(
+            [
+                "Minimum wage increases cause job losses",
+                "Minimum wage increases cause no job losses",
+                "Minimum wage increases do not cause job losses",
+            ],
+            threshold=0.8,
+        )
+        assert len(result) == 3
+
+    def test_keeps_opposite_directions_and_numbers_apart(self):
+        raised = (
+            "The 2019 minimum wage increase raised average hourly earnings of retail "
+            "workers in the state by a significant margin, according to the survey"
+        )
+        result = collapse_near_duplicates(
+            [
+                raised,
+                raised.replace("raised", "lowered"),
+                "Rents rose 5% in the year after the policy took effect",
+                "Rents rose 50% in the year after the policy took effect",
+            ],
+            threshold=0.8,
+        )
+        assert len(result) == 4
+
+    def test_collapses_reworded_directions(self):
+        result = collapse_near_duplicates(
+            [
+                "Raising the minimum wage increases worker productivity",
+                "Raising the minimum wage boosts worker productivity",
+                "Raising the minimum wage doesn't boost worker productivity",
+            ],
+            threshold=0.8,
+        )
+        assert result == {
+            "Raising the minimum wage increases worker productivity": 2,
+            "Raising the minimum wage doesn't boost worker productivity": 1,
+        }
+
+    def test_skips_empty_texts(self):
+        assert collapse_near_duplicates(["", "  "], threshold=0.8) == {}
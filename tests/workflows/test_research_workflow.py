@@ -0,0 +1,54 @@
+from langchain_core.messages import AIMessage
+import pytest
+
+from polyview.core.profiles import RunProfile
+from polyview.core.state import CycleNovelty
+from polyview.workflows.research_workflow import (
+    decide_what_to_do,
+    research_supervisor_node,
+)
+
+
+class TestResearchSupervisorNode:
+    def test_records_novelty_of_finished_cycle(self):
+        state = {
+            "topic": "rent control",
+            "iteration": 1,
+            "cycle_novelty": CycleNovelty(
+                new_clusters=1, total_clusters=4, new_arguments=3, total_arguments=12
+            ),
+        }
+        result = research_supervisor_node(state)
+        assert result["iteration"] == 2
+        assert result["novelty"] == 0.25
+
+    def test_removes_messages_beyond_retention(self):
+        state = {
+            "topic": "rent control",
+            "iteration": 1,
+            "messages": [AIMessage(content=str(i), id=f"m{i}") for i in range(5)],
+        }
+        config = {"configurable": {"profile": RunProfile(message_retention=3)}}
+        result = research_supervisor_node(state, config)
+
+        *removals, new_message = result["messages"]
+        assert [r.id for r in removals] == ["m0", "m1", "m2"]
+        assert isinstance(new_message, AIMessage)
+
+
+class TestDecideWhatToDo:
+    @pytest.fixture
+    def config(self):
+        return {"configurable": {"profile": RunProfile(max_iterations=5)}}
+
+    def test_stops_when_novelty_is_below_threshold(self, config):
+        state = {"iteration": 2, "novelty": 0.05}
+        assert decide_what_to_do(state, config) == "debug_state"
+
+    def test_continues_while_cycles_add_new_perspectives(self, config):
+        state = {"iteration": 2, "novelty": 0.5}
+        assert decide_what_to_do(state, config) == "search_agent"
+
+    def test_ignores_novelty_in_first_cycle(self, config):
+        state = {"iteration": 1, "novelty": 0.0}
+        assert decide_what_to_do(state, config) == "search_agent"